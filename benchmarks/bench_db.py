@@ -0,0 +1,199 @@
+"""
+DB 규모별 벤치마크.
+
+규모(티켓 수)마다 격리된 DB 에 가상 장부를 만들고, src/db.py 의 모든 조회/갱신 함수와
+update 채점 경로, check-pending / pending / stats / report CLI 출력 시간을 측정해 JSON 으로 내보냅니다.
+커밋마다 결과 파일을 남겨 두면 성능 회귀를 비교할 수 있습니다.
+
+    python -m benchmarks.bench_db --scales 1000,10000,100000 --output bench_db.json
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import sqlite3
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from click.testing import CliRunner
+
+from src import db
+from benchmarks.datagen import generate, draw_for_round, RANK_PRIZES
+
+DEFAULT_SCALES = [1000, 10000, 100000]
+TMPFS_DIR = "/dev/shm"
+
+
+class OfflineScraper:
+    """update 채점 경로를 네트워크 없이 실행하기 위한 스크래퍼 대역 (생성된 장부 기준으로 응답)"""
+
+    def __init__(self, account_id: str, summary: dict, seed: int = 0):
+        self.account_id = account_id
+        self.summary = summary
+        self.seed = seed
+
+    def update_buy_list(self):
+        conn = db.connect()
+        rounds = [r[0] for r in conn.execute(
+            "SELECT DISTINCT round_number FROM purchases WHERE account_id = ?", (self.account_id,)
+        )]
+        conn.close()
+        return [
+            {"round": str(rnd), "result": "미추첨" if rnd == self.summary["open_round"] else "낙첨", "win_amount": 0}
+            for rnd in rounds
+        ]
+
+    def get_official_winning_numbers_bulk(self, round_numbers, **kwargs):
+        fetched = {}
+        for rnd in round_numbers:
+            win, bonus = draw_for_round(rnd, self.seed)
+            fetched[rnd] = {
+                "round_number": rnd, "draw_date": None, "winning_numbers": win, "bonus_number": bonus, "is_drawn": True,
+                "prizes": {rank: {"amount": amount, "winners": None} for rank, amount in RANK_PRIZES.items() if rank != "낙첨"},
+            }
+        return fetched
+
+
+def _measure(fn, repeat: int, setup=None) -> dict:
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return {
+        "min_ms": round(min(samples) * 1000, 3),
+        "median_ms": round(statistics.median(samples) * 1000, 3),
+        "max_ms": round(max(samples) * 1000, 3),
+    }
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def bench_scale(tickets: int, workdir: str, rounds: int, accounts: int, repeat: int) -> dict:
+    import main
+
+    db_file = os.path.join(workdir, f"ledger_{tickets}.db")
+    pristine = db_file + ".pristine"
+
+    started = time.perf_counter()
+    summary = generate(db_file, tickets, rounds=rounds, accounts=accounts)
+    generate_s = time.perf_counter() - started
+    shutil.copyfile(db_file, pristine)
+
+    def restore():
+        shutil.copyfile(pristine, db_file)
+
+    open_round = summary["open_round"]
+    sample_round = open_round - 1
+    all_rounds = list(range(open_round - rounds + 1, open_round + 1))
+    pending_ids = [t["id"] for t in db.get_pending_tickets()][:1000]
+    drawn = list(db.get_drawn_rounds(all_rounds).values())
+    runner = CliRunner()
+
+    def cli(*args):
+        result = runner.invoke(main.cli, list(args))
+        if result.exit_code != 0:
+            raise RuntimeError(f"{' '.join(args)} 실패: {result.output or result.exception}")
+
+    def run_update():
+        # 계정 선택/로그인 단계를 건너뛰고 update 의 채점 job 만 기본 계정 대역으로 실행
+        original = main._run_for_selected_accounts
+        main._run_for_selected_accounts = lambda job, *a, **k: job(OfflineScraper("default", summary), {"account_id": "default"})
+        try:
+            cli("update")
+        finally:
+            main._run_for_selected_accounts = original
+
+    results = {
+        "db_api": {
+            "init_db": _measure(db.init_db, repeat),
+            "insert_purchase": _measure(lambda: db.insert_purchase(open_round, datetime.now(), "수동", "1,2,3,4,5,6"), repeat, restore),
+            "add_or_update_round": _measure(lambda: db.add_or_update_round(sample_round, "2024-01-01", "1,2,3,4,5,6", 7), repeat),
+            "add_or_update_rounds": _measure(lambda: db.add_or_update_rounds(drawn), repeat),
+            "get_drawn_rounds": _measure(lambda: db.get_drawn_rounds(all_rounds), repeat),
+            "get_pending_purchases": _measure(lambda: db.get_pending_purchases(sample_round), repeat),
+            "get_pending_purchases_for_rounds": _measure(lambda: db.get_pending_purchases_for_rounds(all_rounds), repeat),
+            "get_pending_tickets": _measure(db.get_pending_tickets, repeat),
+            "update_winning_result": _measure(lambda: db.update_winning_result(sample_round, "1,2,3,4,5,6", 0, "낙첨"), repeat, restore),
+            "update_ticket_result": _measure(lambda: db.update_ticket_result(pending_ids[0], "낙첨", 0) if pending_ids else None, repeat, restore),
+            "update_ticket_results": _measure(lambda: db.update_ticket_results([(i, "낙첨", 0) for i in pending_ids]), repeat, restore),
+            "get_unchecked_results": _measure(db.get_unchecked_results, repeat, restore),
+            "get_all_checked_results": _measure(db.get_all_checked_results, repeat),
+            "get_round_details": _measure(lambda: db.get_round_details(sample_round), repeat),
+            "get_stats": _measure(db.get_stats, repeat),
+        },
+        "update": _measure(run_update, repeat, restore),
+        "cli": {
+            "pending": _measure(lambda: cli("pending"), repeat, restore),
+            "stats": _measure(lambda: cli("stats"), repeat, restore),
+            "check-pending": _measure(lambda: cli("check-pending"), repeat, restore),
+            "report": _measure(lambda: cli("report", "--by", "week", "--group", "account", "--last", "0"), repeat),
+        },
+    }
+
+    os.remove(pristine)
+    os.remove(db_file)
+    return {"scale": tickets, "generate_s": round(generate_s, 3), "dataset": {k: v for k, v in summary.items() if k != "db_file"}, **results}
+
+
+def run(scales: list[int], rounds: int = 100, accounts: int = 3, repeat: int = 3, db_dir: str = None) -> dict:
+    """
+    db_dir 을 지정하지 않으면 tmpfs(/dev/shm)가 있을 때 그 아래에서 실행하여 디스크 I/O 편차를 줄입니다.
+    """
+    if db_dir is None and os.path.isdir(TMPFS_DIR):
+        db_dir = TMPFS_DIR
+    original_file = db.DB_FILE
+    workdir = tempfile.mkdtemp(prefix="bench_db_", dir=db_dir)
+    try:
+        results = [bench_scale(n, workdir, rounds, accounts, repeat) for n in scales]
+    finally:
+        db.set_db_path(original_file)
+        shutil.rmtree(workdir, ignore_errors=True)
+    return {
+        "benchmark": "db",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "db_dir": workdir,
+        "rounds": rounds,
+        "accounts": accounts,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DB 규모별 벤치마크")
+    parser.add_argument("--scales", default=",".join(map(str, DEFAULT_SCALES)),
+                        help="쉼표로 구분한 티켓 수 목록 (예: 1000,10000,1000000,10000000)")
+    parser.add_argument("--rounds", type=int, default=100)
+    parser.add_argument("--accounts", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--db-dir", help="벤치마크용 DB 를 만들 디렉터리 (기본: /dev/shm, 없으면 시스템 임시 디렉터리)")
+    parser.add_argument("--output", help="결과 JSON 을 저장할 파일 (생략 시 표준 출력)")
+    args = parser.parse_args()
+
+    report = run([int(s) for s in args.scales.split(",") if s], args.rounds, args.accounts, args.repeat, args.db_dir)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
@@ -0,0 +1,102 @@
+"""
+가짜 동행복권 서버를 상대로 스크래퍼의 주요 흐름(로그인, 잔액 조회, 구매, 내역 갱신, 충전)을
+반복 실행하여 지연 시간 통계를 JSON 으로 출력합니다. 실제 사이트에는 접속하지 않습니다.
+
+    python -m benchmarks.bench_e2e --iterations 5 --latency 0.05 --output bench_e2e.json
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import db, session, scraper
+from src.scraper import LottoScraper
+from tests.fake_dhlottery import FakeDhlotteryServer
+
+
+def _stats(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "n": len(ordered),
+        "min_ms": round(ordered[0] * 1000, 1),
+        "mean_ms": round(statistics.mean(ordered) * 1000, 1),
+        "p50_ms": round(ordered[len(ordered) // 2] * 1000, 1),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 1),
+        "max_ms": round(ordered[-1] * 1000, 1),
+    }
+
+
+def _timed(samples: dict, name: str, fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    samples.setdefault(name, []).append(time.perf_counter() - started)
+    return result
+
+
+def run(iterations: int, latency: float, headless: bool = True) -> dict:
+    workdir = tempfile.mkdtemp(prefix="bench_e2e_")
+    db.set_db_path(db.MEMORY_DB)
+    session.SESSION_DIR = os.path.join(workdir, "sessions")
+    session.SESSION_PATH = os.path.join(workdir, "session.json")
+    db.init_db()
+
+    include_charge = shutil.which("tesseract") is not None
+    samples = {}
+    failures = []
+    with FakeDhlotteryServer(balance=10 ** 9, latency=latency) as server:
+        scraper.set_site_base_url(server.base_url)
+        try:
+            for i in range(iterations):
+                # 첫 반복만 실제 로그인, 이후에는 저장된 세션을 재사용 (세션 캐시 효과 측정)
+                with LottoScraper(server.state.user_id, server.state.user_pw, headless=headless, account_id="bench") as s:
+                    steps = [
+                        ("login_cold" if i == 0 else "login_warm", s.login),
+                        ("get_balance", s.get_balance),
+                        ("buy_auto", s.buy_auto, 1),
+                        ("buy_manual", s.buy_manual, [1, 7, 13, 22, 34, 45]),
+                        ("buy_720", s.buy_720),
+                        ("update_buy_list", s.update_buy_list),
+                    ]
+                    if include_charge:
+                        steps.append(("charge_deposit", s.charge_deposit, 10000, server.state.charge_pin))
+                    for name, fn, *args in steps:
+                        if _timed(samples, name, fn, *args) is False:
+                            failures.append({"iteration": i, "step": name})
+                server.state.close_round()
+        finally:
+            scraper.set_site_base_url(None)
+            db.set_db_path(None)
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        hits = dict(server.state.hits)
+
+    return {
+        "iterations": iterations,
+        "latency_s": latency,
+        "charge_included": include_charge,
+        "steps": {name: _stats(values) for name, values in samples.items()},
+        "failures": failures,
+        "server_hits": hits,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="가짜 서버 기반 end-to-end 지연 시간 벤치마크")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.0, help="요청마다 서버가 추가할 지연(초)")
+    parser.add_argument("--headed", action="store_true", help="브라우저 창을 띄워서 실행")
+    parser.add_argument("--output", help="결과 JSON 을 저장할 파일 (생략 시 표준 출력)")
+    args = parser.parse_args()
+
+    report = run(args.iterations, args.latency, headless=not args.headed)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
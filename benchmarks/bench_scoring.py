@@ -0,0 +1,101 @@
+"""
+채점 엔진 처리량 벤치마크.
+무작위 티켓 N 장을 한 회차로 채점하는 속도(티켓/초)를 NumPy 엔진과 기존 파이썬 if/elif 방식으로 비교합니다.
+
+    python -m benchmarks.bench_scoring --sizes 10000,1000000,10000000
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import scoring
+
+WIN, BONUS = [3, 11, 19, 27, 35, 43], 44
+PYTHON_LIMIT = 200000  # 파이썬 방식은 느리므로 이 크기까지만 측정
+
+
+def random_tickets(n: int, seed: int = 0) -> np.ndarray:
+    """중복 없는 6개 번호 티켓 n 장 (메모리를 아끼기 위해 나눠서 생성)"""
+    rng = np.random.default_rng(seed)
+    chunks = []
+    for start in range(0, n, 1000000):
+        size = min(1000000, n - start)
+        chunks.append(np.sort(np.argsort(rng.random((size, 45), dtype=np.float32), axis=1)[:, :6] + 1, axis=1).astype(np.uint8))
+    return np.concatenate(chunks) if chunks else np.empty((0, 6), dtype=np.uint8)
+
+
+def grade_python(tickets: list[list[int]]) -> list[str]:
+    win = set(WIN)
+    ranks = []
+    for t in tickets:
+        nums = set(t)
+        match = len(nums & win)
+        if match == 6:
+            ranks.append("1등")
+        elif match == 5 and BONUS in nums:
+            ranks.append("2등")
+        elif match == 5:
+            ranks.append("3등")
+        elif match == 4:
+            ranks.append("4등")
+        elif match == 3:
+            ranks.append("5등")
+        else:
+            ranks.append("낙첨")
+    return ranks
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run(sizes: list[int], repeat: int = 3) -> dict:
+    results = []
+    for n in sizes:
+        tickets = random_tickets(n)
+        elapsed = _best_of(lambda: scoring.grade(tickets, WIN, BONUS), repeat)
+        entry = {
+            "tickets": n,
+            "numpy_s": round(elapsed, 6),
+            "numpy_tickets_per_s": round(n / elapsed) if elapsed else None,
+        }
+        if n <= PYTHON_LIMIT:
+            as_lists = tickets.tolist()
+            py_elapsed = _best_of(lambda: grade_python(as_lists), repeat)
+            entry["python_s"] = round(py_elapsed, 6)
+            entry["python_tickets_per_s"] = round(n / py_elapsed) if py_elapsed else None
+        results.append(entry)
+    return {
+        "benchmark": "scoring",
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="채점 엔진 처리량 벤치마크")
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="결과 JSON 을 저장할 파일 (생략 시 표준 출력)")
+    args = parser.parse_args()
+
+    report = run([int(s) for s in args.sizes.split(",") if s], args.repeat)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
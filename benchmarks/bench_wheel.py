@@ -0,0 +1,69 @@
+"""
+휠(커버링 설계) 탐색 시간 벤치마크.
+기본 번호 수(최대 20개)와 보장 조건별로 탐욕법만 쓴 경우와 지역 탐색까지 한 경우의 게임 수와 소요 시간을 기록합니다.
+저장된 설계(DB 캐시)는 쓰지 않고 매번 새로 탐색합니다.
+
+    python -m benchmarks.bench_wheel --bases 10,12,15,18,20 --conditions 4:3,5:4,6:3
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import wheel
+
+
+def run(bases: list[int], conditions: list[tuple[int, int]], seed: int = 0) -> dict:
+    wheel._popcount_table()  # 한 번만 만드는 비트 수 표는 측정에서 제외
+    results = []
+    for v in bases:
+        for drawn, match in conditions:
+            if drawn > v:
+                continue
+            started = time.perf_counter()
+            greedy = wheel.search(v, drawn, match, seed=seed, iterations=0)
+            greedy_s = time.perf_counter() - started
+            started = time.perf_counter()
+            searched = wheel.search(v, drawn, match, seed=seed)
+            search_s = time.perf_counter() - started
+            report = wheel.verify(searched, v)
+            results.append({
+                "base": v,
+                "drawn": drawn,
+                "match": match,
+                "greedy_tickets": len(greedy),
+                "greedy_s": round(greedy_s, 4),
+                "tickets": len(searched),
+                "search_s": round(search_s, 4),
+                "verified": report[drawn]["min_match"] >= match,
+            })
+    return {
+        "benchmark": "wheel",
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "search_seconds": wheel.SEARCH_SECONDS,
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="휠(커버링 설계) 탐색 시간 벤치마크")
+    parser.add_argument("--bases", default="10,12,15,18,20")
+    parser.add_argument("--conditions", default="3:3,4:3,5:4,6:3,6:4", help="drawn:match 목록")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="결과 JSON 을 저장할 파일 (생략 시 표준 출력)")
+    args = parser.parse_args()
+
+    conditions = [tuple(int(x) for x in c.split(":")) for c in args.conditions.split(",") if c]
+    report = run([int(b) for b in args.bases.split(",") if b], conditions, args.seed)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
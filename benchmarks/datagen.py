@@ -0,0 +1,163 @@
+"""
+벤치마크용 가상 구매 장부 생성기.
+
+격리된 DB 파일에 회차/계정/티켓을 원하는 규모(1천 ~ 1천만 건)로 채웁니다.
+티켓 번호는 실제 로또 등수 확률대로 뽑은 등수에 맞춰 생성하므로, 다시 채점해도 같은 등수가 나옵니다.
+
+    python -m benchmarks.datagen --db /tmp/bench.db --tickets 100000 --rounds 200 --accounts 3
+"""
+import os
+import sys
+import random
+import argparse
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import db, combo
+from src.rounds import FIRST_DRAW_DATE
+
+
+# 8,145,060 개 조합 중 각 등수에 해당하는 조합 수
+RANK_WEIGHTS = [
+    ("1등", 1),
+    ("2등", 6),
+    ("3등", 228),
+    ("4등", 11115),
+    ("5등", 182780),
+    ("낙첨", 8145060 - 1 - 6 - 228 - 11115 - 182780),
+]
+RANK_PRIZES = {"1등": 2000000000, "2등": 50000000, "3등": 1500000, "4등": 50000, "5등": 5000, "낙첨": 0}
+RANK_MATCHES = {"1등": 6, "2등": 5, "3등": 5, "4등": 4, "5등": 3}
+
+BATCH_SIZE = 50000
+
+
+def draw_for_round(round_no: int, seed: int = 0) -> tuple[list[int], int]:
+    balls = random.Random(f"{seed}-{round_no}").sample(range(1, 46), 7)
+    return sorted(balls[:6]), balls[6]
+
+
+def ticket_for_rank(rng: random.Random, win: list[int], bonus: int, rank: str) -> list[int]:
+    """당첨 번호/보너스 번호에 대해 정확히 rank 등수가 되는 번호 6개를 만듭니다."""
+    others = [n for n in range(1, 46) if n not in win and n != bonus]
+    if rank == "낙첨":
+        match = rng.choices([0, 1, 2], weights=[3262623, 3454542, 1233765])[0]
+        picked = rng.sample(win, match) + rng.sample(others + [bonus], 6 - match)
+    elif rank == "2등":
+        picked = rng.sample(win, 5) + [bonus]
+    else:
+        match = RANK_MATCHES[rank]
+        picked = rng.sample(win, match) + rng.sample(others, 6 - match)
+    return sorted(picked)
+
+
+def generate(db_file: str, tickets: int, rounds: int = 100, accounts: int = 1,
+             pending_ratio: float = 0.05, unknown_ratio: float = 0.02, checked_ratio: float = 0.8,
+             seed: int = 0, first_round: int = 1000) -> dict:
+    """
+    db_file 에 가상 장부를 만듭니다. (기존 파일은 덮어씁니다, ":memory:" 면 새 인메모리 DB)
+    - 마지막 회차는 추첨 전입니다. 티켓의 pending_ratio 만큼은 최근 3개 회차에 '추첨 전' 상태로 남아
+      그중 추첨이 끝난 회차의 티켓은 update 채점 대상이 됩니다.
+    - 추첨된 회차 티켓 중 unknown_ratio 는 번호가 '확인필요' 인 자동 구매건입니다.
+    - 채점이 끝난 티켓 중 checked_ratio 는 사용자가 이미 확인한 것으로 표시합니다.
+    """
+    if db_file != db.MEMORY_DB and os.path.exists(db_file):
+        os.remove(db_file)
+    db.set_db_path(db_file)
+    db.init_db()
+
+    rng = random.Random(seed)
+    rank_names = [r for r, _ in RANK_WEIGHTS]
+    rank_weights = [w for _, w in RANK_WEIGHTS]
+    round_numbers = list(range(first_round, first_round + rounds))
+    open_round = round_numbers[-1]
+    draws = {rnd: draw_for_round(rnd, seed) for rnd in round_numbers}
+    account_ids = ["default"] + [f"acct{i}" for i in range(1, accounts)]
+
+    conn = db.connect()
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO rounds (round_number, draw_date, winning_numbers, bonus_number, is_drawn, combo_idx) VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (rnd, (FIRST_DRAW_DATE + timedelta(weeks=rnd - 1)).strftime("%Y-%m-%d"),
+                 ",".join(map(str, draws[rnd][0])), draws[rnd][1], rnd != open_round, combo.encode(draws[rnd][0]))
+                for rnd in round_numbers
+            ],
+        )
+
+    counts = {"pending": 0, "unknown": 0, "checked": 0}
+    rank_counts = {}
+    batch = []
+    for i in range(tickets):
+        pending = rng.random() < pending_ratio
+        if pending:
+            # 추첨 전 티켓은 최근 3개 회차에 몰려 있음 (마지막 회차 외에는 update 로 채점될 대상)
+            rnd = round_numbers[-1 - rng.randrange(min(3, rounds))]
+        else:
+            rnd = round_numbers[rng.randrange(max(1, rounds - 1))]
+        purchase_date = FIRST_DRAW_DATE + timedelta(weeks=rnd - 2, seconds=rng.randrange(7 * 86400))
+        win, bonus = draws[rnd]
+        mode = "자동" if rng.random() < 0.7 else "수동"
+        account_id = account_ids[i % len(account_ids)]
+        rank = rng.choices(rank_names, weights=rank_weights)[0]
+        numbers = ",".join(map(str, ticket_for_rank(rng, win, bonus, rank)))
+        amount = RANK_PRIZES[rank]
+        checked = 0
+
+        if pending or rnd == open_round:
+            rank, amount = "추첨 전", 0
+            counts["pending"] += 1
+        elif rng.random() < unknown_ratio:
+            numbers, rank, amount = "확인필요", "낙첨", 0
+            counts["unknown"] += 1
+        if rank != "추첨 전":
+            checked = int(rng.random() < checked_ratio)
+            rank_counts[rank] = rank_counts.get(rank, 0) + 1
+        counts["checked"] += checked
+
+        batch.append((rnd, purchase_date.strftime("%Y-%m-%d %H:%M:%S"), mode, numbers, 1000, amount, rank, checked, account_id,
+                      combo.from_text(numbers)))
+        if len(batch) >= BATCH_SIZE:
+            _flush(conn, batch)
+    _flush(conn, batch)
+    conn.close()
+
+    return {
+        "db_file": db_file,
+        "tickets": tickets,
+        "rounds": rounds,
+        "accounts": len(account_ids),
+        "open_round": open_round,
+        "pending": counts["pending"],
+        "unknown": counts["unknown"],
+        "checked": counts["checked"],
+        "rank_counts": rank_counts,
+    }
+
+
+def _flush(conn, batch: list):
+    if not batch:
+        return
+    with conn:
+        conn.executemany('''
+        INSERT INTO purchases (round_number, purchase_date, mode, numbers, cost, win_amount, win_rank, is_user_checked, account_id, combo_idx)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', batch)
+    batch.clear()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="벤치마크용 가상 구매 장부 생성기")
+    parser.add_argument("--db", required=True, help="생성할 DB 파일 경로 (기존 파일은 덮어씁니다)")
+    parser.add_argument("--tickets", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=100)
+    parser.add_argument("--accounts", type=int, default=1)
+    parser.add_argument("--pending-ratio", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    summary = generate(args.db, args.tickets, args.rounds, args.accounts, args.pending_ratio, seed=args.seed)
+    print(summary)
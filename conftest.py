@@ -0,0 +1,13 @@
+import pytest
+
+from src import db
+
+
+@pytest.fixture(autouse=True)
+def memory_db():
+    """테스트마다 분리된 새 인메모리 DB 를 사용합니다. (실제 db/lottery.db 는 건드리지 않음)"""
+    previous = db.DB_FILE
+    db.set_db_path(db.MEMORY_DB)
+    db.init_db()
+    yield
+    db.set_db_path(previous)
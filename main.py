@@ -1,36 +1,105 @@
 import click
 from tabulate import tabulate
-from src.config import validate_config, DHLOTTERY_ID, DHLOTTERY_PW
+from src.config import MAX_PARALLEL_ACCOUNTS
 from src.scraper import LottoScraper
-from src.db import init_db, get_stats
+from src.db import init_db, get_stats, set_db_path
 
-from src.notifier import notify_result
+from src.notifier import notify_result, resume as resume_notifications
 
 @click.group()
-def cli():
+@click.option('--account', 'account_names', multiple=True, help='실행할 계정 이름 (accounts.json 의 name, 여러 번 지정 가능)')
+@click.option('--all-accounts', is_flag=True, help='등록된 모든 계정에 대해 동시에 실행합니다.')
+@click.option('--parallel', default=MAX_PARALLEL_ACCOUNTS, help='여러 계정 실행 시 최대 동시 실행 수', type=int)
+@click.option('--db', 'db_path', default=None, help='사용할 DB 파일 경로 (기본: db/lottery.db, ":memory:" 는 인메모리)')
+@click.pass_context
+def cli(ctx, account_names, all_accounts, parallel, db_path):
     """동행복권 자동 구매 CLI 프로그램"""
+    if db_path:
+        set_db_path(db_path)
     init_db()
+    resume_notifications()
+    ctx.obj = {"account_names": account_names, "all_accounts": all_accounts, "parallel": parallel}
+
+def _run_for_selected_accounts(job, title: str, login_failed_msg: str, login_lazy: bool = True, notify: bool = True,
+                               notify_success: bool = True):
+    """
+    --account / --all-accounts 로 선택된 계정마다 job(scraper, account) 을 실행합니다.
+    계정이 하나면 기존처럼 바로 실행하고, 여럿이면 계정별 BrowserContext 로 동시에 실행한 뒤
+    결과를 하나의 리포트로 모아 출력/알림합니다.
+    notify_success=False 면 성공 알림은 job 이 기록과 함께 편지함에 넣은 것으로 보고 실패만 알립니다.
+    """
+    from src.accounts import load_accounts, select_accounts
+
+    opts = click.get_current_context().obj or {}
+    try:
+        accounts = select_accounts(load_accounts(), opts.get("account_names", ()), opts.get("all_accounts", False))
+    except ValueError as e:
+        # 계정 미등록, 잘못된 accounts.json, 없는 계정 이름은 트레이스백 대신 CLI 오류로 안내
+        raise click.ClickException(str(e))
+
+    if len(accounts) == 1:
+        account = accounts[0]
+        with LottoScraper(user_id=account['user_id'], user_pw=account['user_pw'], headless=True, account_id=account['account_id']) as scraper:
+            if not scraper.login(lazy=login_lazy):
+                click.echo(login_failed_msg)
+                if notify:
+                    notify_result(f"🚨 {login_failed_msg}")
+                return
+            ok, msg = job(scraper, account)
+        click.echo(msg)
+        if notify and (notify_success or not ok):
+            notify_result(msg)
+        elif notify:
+            resume_notifications()
+        return
+
+    from src.executor import run_for_accounts
+
+    click.echo(f"{len(accounts)}개 계정에 대해 '{title}' 작업을 최대 {opts.get('parallel', MAX_PARALLEL_ACCOUNTS)}개씩 동시에 실행합니다...")
+    results = run_for_accounts(
+        accounts, job,
+        max_parallel=opts.get("parallel", MAX_PARALLEL_ACCOUNTS),
+        login_lazy=login_lazy,
+        login_failed_msg=login_failed_msg,
+    )
+    succeeded = sum(1 for r in results if r['success'])
+    rows = [
+        [r['account_id'], "✅" if r['success'] else "❌", r['message'], f"{r['elapsed']:.1f}s"]
+        for r in results
+    ]
+    click.echo(f"\n[{title}] {succeeded}/{len(results)}개 계정 성공")
+    click.echo(tabulate(rows, headers=["계정", "결과", "내용", "소요"], tablefmt="pretty"))
+    if notify:
+        failed = [r for r in results if not r['success']]
+        if notify_success or failed:
+            lines = [f"[{title}] {succeeded}/{len(results)}개 계정 성공"]
+            lines += [f"- {r['account_id']}: {r['message']}" for r in (results if notify_success else failed)]
+            notify_result("\n".join(lines))
+        else:
+            resume_notifications()
 
 @cli.command()
 def balance():
     """현재 예치금 잔액을 조회합니다."""
-    validate_config()
-    with LottoScraper(user_id=DHLOTTERY_ID, user_pw=DHLOTTERY_PW, headless=True) as scraper:
-        if scraper.login():
-            bal = scraper.get_balance()
-            click.echo(f"현재 예치금: {bal}")
-        else:
-            click.echo("로그인에 실패하여 잔액을 조회할 수 없습니다.")
+    def job(scraper, account):
+        bal = scraper.get_balance()
+        return bal != "조회 불가", f"현재 예치금: {bal}"
+
+    _run_for_selected_accounts(job, "잔액 조회", "로그인에 실패하여 잔액을 조회할 수 없습니다.", notify=False)
 
 @cli.command()
 @click.option('--amount', default=1, help='구매할 로또 게임 수 (1~5: 기본 자동)', type=int)
-@click.option('--manual', default=None, help='수동 구매 번호 6개 (예: "1,2,3,4,5,6" 또는 "1 2 3 4 5 6")', type=str)
-def buy(amount, manual):
-    """로또 6/45를 구매합니다. --manual 입력 시 1게임만 수동으로 구매합니다."""
-    validate_config()
-    
-    manual_numbers = []
-    if manual:
+@click.option('--manual', 'manual_lines', multiple=True, help='수동 구매 번호 6개 (예: "1,2,3,4,5,6" 또는 "1 2 3 4 5 6", 여러 번 지정 가능)', type=str)
+@click.option('--allow-duplicates', is_flag=True, help='이번 회차에 이미 보유한 번호도 경고만 하고 구매합니다.')
+def buy(amount, manual_lines, allow_duplicates):
+    """로또 6/45를 구매합니다. --manual 입력 시 지정한 번호마다 1게임씩 수동으로 구매합니다."""
+    import threading
+    from src import combo
+    from src.db import find_held_combos
+    from src.rounds import next_draw_round, sales_deadline
+
+    manual_list = []
+    for manual in manual_lines:
         try:
             manual_numbers = [int(n.strip()) for n in manual.replace(',', ' ').split() if n.strip()]
             if len(manual_numbers) != 6 or not all(1 <= x <= 45 for x in manual_numbers):
@@ -42,80 +111,200 @@ def buy(amount, manual):
         except ValueError:
             click.echo("오류: 수동 번호는 숫자 형식이어야 합니다.")
             return
+        manual_list.append(sorted(manual_numbers))
 
-    with LottoScraper(user_id=DHLOTTERY_ID, user_pw=DHLOTTERY_PW, headless=True) as scraper:
-        if not scraper.login():
-            err_msg = "로또 구매 실패: 로그인에 실패했습니다."
-            click.echo(err_msg)
-            notify_result(f"🚨 {err_msg}")
+    # 브라우저를 띄우기 전에 (회차, 조합 번호) 인덱스로 이번 회차에 이미 보유한 번호를 걸러냄
+    if manual_list:
+        round_no = next_draw_round()
+        lines = {}
+        for nums in manual_list:
+            lines.setdefault(combo.encode(nums), nums)
+        if len(lines) < len(manual_list):
+            click.secho(f"  같은 번호가 여러 번 지정되어 {len(manual_list) - len(lines)}게임을 제외합니다.", fg="yellow")
+        held = find_held_combos(round_no, list(lines), unmapped_since=sales_deadline(round_no - 1))
+        for idx in held:
+            click.secho(f"  [{round_no}회차 중복] {lines[idx]} 번호는 이미 구매했습니다. (보유 계정: {', '.join(held[idx])})", fg="yellow")
+        if not allow_duplicates:
+            lines = {idx: nums for idx, nums in lines.items() if idx not in held}
+        if not lines:
+            click.echo("구매할 새 번호가 없습니다. (중복 번호도 사려면 --allow-duplicates)")
             return
-            
-        if manual_numbers:
-            success = scraper.buy_manual(manual_numbers)
-            if success:
-                msg = f"✅ 성공적으로 수동 번호 {manual_numbers} 1게임을 구매했습니다!"
-                click.echo(msg)
-                notify_result(msg)
-            else:
-                msg = "❌ 수동 구매에 실패했습니다. 잔액이 부족하거나 알럿 에러가 발생했을 수 있습니다."
-                click.echo(msg)
-                notify_result(msg)
-        else:
-            success = scraper.buy_auto(amount)
-            if success:
-                msg = f"✅ 성공적으로 로또 6/45 자동 {amount}게임을 구매했습니다!"
-                click.echo(msg)
-                notify_result(msg)
-            else:
-                msg = "❌ 자동 구매에 실패했습니다. 잔액 확인이 필요합니다."
-                click.echo(msg)
-                notify_result(msg)
+        manual_list = list(lines.values())
+
+    # 여러 계정을 동시에 실행할 때 같은 번호를 두 계정이 사지 않도록 먼저 집은 계정만 구매
+    claimed = set()
+    claim_lock = threading.Lock()
+
+    def job(scraper, account):
+        if manual_list:
+            with claim_lock:
+                mine = manual_list if allow_duplicates else [n for n in manual_list if combo.encode(n) not in claimed]
+                claimed.update(combo.encode(n) for n in mine)
+            if not mine:
+                return True, "다른 계정이 이번 회차에 같은 번호를 구매하므로 건너뜁니다."
+            account_id = account.get('account_id', 'default')
+            bought = [nums for nums in mine if scraper.buy_manual(nums, notify=f"✅ [{account_id}] 로또 6/45 수동 구매 완료: {nums}")]
+            if len(bought) == len(mine):
+                return True, f"✅ 성공적으로 수동 번호 {len(bought)}게임을 구매했습니다! {bought}"
+            return False, f"❌ 수동 구매 {len(mine)}게임 중 {len(mine) - len(bought)}게임에 실패했습니다. 잔액이 부족하거나 알럿 에러가 발생했을 수 있습니다."
+        if scraper.buy_auto(amount, notify=f"✅ [{account.get('account_id', 'default')}] 로또 6/45 자동 {amount}게임 구매 완료"):
+            return True, f"✅ 성공적으로 로또 6/45 자동 {amount}게임을 구매했습니다!"
+        return False, "❌ 자동 구매에 실패했습니다. 잔액 확인이 필요합니다."
+
+    # 구매 성공 알림은 구매 내역과 함께 편지함에 들어가므로 여기서는 실패만 알림
+    _run_for_selected_accounts(job, "로또 구매", "로또 구매 실패: 로그인에 실패했습니다.", notify_success=False)
+
+@cli.command()
+@click.option('--count', default=5, type=click.IntRange(1, 100), help='생성할 게임 수')
+@click.option('--sum', 'sum_range', default=None, help='번호 합 범위 (예: "100-170")')
+@click.option('--odd', default=None, help='홀수 개수 또는 범위 (예: "3" 이면 홀3:짝3, "2-4")')
+@click.option('--span', default=None, help='가장 큰 번호 - 가장 작은 번호 범위 (예: "25-40")')
+@click.option('--max-run', default=None, type=click.IntRange(1, 6), help='연속 번호 최대 개수 (예: 2 면 1,2,3 같은 3연속 제외)')
+@click.option('--max-per-decade', default=None, type=click.IntRange(1, 6), help='같은 번호대(1~9, 10~19, ...)에서 고를 최대 개수')
+@click.option('--include', default="", help='반드시 포함할 번호 (예: "7,13")')
+@click.option('--exclude', default="", help='제외할 번호 (예: "4,44")')
+@click.option('--allow-past-winners', is_flag=True, help='역대 1등 당첨 조합도 후보에 포함합니다.')
+@click.option('--seed', default=None, type=int, help='난수 시드 (같은 시드와 조건이면 같은 번호)')
+@click.option('--buy', 'do_buy', is_flag=True, help='생성한 번호를 바로 수동 구매합니다. (buy --manual 과 동일)')
+@click.pass_context
+def generate(ctx, count, sum_range, odd, span, max_run, max_per_decade, include, exclude, allow_past_winners, seed, do_buy):
+    """조건에 맞는 번호 조합을 전체 조합 특징 테이블에서 골라 수동 구매용 번호를 만듭니다."""
+    from src import combo, generator
+    from src.db import get_ticket_combos, get_winning_combos
+    from src.rounds import next_draw_round
+
+    def numbers(text, hint):
+        try:
+            nums = sorted({int(n) for n in text.replace(',', ' ').split()})
+        except ValueError:
+            raise click.BadParameter("번호는 숫자 형식이어야 합니다.", param_hint=hint)
+        if not all(1 <= n <= 45 for n in nums):
+            raise click.BadParameter("번호는 1부터 45 사이여야 합니다.", param_hint=hint)
+        return nums
+
+    def bounds(text, low, high, hint):
+        if text is None:
+            return None
+        try:
+            return generator.parse_range(text, low, high)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint=hint)
+
+    include_nums, exclude_nums = numbers(include, "--include"), numbers(exclude, "--exclude")
+    if len(include_nums) > 6 or set(include_nums) & set(exclude_nums):
+        raise click.BadParameter("포함 번호는 6개 이하이며 제외 번호와 겹치면 안 됩니다.", param_hint="--include")
+    constraints = dict(
+        sum_range=bounds(sum_range, 21, 255, "--sum"), odd=bounds(odd, 0, 6, "--odd"), span=bounds(span, 5, 44, "--span"),
+        max_run=max_run, max_per_decade=max_per_decade, include=include_nums, exclude=exclude_nums,
+    )
+
+    # 역대 1등 조합과 이번 회차에 이미 보유한 조합은 후보에서 뺌
+    avoid = set(get_ticket_combos(round_numbers=[next_draw_round()]))
+    if not allow_past_winners:
+        avoid.update(get_winning_combos())
+
+    if not generator.features_ready():
+        click.echo("전체 조합 특징 테이블을 처음 만드는 중입니다... (한 번만, 약 140MB)", err=True)
+    features = generator.load_features()
+    candidates = generator.filter_combos(features, avoid=sorted(avoid), **constraints)
+    if not len(candidates):
+        click.echo("조건을 만족하는 번호 조합이 없습니다. 조건을 완화해 주세요.")
+        return
+    lines = generator.pick(candidates, count, seed=seed)
+    click.echo(f"조건을 만족하는 조합 {len(candidates):,}개 중 {len(lines)}게임을 골랐습니다. (전체의 {len(candidates) / combo.TOTAL * 100:.2f}%)")
+    if len(lines) < count:
+        click.secho(f"  후보가 부족해 요청한 {count}게임 중 {len(lines)}게임만 만들었습니다.", fg="yellow")
+    for nums in lines:
+        click.echo("  " + ",".join(f"{n:02d}" for n in nums))
+
+    manual_lines = tuple(",".join(map(str, nums)) for nums in lines)
+    if do_buy:
+        ctx.invoke(buy, amount=1, manual_lines=manual_lines, allow_duplicates=False)
+    else:
+        click.echo("\n구매하려면: python main.py buy " + " ".join(f'--manual "{line}"' for line in manual_lines))
+
+@cli.command()
+@click.option('--numbers', 'base', required=True, help='휠을 구성할 기본 번호 6~20개 (예: "1,5,9,13,17,21,25,29,33,37,41,45")')
+@click.option('--drawn', default=4, type=click.IntRange(1, 6), help='기본 번호 중 당첨 번호로 나온다고 가정할 개수')
+@click.option('--match', default=3, type=click.IntRange(1, 6), help='그때 적어도 한 게임이 맞힐 것을 보장할 개수')
+@click.option('--improve', is_flag=True, help='저장된 설계가 있어도 다시 탐색해 게임 수를 더 줄여 봅니다.')
+@click.option('--seed', default=0, type=int, help='탐색 난수 시드')
+@click.option('--buy', 'do_buy', is_flag=True, help='설계한 번호를 바로 수동 구매합니다. (buy --manual 과 동일)')
+@click.pass_context
+def wheel(ctx, base, drawn, match, improve, seed, do_buy):
+    """기본 번호로 '기본 번호 중 drawn 개가 나오면 match 개 일치 보장' 휠(커버링 설계)을 만들고 전수 검증합니다."""
+    import time
+    from src import wheel as wheels
+
+    try:
+        numbers = sorted({int(n) for n in base.replace(',', ' ').split()})
+    except ValueError:
+        raise click.BadParameter("번호는 숫자 형식이어야 합니다.", param_hint="--numbers")
+    if not all(1 <= n <= 45 for n in numbers):
+        raise click.BadParameter("번호는 1부터 45 사이여야 합니다.", param_hint="--numbers")
+    try:
+        wheels.validate(len(numbers), drawn, match)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
+    started = time.perf_counter()
+    design = wheels.design(len(numbers), drawn, match, seed=seed, improve=improve)
+    elapsed = time.perf_counter() - started
+    lines = wheels.to_numbers(design, numbers)
+    report = wheels.verify(design, len(numbers))
+
+    click.echo(f"\n기본 번호 {len(numbers)}개 중 {drawn}개가 나오면 {match}개 이상 일치 보장: {len(lines)}게임 ({len(lines) * 1000:,}원, {elapsed:.2f}초)")
+    for nums in lines:
+        click.echo("  " + ",".join(f"{n:02d}" for n in nums))
+
+    click.echo("\n[보장 검증] 기본 번호 중 N개가 당첨 번호로 나오는 모든 경우를 전수 조사")
+    rows = []
+    for j, r in report.items():
+        dist = ", ".join(f"{m}개 {c:,}" for m, c in sorted(r['distribution'].items(), reverse=True))
+        rows.append([f"{j}개", f"{r['cases']:,}", f"{r['min_match']}개", dist])
+    click.echo(tabulate(rows, headers=["기본 번호 중 당첨", "경우의 수", "최소 일치 보장", "최고 일치 게임 분포"], tablefmt="pretty"))
+    if report[drawn]['min_match'] < match:
+        click.secho("  [오류] 설계가 요청한 보장을 만족하지 않습니다.", fg="red")
+        return
+
+    manual_lines = tuple(",".join(map(str, nums)) for nums in lines)
+    if do_buy:
+        if len(manual_lines) > 100:
+            click.echo("한 회차에 1인당 최대 100게임(10만원)까지만 구매할 수 있습니다. 기본 번호나 보장 조건을 줄여주세요.")
+            return
+        ctx.invoke(buy, amount=1, manual_lines=manual_lines, allow_duplicates=False)
+    else:
+        click.echo("\n구매하려면 같은 조건에 --buy 를 붙여 실행하세요.")
 
 @cli.command()
 def buy720():
     """모든 조 번호를 자동으로 설정해 연금복권 720+ 1세트(5,000원)를 구매합니다."""
-    validate_config()
-    with LottoScraper(user_id=DHLOTTERY_ID, user_pw=DHLOTTERY_PW, headless=True) as scraper:
-        if not scraper.login():
-            err_msg = "연금복권 구매 실패: 로그인에 실패했습니다."
-            click.echo(err_msg)
-            notify_result(f"🚨 {err_msg}")
-            return
-            
-        success = scraper.buy_720()
-        if success:
-            msg = "✅ 성공적으로 연금복권 720+ (1세트, 5게임)을 구매했습니다!"
-            click.echo(msg)
-            notify_result(msg)
-        else:
-            msg = "❌ 연금복권 구매에 실패했습니다."
-            click.echo(msg)
-            notify_result(msg)
+    def job(scraper, account):
+        if scraper.buy_720(notify=f"✅ [{account.get('account_id', 'default')}] 연금복권 720+ 1세트 구매 완료"):
+            return True, "✅ 성공적으로 연금복권 720+ (1세트, 5게임)을 구매했습니다!"
+        return False, "❌ 연금복권 구매에 실패했습니다."
+
+    _run_for_selected_accounts(job, "연금복권 구매", "연금복권 구매 실패: 로그인에 실패했습니다.", notify_success=False)
 
 @cli.command()
 @click.option('--amount', default=10000, help='충전할 예치금 액수 (1,000 ~ 50,000)', type=int)
 def charge(amount):
     """지정된 금액만큼 케이뱅크 간편결제를 통해 예치금을 충전합니다."""
-    validate_config()
-    from src.charge import charge_deposit
-    
-    with LottoScraper(user_id=DHLOTTERY_ID, user_pw=DHLOTTERY_PW, headless=True) as scraper:
-        if not scraper.login():
-            err_msg = "간편충전 실패: 로그인에 실패했습니다."
-            click.echo(err_msg)
-            notify_result(f"🚨 {err_msg}")
-            return
-            
+    import time
+    from src.attachments import latest_screenshot
+
+    def job(scraper, account):
         click.echo(f"예치금 충전 모듈 동작 시도: {amount:,}원")
-        success = charge_deposit(scraper.page, amount)
-        if success:
-            msg = f"💳 간편충전 완료: {amount:,}원 예치금 충전이 성공적으로 끝났습니다."
-            click.echo(msg)
-            notify_result(msg)
-        else:
-            msg = f"❌ 간편충전 실패: {amount:,}원 충전 중 에러 발생. 로그를 확인하세요."
-            click.echo(msg)
-            notify_result(msg)
+        started = time.time()
+        if scraper.charge_deposit(amount, pin=account.get('charge_pin')):
+            return True, f"💳 간편충전 완료: {amount:,}원 예치금 충전이 성공적으로 끝났습니다."
+        # 실패 화면을 찍어 두었으면 원인 확인용으로 함께 알림
+        screenshot = latest_screenshot("charge_failed_verify", since=started)
+        if screenshot:
+            notify_result(f"📸 [{account.get('account_id', 'default')}] 간편충전 실패 화면", screenshot)
+        return False, f"❌ 간편충전 실패: {amount:,}원 충전 중 에러 발생. 로그를 확인하세요."
+
+    _run_for_selected_accounts(job, "간편충전", "간편충전 실패: 로그인에 실패했습니다.", login_lazy=False)
 
 @cli.command()
 def check_pending():
@@ -201,6 +390,20 @@ def check_pending():
                     click.echo(f"  {t['numbers']}  =>  {rank}")
                     
             click.echo("  " + "="*48)
+
+    pension_rounds_data = res.get('pension_rounds_data', {})
+    if pension_rounds_data:
+        click.echo("\n[연금복권720+ 채점 결과]")
+        for rank, count in sorted(res['pension_rank_counts'].items()):
+            click.echo(f"  {rank} : {count:>10,} 매")
+        for rnd, data in sorted(pension_rounds_data.items(), reverse=True):
+            click.echo(f"  🎯 연금 {rnd}회차 ({data['draw_date']})")
+            click.echo(f"  1등 번호: {data['win_group']}조 {data['win_number']}  |  보너스: 각조 {data['bonus_number']}")
+            click.echo("  " + "-"*48)
+            for t in data["tickets"]:
+                amt_str = f"({t['win_amount']:,}원)" if t['win_amount'] > 0 else ""
+                click.echo(f"  {t['numbers']}  =>  {t['win_rank']} {amt_str}")
+            click.echo("  " + "="*48)
     
     click.echo("")
 
@@ -224,6 +427,7 @@ def pending():
             numbers = "(번호 미저장)"
         rows.append([
             t['id'],
+            t['account_id'],
             t['round_number'],
             t['purchase_date'],
             t['mode'],
@@ -231,14 +435,14 @@ def pending():
             f"{t['cost']:,}원"
         ])
 
-    click.echo(tabulate(rows, headers=["ID", "회차", "구매일시", "모드", "번호", "금액"], tablefmt="pretty"))
+    click.echo(tabulate(rows, headers=["ID", "계정", "회차", "구매일시", "모드", "번호", "금액"], tablefmt="pretty"))
     click.echo("")
 
 
 @cli.command()
 def stats():
     """로컬 DB에 저장된 내 생애 전체 역대 당첨 내역 누적 통계를 출력합니다."""
-    from src.db import get_all_checked_results
+    from src.db import get_all_checked_results, get_duplicate_tickets, count_tickets_matching_drawn
     
     res = get_all_checked_results()
     
@@ -274,101 +478,714 @@ def stats():
     click.echo(f"  - 1등 : {r1}회  |  2등 : {r2}회  |  3등 : {r3}회")
     click.echo(f"  - 4등 : {r4}회  |  5등 : {r5}회  |  낙첨: {r_fail}회 \n")
 
+    pension_ranks = res.get('pension_rank_counts', {})
+    if pension_ranks:
+        click.echo("  [연금복권720+ 당첨 랭크 누적]")
+        click.echo("  - " + "  |  ".join(f"{rank} : {count}회" for rank, count in sorted(pension_ranks.items())) + "\n")
+
+    duplicates = get_duplicate_tickets()
+    drawn_matches = count_tickets_matching_drawn()
+    if duplicates or drawn_matches:
+        click.echo("  [번호 조합 점검]")
+        if duplicates:
+            extra = sum(d['count'] - 1 for d in duplicates)
+            click.echo(f"  - 같은 회차에 같은 번호를 중복 구매: {len(duplicates)}개 조합 (추가 지출 {extra * 1000:,}원)")
+        if drawn_matches:
+            click.echo(f"  - 과거 1등 당첨 번호와 같은 조합으로 구매: {drawn_matches}게임")
+        click.echo("")
+
+@cli.command()
+@click.option('--output', 'output', type=click.File('wb'), required=True, help='내보낼 파일 ("-" 는 표준 출력)')
+@click.option('--round', 'round_numbers', multiple=True, type=int, help='특정 회차만 내보냅니다. (여러 번 지정 가능)')
+@click.option('--distinct', is_flag=True, help='같은 조합은 한 번만 내보냅니다. (조합 번호 오름차순)')
+@click.pass_context
+def export(ctx, output, round_numbers, distinct):
+    """구매한 로또 번호를 게임당 4바이트 조합 번호(little-endian int32)로 내보냅니다."""
+    from src.db import get_ticket_combos
+    from src import combo
+
+    account_ids = list((ctx.obj or {}).get("account_names") or []) or None
+    combos = get_ticket_combos(account_ids, list(round_numbers) or None)
+    if distinct:
+        combos = sorted(set(combos))
+    count = combo.write_export(output, combos)
+    click.echo(f"{count:,}게임을 {count * combo.EXPORT_DTYPE.itemsize:,}바이트로 내보냈습니다. (src.combo.read_export 로 읽을 수 있습니다)", err=True)
+
+@cli.command()
+@click.option('--numbers', 'numbers_list', multiple=True, help='대입해 볼 번호 6개 (예: "1,2,3,4,5,6", 여러 번 지정 가능)')
+@click.option('--file', 'ticket_file', type=click.File('r', encoding='utf-8'), default=None, help='한 줄에 번호 6개씩 적힌 파일 ("-" 는 표준 입력)')
+@click.option('--from-db', is_flag=True, help='지금까지 구매한 티켓 번호를 사용합니다. (--account 로 계정 제한 가능)')
+@click.option('--last', default=None, type=int, help='최근 N개 회차에만 대입합니다. (기본: 저장된 전체 회차)')
+@click.option('--top', default=5, type=int, help='최고/최저 회차를 몇 개씩 보여줄지')
+@click.option('--csv', 'csv_path', type=click.Path(dir_okay=False), default=None, help='티켓별 결과를 CSV 로 저장 (계산하면서 바로 기록)')
+@click.option('--chunk-cells', default=None, type=int, help='한 번에 채점할 (티켓 x 회차) 칸 수 (메모리 사용량 조절)')
+@click.pass_context
+def replay(ctx, numbers_list, ticket_file, from_db, last, top, csv_path, chunk_cells):
+    """내 번호들을 저장된 과거 모든 회차에 대입해 보면 어땠을지 계산합니다."""
+    import csv
+    import numpy as np
+    from src.db import get_drawn_round_list, get_purchased_combos, get_prize_table
+    from src import scoring, combo
+    from src import replay as replay_engine
+
+    tickets = []
+    try:
+        for text in numbers_list:
+            tickets += replay_engine.parse_ticket_lines([text])
+        if ticket_file:
+            tickets += replay_engine.parse_ticket_lines(ticket_file)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+    if from_db or not tickets:
+        account_ids = list((ctx.obj or {}).get("account_names") or []) or None
+        tickets += combo.decode_array(get_purchased_combos(account_ids)).tolist()
+    # 같은 조합은 조합 번호로 한 번만 대입
+    tickets = [tuple(t) for t in combo.decode_array(sorted(set(combo.encode(t) for t in tickets))).tolist()]
+    if not tickets:
+        click.echo("\n[알림] 대입해 볼 번호가 없습니다. --numbers, --file 로 번호를 주거나 먼저 수동 구매 내역을 쌓아주세요.\n")
+        return
+
+    rounds = get_drawn_round_list(last)
+    if not rounds:
+        click.echo("\n[알림] 저장된 회차 당첨 번호가 없습니다. 'main.py update' 로 당첨 번호를 먼저 저장해주세요.\n")
+        return
+
+    csv_file = open(csv_path, "w", newline="", encoding="utf-8") if csv_path else None
+    on_chunk = None
+    if csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(["numbers"] + scoring.RANK_NAMES[1:] + ["win_amount"])
+
+        def on_chunk(start, ticket_counts, ticket_wins):
+            for i, (counts, win) in enumerate(zip(ticket_counts.tolist(), ticket_wins.tolist())):
+                writer.writerow([",".join(map(str, tickets[start + i]))] + counts[1:] + [win])
+
+    # 실제 당첨금이 저장된 회차는 그 금액으로, 나머지 회차는 기본 금액으로 계산
+    tables = get_prize_table([r['round_number'] for r in rounds])
+    prizes = np.stack([scoring.prize_array(tables.get(r['round_number'])) for r in rounds])
+
+    kwargs = {"chunk_cells": chunk_cells} if chunk_cells else {}
+    try:
+        res = replay_engine.replay(scoring.to_array(tickets), rounds, prizes=prizes, on_chunk=on_chunk, **kwargs)
+    finally:
+        if csv_file:
+            csv_file.close()
+
+    click.echo("\n==================================================")
+    click.echo("         🔁 과거 회차 대입 결과 (What-if) 🔁")
+    click.echo("==================================================")
+    click.echo(f"  • 대입한 번호 조합    : {res['tickets']:>12,} 개")
+    click.echo(f"  • 대입한 회차         : {res['rounds']:>12,} 회 ({rounds[0]['round_number']}~{rounds[-1]['round_number']}회)")
+    click.echo(f"  • 가상 지출금         : {res['total_cost']:>12,} 원")
+    click.echo(f"  • 가상 당첨금         : {res['total_win']:>12,} 원")
+    net = res['total_win'] - res['total_cost']
+    click.echo(f"  • 가상 순수익         : {'+' if net > 0 else ''}{net:>11,} 원")
+    click.echo(f"  • 당첨금 기준         : 실제 당첨금 {len(tables):,}개 회차, 나머지 {len(rounds) - len(tables):,}개 회차는 기본 금액")
+    click.echo("==================================================\n")
+
+    click.echo("[등수별 당첨 횟수]")
+    rows = [[rank, f"{res['rank_counts'].get(rank, 0):,}"] for rank in scoring.RANK_NAMES[1:] + ["낙첨"]]
+    click.echo(tabulate(rows, headers=["등수", "횟수"], tablefmt="pretty"))
+
+    best, worst = replay_engine.best_and_worst_rounds(res, rounds, top)
+    for title, items in (("최고의 회차", best), ("최악의 회차", worst)):
+        click.echo(f"\n[{title}]")
+        click.echo(tabulate(
+            [[r['round_number'], r['draw_date'], r['hits'], f"{r['win']:,}원"] for r in items],
+            headers=["회차", "추첨일", "당첨 게임", "당첨금"], tablefmt="pretty",
+        ))
+
+    if len(tickets) <= 20:
+        click.echo("\n[번호별 최고 등수]")
+        click.echo(tabulate(
+            [[", ".join(f"{n:02d}" for n in t), scoring.RANK_NAMES[r] if r else "-"]
+             for t, r in zip(tickets, res['ticket_best_rank'].tolist())],
+            headers=["번호", "최고 등수"], tablefmt="pretty",
+        ))
+    if csv_path:
+        click.echo(f"\n티켓별 결과를 {csv_path} 에 저장했습니다.")
+    click.echo("")
+
 @cli.command()
-def update():
+@click.option('--strategy', 'strategies', multiple=True, help='비교할 전략 (예: "혼합:auto=3,manual=2,pension=1", 여러 번 지정 가능)')
+@click.option('--weeks', default=520, type=click.IntRange(1), help='한 번의 시행에서 구매를 이어가는 주 수 (기본 10년)')
+@click.option('--trials', default=10000, type=click.IntRange(1), help='전략별 시행 횟수')
+@click.option('--seed', default=0, type=int, help='난수 시드 (같은 시드면 같은 결과)')
+@click.option('--workers', default=None, type=click.IntRange(1), help='사용할 프로세스 수 (기본: CPU 코어 수)')
+@click.option('--prize-rounds', default=52, type=click.IntRange(1), help='최근 N개 회차 실제 당첨금 평균으로 계산합니다. (기본 52)')
+@click.option('--json', 'json_path', type=click.Path(dir_okay=False), default=None, help='전체 결과를 JSON 파일로 저장')
+def simulate(strategies, weeks, trials, seed, workers, prize_rounds, json_path):
+    """구매 전략별 기대 수익률과 변동성을 몬테카를로 시뮬레이션으로 비교합니다."""
+    import json
+    from src import odds, simulate as simulator
+    from src.db import get_drawn_round_list, get_prize_table
+
+    try:
+        parsed = [simulator.parse_strategy(s) for s in (strategies or simulator.DEFAULT_STRATEGIES)]
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--strategy")
+
+    tables = get_prize_table([r['round_number'] for r in get_drawn_round_list(last=prize_rounds)])
+    prize_source = f"최근 {len(tables)}개 회차 실제 당첨금 평균" if tables else "기본 당첨금 (저장된 실제 당첨금 없음)"
+    prizes = odds.average_prizes(tables)
+
+    click.echo(f"\n전략 {len(parsed)}개를 각각 {trials:,}회 x {weeks:,}주 시뮬레이션합니다...")
+    results = []
+    for strategy in parsed:
+        res = simulator.simulate(strategy, trials=trials, weeks=weeks, seed=seed, workers=workers, prizes=prizes)
+        res["prize_source"] = prize_source
+        results.append(res)
+        click.echo(f"  - {res['strategy']}: {res['simulated_tickets']:,}장 채점, {res['tickets_per_second']:,.0f}장/초")
+
+    rows = []
+    for r in results:
+        p = r['roi_percentiles']
+        first_win = f"{r['first_win_week_median']:.0f}주" if r['first_win_week_median'] is not None else "-"
+        rows.append([
+            r['strategy'],
+            f"{r['weekly_cost']:,}원",
+            f"{r['roi_mean'] * 100:+.1f}%",
+            f"{r['roi_std'] * 100:.1f}%p",
+            f"{p['p5'] * 100:+.0f}% / {p['p50'] * 100:+.0f}% / {p['p95'] * 100:+.0f}%",
+            f"{r['profit_probability'] * 100:.2f}%",
+            f"{r['max_drawdown_mean']:,.0f}원",
+            first_win,
+            f"{r['never_won_ratio'] * 100:.1f}%",
+        ])
+    click.echo("")
+    click.echo(tabulate(rows, headers=["전략", "주당 비용", "평균 ROI", "ROI 표준편차", "ROI p5/p50/p95", "수익 확률", "평균 최대 낙폭", "첫 당첨(중앙값)", "무당첨 비율"], tablefmt="pretty"))
+    click.echo(f"* 로또 당첨금은 {prize_source}을 사용하며, 세금은 반영하지 않았습니다.\n")
+
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        click.echo(f"결과를 {json_path} 에 저장했습니다.\n")
+
+def _probability_text(p: float) -> str:
+    if p <= 0:
+        return "-"
+    return f"{p * 100:.2f}%" if p >= 0.01 else f"1/{1 / p:,.0f}"
+
+@cli.command()
+@click.option('--numbers', 'numbers_list', multiple=True, help='로또 번호 6개 (예: "1,2,3,4,5,6", 여러 번 지정 가능)')
+@click.option('--pension', 'pension_list', multiple=True, help='연금복권 번호 (예: "3조 123456", 여러 번 지정 가능)')
+@click.option('--auto', 'auto_lines', default=0, type=click.IntRange(0), help='번호를 모르는 로또 자동 게임 수')
+@click.option('--pension-sets', default=0, type=click.IntRange(0), help='번호를 모르는 연금복권 모든조 세트(5매) 수')
+@click.option('--from-db', is_flag=True, help='이번 회차 추첨 전 티켓을 사용합니다. (번호를 하나도 주지 않으면 기본)')
+@click.option('--prize-round', default=None, type=int, help='이 회차의 실제 1~5등 당첨금으로 계산합니다.')
+@click.option('--prize-rounds', default=52, type=click.IntRange(1), help='최근 N개 회차 실제 당첨금 평균으로 계산합니다. (기본 52)')
+@click.option('--json', 'json_path', type=click.Path(dir_okay=False), default=None, help='결과를 JSON 파일로 저장')
+@click.pass_context
+def odds(ctx, numbers_list, pension_list, auto_lines, pension_sets, from_db, prize_round, prize_rounds, json_path):
+    """티켓 묶음의 등수별 당첨 확률과 기대 당첨금/표준편차를 (시뮬레이션 없이) 정확히 계산합니다."""
+    import json
+    from src import odds as calculator, scoring
+    from src.db import get_drawn_round_list, get_pending_tickets, get_prize_table
+    from src.rounds import next_draw_round
+
+    lines, tickets = [], []
+    for text in numbers_list:
+        nums = scoring.parse_numbers(text.replace(" ", ","))
+        if nums is None:
+            raise click.BadParameter(f"로또 번호는 1~45 사이의 서로 다른 숫자 6개여야 합니다: '{text}'", param_hint="--numbers")
+        lines.append(sorted(nums))
+    for text in pension_list:
+        ticket = scoring.parse_pension_ticket(text)
+        if ticket is None:
+            raise click.BadParameter(f"연금복권 번호는 \"3조 123456\" 형식이어야 합니다: '{text}'", param_hint="--pension")
+        tickets.append(ticket)
+
+    if from_db or not (lines or tickets or auto_lines or pension_sets):
+        account_ids = set((ctx.obj or {}).get("account_names") or [])
+        pending = [t for t in get_pending_tickets() if not account_ids or t['account_id'] in account_ids]
+        lotto_round = next_draw_round()
+        pension_rows = [t for t in pending if t['mode'].startswith("연금")]
+        pension_round = max((t['round_number'] for t in pension_rows), default=0)
+        for t in pending:
+            if t['mode'].startswith("연금"):
+                if t['round_number'] not in (0, pension_round):
+                    continue
+                ticket = scoring.parse_pension_ticket(t['numbers'])
+                if ticket:
+                    tickets.append(ticket)
+                else:
+                    pension_sets += 1
+            elif t['round_number'] in (0, lotto_round):
+                nums = scoring.parse_numbers(t['numbers'])
+                if nums:
+                    lines.append(sorted(nums))
+                else:
+                    auto_lines += 1
+        click.echo(f"\n{lotto_round}회차 추첨 전 티켓: 로또 {len(lines) + auto_lines}게임, 연금복권 {len(tickets) + pension_sets * 5}매")
+
+    if not (lines or tickets or auto_lines or pension_sets):
+        click.echo("\n[알림] 계산할 티켓이 없습니다. --numbers / --pension 으로 번호를 지정해 주세요.\n")
+        return
+
+    if prize_round:
+        tables = get_prize_table([prize_round])
+        prize_source = f"{prize_round}회차 실제 당첨금" if tables else "기본 당첨금 (해당 회차 당첨금 미저장)"
+    else:
+        tables = get_prize_table([r['round_number'] for r in get_drawn_round_list(last=prize_rounds)])
+        prize_source = f"최근 {len(tables)}개 회차 실제 당첨금 평균" if tables else "기본 당첨금 (저장된 실제 당첨금 없음)"
+    prizes = calculator.average_prizes(tables)
+
+    expected = variance = cost = 0.0
+    result = {"prize_source": prize_source, "prizes": prizes.tolist()}
+    if lines or auto_lines:
+        click.echo(f"\n[로또6/45] 번호를 아는 게임 {len(lines)}개" + (f" + 번호 미확인 자동 {auto_lines}게임" if auto_lines else "") + f" ({prize_source})")
+        lotto = calculator.lotto_outcomes(lines, prizes) if lines else None
+        if lotto:
+            rows = [
+                [scoring.RANK_NAMES[r], f"{prizes[r]:,}원", _probability_text(lotto['any_rank'][r]), _probability_text(lotto['best_rank'][r]), f"{lotto['expected_hits'][r]:.3g}"]
+                for r in range(1, 6)
+            ]
+            rows.append(["당첨 없음", "-", "-", _probability_text(lotto['best_rank'][0]), "-"])
+            click.echo(tabulate(rows, headers=["등수", "당첨금", "1게임 이상 당첨", "최고 등수", "기대 당첨 게임 수"], tablefmt="pretty"))
+            expected, variance = lotto['expected'], lotto['variance']
+            result["lotto"] = lotto
+        if auto_lines:
+            e, v = calculator.random_lines(auto_lines, prizes)
+            expected, variance = expected + e, variance + v
+            click.echo("  * 번호 미확인 자동 게임은 기대 당첨금/분산에만 반영했습니다. (등수 확률 표 제외)")
+        cost += 1000 * (len(lines) + auto_lines)
+
+    if tickets or pension_sets:
+        click.echo(f"\n[연금복권720+] 번호를 아는 티켓 {len(tickets)}매" + (f" + 번호 미확인 모든조 {pension_sets}세트" if pension_sets else ""))
+        pension = calculator.pension_outcomes(tickets) if tickets else None
+        if pension:
+            rows = [
+                [scoring.PENSION_RANK_NAMES[r], f"{scoring.PENSION_PRIZES[r]:,}원", _probability_text(pension['any_rank'][r]), _probability_text(pension['best_rank'][r]), f"{pension['expected_hits'][r]:.3g}"]
+                for r in range(1, 8)
+            ]
+            rows.append(["보너스", f"{scoring.PENSION_BONUS_PRIZE:,}원", _probability_text(pension['bonus_probability']), "-", "-"])
+            click.echo(tabulate(rows, headers=["등수", "당첨금", "1매 이상 당첨", "최고 등수", "기대 당첨 매수"], tablefmt="pretty"))
+            expected, variance = expected + pension['expected'], variance + pension['variance']
+            result["pension"] = pension
+        if pension_sets:
+            e, v = calculator.random_pension_sets(pension_sets)
+            expected, variance = expected + e, variance + v
+        cost += 1000 * len(tickets) + 5000 * pension_sets
+
+    click.echo("\n[합계] 로또와 연금복권은 서로 독립이라 기댓값과 분산을 그대로 더했습니다.")
+    click.echo(f"  • 구매 금액        : {cost:>16,.0f} 원")
+    click.echo(f"  • 기대 당첨금      : {expected:>16,.0f} 원  (기대 수익률 {(expected / cost - 1) * 100:+.1f}%)")
+    click.echo(f"  • 당첨금 표준편차  : {variance ** 0.5:>16,.0f} 원")
+    click.echo("  * 1등 당첨금은 당첨자 수에 따라 나뉘며, 세금은 반영하지 않았습니다.\n")
+
+    if json_path:
+        result.update({"cost": cost, "expected": expected, "variance": variance})
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        click.echo(f"결과를 {json_path} 에 저장했습니다.\n")
+
+@cli.command()
+@click.option('--top', default=10, type=int, help='순위별로 보여줄 개수')
+@click.option('--number', 'number', default=None, type=click.IntRange(1, 45), help='특정 번호의 출현 횟수/미출현 기간/자주 함께 나온 번호')
+@click.option('--json', 'json_path', type=click.Path(dir_okay=False), default=None, help='통계를 JSON 파일로도 저장')
+def analyze(top, number, json_path):
+    """저장된 전체 당첨 번호로 번호별 출현 빈도, 미출현 기간, 함께 나온 번호 쌍/세 개 묶음을 분석합니다."""
+    import json
+    from src import analytics
+
+    state, added = analytics.refresh()
+    rounds, latest = (int(n) for n in state["meta"])
+    if not rounds:
+        click.echo("\n[알림] 저장된 회차 당첨 번호가 없습니다. 'main.py update' 로 당첨 번호를 먼저 저장해주세요.\n")
+        return
+
+    freq, gap = state["freq"], analytics.gaps(state)
+    by_freq = sorted(range(45), key=lambda i: (-freq[i], i))
+    by_gap = sorted(range(45), key=lambda i: (-gap[i], i))
+    pairs = analytics.top_pairs(state, top)
+    triples = analytics.top_triples(state, top)
+
+    click.echo("\n==================================================")
+    click.echo("          📈 당첨 번호 출현 통계 📈")
+    click.echo("==================================================")
+    click.echo(f"  • 분석한 회차 : {rounds:,}회 (최근 {latest}회차까지, 이번에 새로 반영 {added}회)")
+    click.echo("==================================================\n")
+
+    click.echo("[자주 나온 번호 / 적게 나온 번호 / 오래 안 나온 번호]")
+    click.echo(tabulate(
+        [[f"{by_freq[i] + 1:02d} ({freq[by_freq[i]]}회)", f"{by_freq[-1 - i] + 1:02d} ({freq[by_freq[-1 - i]]}회)",
+          f"{by_gap[i] + 1:02d} ({gap[by_gap[i]]}회째)"] for i in range(min(top, 45))],
+        headers=["최다 출현", "최소 출현", "최장 미출현"], tablefmt="pretty",
+    ))
+    click.echo("\n[함께 자주 나온 번호 쌍 / 세 개 묶음]")
+    click.echo(tabulate(
+        [[f"{a:02d}-{b:02d} ({c}회)", f"{x:02d}-{y:02d}-{z:02d} ({t}회)"] for ((a, b), c), ((x, y, z), t) in zip(pairs, triples)],
+        headers=["번호 쌍", "세 개 묶음"], tablefmt="pretty",
+    ))
+
+    if number:
+        i = number - 1
+        click.echo(f"\n[{number:02d}번] 1등 번호 {freq[i]}회, 보너스 {state['bonus_freq'][i]}회, 마지막 출현 후 {gap[i]}회차 경과")
+        click.echo("  함께 자주 나온 번호: " + ", ".join(f"{n:02d}({c}회)" for n, c in analytics.partners(state, number, top)))
+    click.echo("")
+
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "rounds": rounds,
+                "latest_round": latest,
+                "frequency": {n + 1: int(freq[n]) for n in range(45)},
+                "bonus_frequency": {n + 1: int(state["bonus_freq"][n]) for n in range(45)},
+                "gap": {n + 1: int(gap[n]) for n in range(45)},
+                "top_pairs": [[list(p), c] for p, c in pairs],
+                "top_triples": [[list(t), c] for t, c in triples],
+            }, f, ensure_ascii=False, indent=2)
+        click.echo(f"결과를 {json_path} 에 저장했습니다.\n")
+
+def _roi_text(roi) -> str:
+    return "-" if roi is None else f"{roi * 100:+.1f}%"
+
+@cli.command()
+@click.option('--by', 'period_type', default='month', type=click.Choice(['week', 'month', 'year']), help='집계 기간 단위')
+@click.option('--group', 'group_by', default='mode', type=click.Choice(['none', 'mode', 'account']), help='나눠 볼 기준 (구매 방식/계정)')
+@click.option('--game', default='all', type=click.Choice(['all', 'lotto', 'pension']), help='로또/연금복권만 보기')
+@click.option('--last', default=12, type=int, help='최근 N개 기간만 보여줍니다. (0 이면 전체, 누적값은 항상 전체 기간 기준)')
+@click.option('--window', default=3, type=click.IntRange(1, None), help='이동 수익률을 계산할 기간 수')
+@click.option('--rebuild', is_flag=True, help='집계 테이블을 전체 구매 내역으로 다시 계산합니다.')
+@click.option('--json', 'json_path', type=click.Path(dir_okay=False), default=None, help='결과를 JSON 파일로도 저장')
+@click.pass_context
+def report(ctx, period_type, group_by, game, last, window, rebuild, json_path):
+    """주/월/연 단위 지출, 당첨금, 수익률(ROI), 등수별 개수, 적중률을 구매 방식/계정별로 보여줍니다."""
+    import json
+    from src.db import rebuild_rollups, get_rollup_report, get_rollup_rank_counts
+
+    if rebuild:
+        rebuild_rollups()
+    account_ids = list((ctx.obj or {}).get("account_names") or []) or None
+    rows = get_rollup_report(period_type, group_by, account_ids, game, last or None, window)
+    if not rows:
+        click.echo("\n[알림] 기록된 구매 내역이 없습니다.\n")
+        return
+    ranks = get_rollup_rank_counts(period_type, group_by, account_ids, game, sorted({r['period'] for r in rows}))
+
+    def rank_text(counts: dict) -> str:
+        won = sorted((rank, c) for rank, c in counts.items() if rank not in ('낙첨', '추첨 전'))
+        return ", ".join(f"{rank} {c}" for rank, c in won) or "-"
+
+    unit = {"week": "주", "month": "월", "year": "연"}[period_type]
+    click.echo(f"\n[{unit} 단위 손익 리포트] 이동 수익률: 최근 {window}개 기간, 누적: 전체 기간")
+    table = []
+    for r in rows:
+        table.append([
+            r['period'], r['group'], r['games'], f"{r['cost']:,}", f"{r['win_amount']:,}", _roi_text(r['roi']),
+            "-" if r['hit_rate'] is None else f"{r['hit_rate'] * 100:.1f}%",
+            rank_text(ranks.get((r['period'], r['group']), {})), _roi_text(r['moving_roi']),
+            f"{r['total_win'] - r['total_cost']:+,}", _roi_text(r['cumulative_roi']),
+        ])
+    click.echo(tabulate(table, headers=["기간", "구분", "게임", "지출", "당첨금", "수익률", "적중률", "당첨 등수",
+                                        "이동 수익률", "누적 손익", "누적 수익률"], tablefmt="pretty"))
+
+    # 구분별 전체 기간 누적 (각 구분의 마지막 행이 누적값)
+    latest = {r['group']: r for r in rows}
+    click.echo("\n[구분별 누적]")
+    click.echo(tabulate(
+        [[g, f"{r['total_games']:,}", f"{r['total_cost']:,}", f"{r['total_win']:,}", f"{r['total_win'] - r['total_cost']:+,}", _roi_text(r['cumulative_roi'])]
+         for g, r in sorted(latest.items())],
+        headers=["구분", "게임", "지출", "당첨금", "손익", "수익률"], tablefmt="pretty",
+    ))
+    click.echo("")
+
+    if json_path:
+        for r in rows:
+            r['ranks'] = ranks.get((r['period'], r['group']), {})
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+        click.echo(f"결과를 {json_path} 에 저장했습니다.\n")
+
+@cli.command()
+@click.option('--numbers', 'numbers_text', required=True, help='찾을 번호 (예: "7,13,22")')
+@click.option('--any', 'match_any', is_flag=True, help='번호 중 하나라도 포함한 티켓을 찾습니다. (기본: 모두 포함)')
+@click.option('--min-match', default=None, type=click.IntRange(1, 6), help='번호 중 최소 몇 개를 포함해야 하는지')
+@click.option('--from-round', default=None, type=int, help='이 회차부터')
+@click.option('--to-round', default=None, type=int, help='이 회차까지')
+@click.option('--limit', default=50, type=int, help='보여줄 최대 티켓 수 (0 이면 전체)')
+@click.pass_context
+def search(ctx, numbers_text, match_any, min_match, from_round, to_round, limit):
+    """구매한 로또 티켓 중 주어진 번호를 모두(또는 일부) 포함한 티켓을 회차 범위로 찾습니다."""
+    from src.db import search_tickets
+
+    try:
+        nums = sorted({int(n) for n in numbers_text.replace(',', ' ').split()})
+    except ValueError:
+        raise click.BadParameter("번호는 숫자 형식이어야 합니다.", param_hint="--numbers")
+    if not nums or not all(1 <= n <= 45 for n in nums):
+        raise click.BadParameter("번호는 1부터 45 사이여야 합니다.", param_hint="--numbers")
+    need = min_match or (1 if match_any else len(nums))
+    if need > len(nums):
+        raise click.BadParameter(f"찾을 번호({len(nums)}개)보다 많이 포함할 수는 없습니다.", param_hint="--min-match")
+
+    account_ids = list((ctx.obj or {}).get("account_names") or []) or None
+    rows = search_tickets(nums, need, from_round, to_round, account_ids, limit or None)
+    span = f"{from_round or '처음'}~{to_round or '최근'}회차"
+    click.echo(f"\n[티켓 검색] {','.join(map(str, nums))} 중 {need}개 이상 포함 ({span}): {len(rows)}게임")
+    if not rows:
+        click.echo("")
+        return
+
+    def marked(numbers: str) -> str:
+        return " ".join(f"[{n:02d}]" if n in nums else f" {n:02d} " for n in sorted(int(x) for x in numbers.replace(' ', '').split(',')))
+
+    click.echo(tabulate(
+        [[r['round_number'], r['purchase_date'][:10], r['account_id'], r['mode'], marked(r['numbers']), r['matched'],
+          r['win_rank'], f"{r['win_amount']:,}"] for r in rows],
+        headers=["회차", "구매일", "계정", "방식", "번호 ([ ] = 찾은 번호)", "포함", "결과", "당첨금"], tablefmt="pretty",
+    ))
+    click.echo("")
+
+def _win_alert(account_id: str, game: str, graded: list[tuple[int, str, int]]) -> str | None:
+    """채점 결과 중 당첨이 있으면 알림 메시지 (없으면 None)"""
+    wins = [(rank, amount) for _, rank, amount in graded if amount > 0]
+    if not wins:
+        return None
+    counts = {}
+    for rank, _ in wins:
+        counts[rank] = counts.get(rank, 0) + 1
+    detail = ", ".join(f"{rank} {count}건" for rank, count in sorted(counts.items()))
+    return f"🎉 [{account_id}] {game} 당첨: {detail} (총 {sum(amount for _, amount in wins):,}원)"
+
+@cli.command()
+@click.option('--retry', is_flag=True, help='보내지 못한 알림(재시도를 포기한 알림 포함)을 지금 다시 보냅니다.')
+def outbox(retry):
+    """보내지 못하고 편지함에 남아 있는 알림을 확인하거나 다시 보냅니다."""
+    from src import notifier
+    from src.db import get_pending_notifications, retry_notifications
+
+    if retry and not notifier.channel_names():
+        click.echo("설정된 알림 채널이 없습니다. (.env 의 DISCORD_WEBHOOK_URL / TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID)")
+    elif retry:
+        count = retry_notifications()
+        if count:
+            sent = notifier.flush()
+            click.echo(f"알림 {count}건을 다시 보냈습니다." if sent else f"알림 {count}건 중 일부를 보내지 못해 편지함에 남겼습니다.")
+    rows = get_pending_notifications()
+    if not rows:
+        click.echo("\n편지함에 보내지 못한 알림이 없습니다.\n")
+        return
+    click.echo(f"\n[보내지 못한 알림] {len(rows)}건")
+    click.echo(tabulate(
+        [[r['id'], r['channel'], r['created_at'], r['attempts'], r['last_error'] or "-", r['message'].splitlines()[0][:40]] for r in rows],
+        headers=["ID", "채널", "생성", "시도", "마지막 오류", "내용"], tablefmt="pretty",
+    ))
+    click.echo("")
+
+@cli.command()
+@click.option('--refresh-prizes', is_flag=True, help='실제 당첨금이 저장되지 않은 지난 회차의 당첨금도 가져와 기존 채점 금액을 바로잡습니다.')
+def update(refresh_prizes):
     """아직 당첨 확인이 안 된 회차의 결과를 동행복권 사이트에서 스크래핑하여 DB를 갱신합니다."""
-    validate_config()
-    from src.db import get_pending_purchases, update_ticket_result, add_or_update_round, DB_FILE
-    import sqlite3
-    
-    with LottoScraper(user_id=DHLOTTERY_ID, user_pw=DHLOTTERY_PW, headless=True) as scraper:
-        if not scraper.login():
-            click.echo("로그인에 실패하여 당첨 결과를 갱신할 수 없습니다.")
-            return
-            
+    from src.db import (
+        get_pending_purchases_for_rounds, update_ticket_results, add_or_update_rounds, get_drawn_rounds, assign_unmapped_round,
+        add_or_update_prizes, get_prize_table, get_graded_rounds_without_prizes, regrade_prizes,
+        get_unconfirmed_tickets, get_confirmed_auto_numbers,
+        get_pending_pension_tickets, get_pension_draws, add_or_update_pension_rounds,
+    )
+    from src import scoring
+    from src.reconcile import match_unconfirmed_tickets
+
+    def grade_lotto(scraper):
+        """로또6/45 티켓을 채점합니다. 최근 당첨 내역이 비어 있어 채점할 것이 없으면 None"""
         results = scraper.update_buy_list()
+        if results is None:
+            return False, "당첨 내역(로또6/45) 조회에 실패했습니다."
         if not results:
-            click.echo("최근 당첨 내역(로또6/45)이 없거나 스크래핑에 실패했습니다.")
-            return
+            return None
             
         # 1. 미할당된 round_number(0)가 있다면 가장 최근 미추첨/낙첨 내역의 회차로 매핑
         # (현실적으로 가장 높은 회차 번호를 부여하는 임시 보정 처리)
         round_numbers = sorted(list(set(int(r['round']) for r in results)))
         if round_numbers:
-            latest_round = max(round_numbers)
-            conn = sqlite3.connect(DB_FILE)
-            cur = conn.cursor()
-            cur.execute("UPDATE purchases SET round_number = ? WHERE round_number = 0", (latest_round,))
-            conn.commit()
-            conn.close()
-
-        update_count = 0
-        
-        # 2. 이번에 확인된 고유 회차들을 순회하며 각 티켓별로 채점
-        for round_no in round_numbers:
-            pending_tickets = get_pending_purchases(round_no)
-            if not pending_tickets:
+            assign_unmapped_round(max(round_numbers), scraper.account_id)
+
+        # 2. 번호 없이 "확인필요" 로 저장된 자동 티켓은 구매 상세 내역(회차당 요청 1번)에서 실제 번호를 찾아 보정
+        #    이미 임시로 당첨/낙첨 처리된 티켓도 실제 번호로 다시 채점합니다.
+        pending_tickets = get_pending_purchases_for_rounds(round_numbers, account_id=scraper.account_id)
+        unconfirmed = get_unconfirmed_tickets(round_numbers, account_id=scraper.account_id)
+        reconciled = {}
+        if unconfirmed:
+            unconfirmed_rounds = sorted(set(t['round_number'] for t in unconfirmed))
+            details = scraper.get_ticket_details_bulk(unconfirmed_rounds)
+            matched = match_unconfirmed_tickets(
+                unconfirmed, get_confirmed_auto_numbers(unconfirmed_rounds, account_id=scraper.account_id), details,
+            )
+            reconciled = {pid: ",".join(map(str, nums)) for pid, nums in matched.items()}
+            if len(reconciled) < len(unconfirmed):
+                click.secho(f"  구매 상세 내역에서 번호를 찾지 못한 자동 티켓 {len(unconfirmed) - len(reconciled)}건은 '확인필요'로 남겨 둡니다.", fg="yellow")
+            for t in pending_tickets:
+                t['numbers'] = reconciled.get(t['id'], t['numbers'])
+            pending_tickets += [
+                {**t, 'numbers': reconciled[t['id']]} for t in unconfirmed
+                if t['id'] in reconciled and t['win_rank'] != '추첨 전'
+            ]
+
+        # 3. 채점 대상 회차 선별: 미채점 티켓이 있고, 사이트 내역상 추첨이 끝난 회차
+        status_by_round = {}
+        for r in results:
+            status_by_round.setdefault(int(r['round']), []).append(r['result'])
+        target_rounds = sorted(
+            rnd for rnd in set(t['round_number'] for t in pending_tickets)
+            if status_by_round.get(rnd) and "미추첨" not in status_by_round[rnd]
+        )
+        refresh_rounds = get_graded_rounds_without_prizes() if refresh_prizes else []
+        if not target_rounds and not refresh_rounds:
+            update_ticket_results([], numbers=reconciled)
+            msg = "DB 정밀 채점 완료: 새로 추첨된 회차가 없어 채점할 게임이 없습니다."
+            if reconciled:
+                msg += f" ('확인필요' 자동 티켓 {len(reconciled)}건의 번호를 보정)"
+            return True, msg
+
+        # 4. 이미 DB에 저장된 회차(당첨 번호 + 등수별 당첨금)는 재사용하고,
+        #    나머지만 공식 API에서 동시에 가져와 한 번에 저장
+        prize_rounds = sorted(set(target_rounds) | set(refresh_rounds))
+        draws = get_drawn_rounds(target_rounds)
+        prize_table = get_prize_table(prize_rounds)
+        missing = [rnd for rnd in prize_rounds if rnd not in prize_table or (rnd in target_rounds and rnd not in draws)]
+        if missing:
+            fetched = scraper.get_official_winning_numbers_bulk(missing)
+            for rnd in missing:
+                if rnd not in fetched:
+                    click.secho(f"  [{rnd}회차] 당첨 번호 정보를 가져올 수 없습니다. 현재 접속자가 많아 대기열(WAF)이 활성화되었을 수 있습니다. 나중에 다시 시도해주세요.", fg="yellow")
+            add_or_update_rounds(list(fetched.values()))
+            add_or_update_prizes(list(fetched.values()))
+            draws.update({rnd: d for rnd, d in fetched.items() if rnd in target_rounds})
+            prize_table = get_prize_table(prize_rounds)
+        for rnd in target_rounds:
+            if rnd in draws and rnd not in prize_table:
+                click.secho(f"  [{rnd}회차] 실제 당첨금 정보를 가져오지 못해 기본 금액으로 채점합니다. ('update --refresh-prizes' 로 나중에 바로잡을 수 있습니다)", fg="yellow")
+
+        # 5. 대상 회차의 모든 티켓을 회차별 NumPy 배열로 한 번에 채점하고, 보정한 번호와 함께 한 트랜잭션으로 반영
+        graded = []
+        unresolved = 0
+        tickets_by_round = {}
+        for t in pending_tickets:
+            if t['round_number'] not in draws:
+                # 번호를 보정했지만 당첨 번호를 못 가져온 티켓은 다음 갱신 때 다시 채점되도록 '추첨 전'으로 되돌림
+                if t.get('win_rank', '추첨 전') != '추첨 전':
+                    graded.append((t['id'], '추첨 전', 0))
                 continue
-                
-            # 해당 회차가 추첨 완료되었는지 사이트 내역상 확인
-            round_status_list = [r['result'] for r in results if int(r['round']) == round_no]
-            if not round_status_list or "미추첨" in round_status_list:
-                # 아직 추첨 전이면 스킵
+            # 구매 상세 내역에서도 번호를 찾지 못한 "확인필요" 자동 티켓은 임의로 당첨/낙첨을 매기지 않고
+            # '추첨 전'으로 남겨 다음 갱신 때 번호 보정과 채점을 다시 시도
+            if t['numbers'] == "확인필요":
+                unresolved += 1
                 continue
-                
-            # 추첨이 완료된 회차라면 공식 API로 7개의 당첨 번호 로드
-            official_data = scraper.get_official_winning_numbers(round_no)
-            if not official_data:
-                click.secho(f"  [{round_no}회차] 당첨 번호 정보를 가져올 수 없습니다. 현재 접속자가 많아 대기열(WAF)이 활성화되었을 수 있습니다. 나중에 다시 시도해주세요.", fg="yellow")
+            nums = scoring.parse_numbers(t['numbers'])
+            if nums is None:
+                print(f"티켓 파싱/채점 오류 (ID:{t['id']}): {t['numbers']}")
                 continue
-                
-            add_or_update_round(
-                round_number=round_no, 
-                draw_date=official_data['draw_date'],
-                winning_numbers=",".join(map(str, official_data['winning_numbers'])),
-                bonus_number=official_data['bonus_number'],
-                is_drawn=True
+            ids, rows = tickets_by_round.setdefault(t['round_number'], ([], []))
+            ids.append(t['id'])
+            rows.append(nums)
+
+        for rnd, (ids, rows) in tickets_by_round.items():
+            draw = draws[rnd]
+            ranks, amounts = scoring.grade(
+                scoring.to_array(rows), draw['winning_numbers'], draw['bonus_number'],
+                prizes=scoring.prize_array(prize_table.get(rnd)),
             )
-            
-            win_nums = set(official_data['winning_numbers'])
-            bonus_num = official_data['bonus_number']
-            
-            # 각 티켓 정밀 1:1 채점
-            for t in pending_tickets:
-                # 숫자형태 파싱 시도 (단, "확인필요" 등 자동 티켓은 임시 처리)
-                if t['numbers'] == "확인필요":
-                    # 자동은 현재 영수증 파싱이 안 되었으므로, 동행복권 결과상의 평균 값(낙첨/당첨 판별) 임의 부여
-                    overall_result = round_status_list[0] if round_status_list else "낙첨"
-                    rank = "당첨" if overall_result != "낙첨" else "낙첨"
-                    update_ticket_result(t['id'], rank, 0)
-                    update_count += 1
-                else:
-                    try:
-                        my_nums = set(map(int, t['numbers'].replace(" ", "").split(',')))
-                        match_count = len(my_nums & win_nums)
-                        bonus_match = bonus_num in my_nums
-                        
-                        rank = "낙첨"
-                        amt = 0
-                        if match_count == 6:
-                            rank, amt = "1등", 2000000000 # 가상의 평균액 (실제로는 동행복권 API 데이터나 크롤링 필요)
-                        elif match_count == 5 and bonus_match:
-                            rank, amt = "2등", 50000000
-                        elif match_count == 5:
-                            rank, amt = "3등", 1500000
-                        elif match_count == 4:
-                            rank, amt = "4등", 50000
-                        elif match_count == 3:
-                            rank, amt = "5등", 5000
-                        else:
-                            rank, amt = "낙첨", 0
-                            
-                        update_ticket_result(t['id'], rank, amt)
-                        update_count += 1
-                    except Exception as e:
-                        print(f"티켓 파싱/채점 오류 (ID:{t['id']}): {e}")
-
-        click.echo(f"DB 정밀 채점 완료: 총 {update_count}건의 게임 결과가 완전히 매핑 및 개별 채점되었습니다.")
+            graded.extend(
+                (purchase_id, scoring.RANK_NAMES[rank], amount)
+                for purchase_id, rank, amount in zip(ids, ranks.tolist(), amounts.tolist())
+            )
+
+        update_ticket_results(graded, numbers=reconciled, notify=_win_alert(scraper.account_id, "로또", graded))
+        # 6. 당첨금이 새로 저장된 회차의 기존 채점 결과도 실제 금액으로 한 번에 보정
+        corrected = regrade_prizes(sorted(prize_table)) if prize_table else 0
+        msg = f"DB 정밀 채점 완료: 총 {len(graded)}건의 게임 결과가 완전히 매핑 및 개별 채점되었습니다."
+        if reconciled:
+            msg += f" ('확인필요' 자동 티켓 {len(reconciled)}건의 번호를 구매 상세 내역으로 보정)"
+        if corrected:
+            msg += f" (기존 당첨 {corrected}건의 당첨금을 실제 금액으로 보정)"
+        if unresolved:
+            msg += f" (번호를 찾지 못한 '확인필요' 자동 티켓 {unresolved}건은 다음 갱신 때 다시 채점)"
+        return True, msg
+
+    def grade_pension(scraper):
+        """연금복권720+ '추첨 전' 티켓을 채점합니다. 채점할 티켓이 없으면 None"""
+        pending = get_pending_pension_tickets(account_id=scraper.account_id)
+        if not pending:
+            return None
+        ledger_by_round = {}
+        for r in scraper.update_buy_list(game="연금복권720+") or []:
+            ledger_by_round.setdefault(int(r['round']), []).append(r)
+        if ledger_by_round and any(t['round_number'] == 0 for t in pending):
+            assign_unmapped_round(max(ledger_by_round), scraper.account_id, pension=True)
+            pending = get_pending_pension_tickets(account_id=scraper.account_id)
+
+        target_rounds = sorted(
+            rnd for rnd in set(t['round_number'] for t in pending)
+            if ledger_by_round.get(rnd) and all(r['result'] != "미추첨" for r in ledger_by_round[rnd])
+        )
+        if not target_rounds:
+            return "연금복권: 새로 추첨된 회차가 없어 채점할 티켓이 없습니다."
+
+        draws = get_pension_draws(target_rounds)
+        missing = [rnd for rnd in target_rounds if rnd not in draws]
+        if missing:
+            fetched = scraper.get_pension_results_bulk(missing)
+            for rnd in missing:
+                if rnd not in fetched:
+                    click.secho(f"  [연금 {rnd}회차] 당첨 결과를 가져올 수 없습니다. 나중에 다시 시도해주세요.", fg="yellow")
+            add_or_update_pension_rounds(list(fetched.values()))
+            draws.update(fetched)
+
+        # 조/번호가 있는 티켓은 회차별로 모아 한 번에 채점
+        graded = []
+        unresolved = 0
+        tickets_by_round = {}
+        for t in pending:
+            rnd = t['round_number']
+            if rnd not in draws:
+                continue
+            parsed = scoring.parse_pension_ticket(t['numbers'])
+            if parsed is None:
+                # 번호를 읽지 못한 세트는 임의로 당첨/낙첨을 매기지 않고 '추첨 전'으로 남겨 다음 갱신 때 다시 시도
+                unresolved += 1
+                continue
+            ids, rows = tickets_by_round.setdefault(rnd, ([], []))
+            ids.append(t['id'])
+            rows.append(parsed)
+
+        for rnd, (ids, rows) in tickets_by_round.items():
+            draw = draws[rnd]
+            groups, numbers = zip(*rows)
+            ranks, bonus, amounts = scoring.grade_pension(
+                groups, numbers, draw['win_group'], int(draw['win_number']), int(draw['bonus_number']),
+            )
+            graded.extend(
+                (purchase_id, scoring.pension_rank_name(rank, hit), amount)
+                for purchase_id, rank, hit, amount in zip(ids, ranks.tolist(), bonus.tolist(), amounts.tolist())
+            )
+
+        update_ticket_results(graded, notify=_win_alert(scraper.account_id, "연금복권720+", graded))
+        msg = f"연금복권 채점 완료: 총 {len(graded)}건의 티켓 결과를 반영했습니다."
+        if unresolved:
+            msg += f" (번호를 찾지 못한 '확인필요' 연금복권 티켓 {unresolved}건은 다음 갱신 때 다시 채점)"
+        return msg
+
+    def job(scraper, account):
+        lotto = grade_lotto(scraper)
+        pension_msg = grade_pension(scraper)
+        if lotto is None:
+            # 로또 내역이 비어 있는 것은 채점할 게임이 없을 뿐이므로, 연금복권을 채점했으면 성공
+            if pension_msg is None:
+                return False, "최근 당첨 내역(로또6/45)이 없거나 스크래핑에 실패했습니다."
+            return True, pension_msg
+        ok, msg = lotto
+        if pension_msg is None:
+            return ok, msg
+        # 로또 채점이 실패했으면 연금복권 채점이 성공해도 실패로 보고 두 결과를 모두 남김
+        return ok, f"{msg} / {pension_msg}"
+
+    _run_for_selected_accounts(job, "당첨 결과 갱신", "로그인에 실패하여 당첨 결과를 갱신할 수 없습니다.", notify=False)
+
+    # 새로 저장된 회차만 번호 통계(analyze)에 누적 (계정별 작업이 끝난 뒤 한 번만)
+    from src import analytics
+    _, added = analytics.refresh()
+    if added:
+        click.echo(f"번호 통계에 새 회차 {added}개를 반영했습니다.")
 
 if __name__ == '__main__':
     cli()
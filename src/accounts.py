@@ -0,0 +1,62 @@
+import os
+import json
+
+from src.config import DHLOTTERY_ID, DHLOTTERY_PW, CHARGE_PIN, ACCOUNTS_FILE
+
+DEFAULT_ACCOUNT = "default"
+
+def load_accounts(path: str = ACCOUNTS_FILE) -> list[dict]:
+    """
+    계정 레지스트리를 불러옵니다.
+    - .env 의 DHLOTTERY_ID/PW 는 'default' 계정으로 등록됩니다.
+    - accounts.json 이 있으면 그 안의 계정들을 추가로 등록합니다.
+      형식: [{"name": "mom", "id": "...", "pw": "...", "charge_pin": "123456"}, ...]
+    반환: [{"account_id", "user_id", "user_pw", "charge_pin"}, ...]
+    """
+    accounts = []
+    if DHLOTTERY_ID and DHLOTTERY_PW:
+        accounts.append({
+            "account_id": DEFAULT_ACCOUNT,
+            "user_id": DHLOTTERY_ID,
+            "user_pw": DHLOTTERY_PW,
+            "charge_pin": CHARGE_PIN,
+        })
+
+    if path and os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+        for entry in entries:
+            if not entry.get("name") or not entry.get("id") or not entry.get("pw"):
+                raise ValueError(f"{path}: 각 계정에는 name, id, pw 항목이 필요합니다.")
+            accounts.append({
+                "account_id": entry["name"],
+                "user_id": entry["id"],
+                "user_pw": entry["pw"],
+                "charge_pin": entry.get("charge_pin"),
+            })
+
+    names = [a["account_id"] for a in accounts]
+    duplicates = sorted(set(n for n in names if names.count(n) > 1))
+    if duplicates:
+        raise ValueError(f"중복된 계정 이름이 있습니다: {', '.join(duplicates)}")
+    return accounts
+
+def select_accounts(accounts: list[dict], names: tuple[str, ...] = (), all_accounts: bool = False) -> list[dict]:
+    """
+    CLI 옵션에 따라 실행할 계정을 고릅니다.
+    아무것도 지정하지 않으면 기본 계정(없으면 첫 번째 계정) 하나만 사용합니다.
+    """
+    if not accounts:
+        raise ValueError(".env 파일에 DHLOTTERY_ID와 DHLOTTERY_PW를 설정하거나 accounts.json 에 계정을 등록해주세요.")
+    if all_accounts:
+        return accounts
+    if names:
+        by_name = {a["account_id"]: a for a in accounts}
+        unknown = [n for n in names if n not in by_name]
+        if unknown:
+            raise ValueError(f"등록되지 않은 계정입니다: {', '.join(unknown)}")
+        return [by_name[n] for n in names]
+    for a in accounts:
+        if a["account_id"] == DEFAULT_ACCOUNT:
+            return [a]
+    return accounts[:1]
@@ -0,0 +1,100 @@
+import numpy as np
+
+from src import combo, db
+
+# 번호 n 은 인덱스 n-1 (0~44)
+#   freq       (45,)     1등 번호(6개)로 나온 횟수
+#   bonus_freq (45,)     보너스 번호로 나온 횟수
+#   last_seen  (45,)     마지막으로 1등 번호에 나온 회차 (없으면 0)
+#   pairs      (45, 45)  두 번호가 같은 회차 1등 번호에 함께 나온 횟수 (대칭, 대각선은 freq)
+#   triples    (14190,)  세 번호 묶음의 colex 순위(src.combo.rank_subsets) 별 동시 출현 횟수
+# C(45, 3) = 14,190 이라 순위로 바로 찾는 조밀 배열이 (번호 3개, 횟수) 희소 테이블보다 작고 빠릅니다.
+TRIPLES = combo.subset_count(3)
+ARRAYS = {
+    "freq": (np.int32, (45,)),
+    "bonus_freq": (np.int32, (45,)),
+    "last_seen": (np.int32, (45,)),
+    "pairs": (np.int32, (45, 45)),
+    "triples": (np.int32, (TRIPLES,)),
+    "meta": (np.int32, (2,)),  # [반영한 회차 수, 가장 최근 회차]
+}
+
+_PAIR_COLS = [(i, j) for i in range(6) for j in range(i + 1, 6)]
+_TRIPLE_COLS = np.array([(i, j, k) for i in range(6) for j in range(i + 1, 6) for k in range(j + 1, 6)])
+
+def empty_state() -> dict[str, np.ndarray]:
+    return {name: np.zeros(shape, dtype=dtype) for name, (dtype, shape) in ARRAYS.items()}
+
+def fold(state: dict[str, np.ndarray], rounds: list[dict]) -> dict[str, np.ndarray]:
+    """새 회차들의 당첨 번호를 통계 배열에 더합니다. (회차 순서와 무관하게 누적 가능)"""
+    if not rounds:
+        return state
+    nums = np.asarray([r['winning_numbers'] for r in rounds], dtype=np.int64).reshape(-1, 6) - 1
+    round_numbers = np.asarray([r['round_number'] for r in rounds], dtype=np.int32)
+    bonus = np.asarray([r['bonus_number'] for r in rounds], dtype=np.int64) - 1
+
+    state["freq"] += np.bincount(nums.ravel(), minlength=45).astype(np.int32)
+    state["bonus_freq"] += np.bincount(bonus, minlength=45).astype(np.int32)
+    np.maximum.at(state["last_seen"], nums.ravel(), np.repeat(round_numbers, 6))
+
+    a = nums[:, [i for i, _ in _PAIR_COLS]].ravel()
+    b = nums[:, [j for _, j in _PAIR_COLS]].ravel()
+    pair_counts = np.bincount(a * 45 + b, minlength=45 * 45).reshape(45, 45)
+    state["pairs"] += (pair_counts + pair_counts.T).astype(np.int32)
+    state["pairs"][np.arange(45), np.arange(45)] = state["freq"]
+
+    triples = combo.rank_subsets(nums[:, _TRIPLE_COLS].reshape(-1, 3) + 1, 3)
+    state["triples"] += np.bincount(triples, minlength=TRIPLES).astype(np.int32)
+
+    state["meta"][0] += len(rounds)
+    state["meta"][1] = max(int(state["meta"][1]), int(round_numbers.max()))
+    return state
+
+def load() -> dict[str, np.ndarray]:
+    """DB 에 저장된 통계 배열을 읽습니다. (없으면 빈 통계)"""
+    state = empty_state()
+    for name, (dtype, shape, data) in db.load_analytics().items():
+        if name in state:
+            state[name] = np.frombuffer(data, dtype=dtype).reshape(
+                tuple(int(n) for n in shape.split(",") if n)
+            ).copy()
+    return state
+
+def refresh() -> tuple[dict[str, np.ndarray], int]:
+    """
+    아직 반영하지 않은 추첨 회차만 통계에 더해 저장합니다. (전체 재계산 없음)
+    반환: (통계 배열, 새로 반영한 회차 수)
+    """
+    state = load()
+    rounds = db.get_unanalyzed_rounds()
+    if rounds:
+        fold(state, rounds)
+        db.save_analytics(
+            {name: (arr.dtype.str, ",".join(map(str, arr.shape)), arr.tobytes()) for name, arr in state.items()},
+            [r['round_number'] for r in rounds],
+        )
+    return state, len(rounds)
+
+def gaps(state: dict[str, np.ndarray]) -> np.ndarray:
+    """번호별 마지막 출현 이후 지난 회차 수 (45,). 한 번도 안 나온 번호는 반영한 전체 회차 수"""
+    latest = int(state["meta"][1])
+    return np.where(state["last_seen"] > 0, latest - state["last_seen"], int(state["meta"][0]))
+
+def top_pairs(state: dict[str, np.ndarray], top: int = 10) -> list[tuple[tuple[int, int], int]]:
+    """가장 자주 함께 나온 번호 쌍 [((a, b), 횟수), ...]"""
+    i, j = np.triu_indices(45, k=1)
+    counts = state["pairs"][i, j]
+    order = np.argsort(-counts, kind="stable")[:top]
+    return [((int(i[o]) + 1, int(j[o]) + 1), int(counts[o])) for o in order]
+
+def top_triples(state: dict[str, np.ndarray], top: int = 10) -> list[tuple[tuple[int, int, int], int]]:
+    """가장 자주 함께 나온 번호 세 개 묶음 [((a, b, c), 횟수), ...]"""
+    order = np.argsort(-state["triples"], kind="stable")[:top]
+    return [(tuple(int(n) for n in t), int(state["triples"][o])) for o, t in zip(order, combo.unrank_subsets(order, 3))]
+
+def partners(state: dict[str, np.ndarray], number: int, top: int = 10) -> list[tuple[int, int]]:
+    """번호 하나와 가장 자주 함께 나온 번호 [(번호, 횟수), ...]"""
+    row = state["pairs"][number - 1].copy()
+    row[number - 1] = -1
+    order = np.argsort(-row, kind="stable")[:top]
+    return [(int(o) + 1, int(row[o])) for o in order]
@@ -0,0 +1,148 @@
+import io
+import os
+import uuid
+from datetime import datetime
+
+from src.config import (
+    SCREENSHOT_DIR, SCREENSHOT_DIR_MAX_MB, SCREENSHOT_MAX_FILES,
+    ATTACHMENT_FORMAT, ATTACHMENT_QUALITY, ATTACHMENT_MAX_WIDTH, ATTACHMENT_MAX_HEIGHT,
+)
+
+# 채널별 첨부 파일 최대 크기 (디스코드 웹훅 8MB, 텔레그램 sendPhoto 10MB)
+MAX_UPLOAD_BYTES = {"discord": 8 * 1024 * 1024, "telegram": 10 * 1024 * 1024}
+# 변환 결과가 상한을 넘으면 품질을 이만큼씩 낮추고, 최저 품질에서도 넘으면 크기를 줄여 다시 시도
+QUALITY_STEP = 15
+MIN_QUALITY = 35
+SHRINK_RATIO = 0.7
+
+FORMATS = {"jpeg": ("JPEG", ".jpg", "image/jpeg"), "webp": ("WEBP", ".webp", "image/webp")}
+MIME_TYPES = {".png": "image/png", ".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".webp": "image/webp", ".gif": "image/gif"}
+
+def rotate(directory: str = None, max_bytes: int = None, max_files: int = None, keep: int = 0):
+    """
+    디렉터리의 파일이 max_files 개, 합계 max_bytes 를 넘지 않도록 오래된 파일부터 지웁니다.
+    keep 은 곧 새로 쓸 파일 수로, 그만큼 자리를 비워 둡니다.
+    """
+    directory = directory or SCREENSHOT_DIR
+    max_bytes = int(SCREENSHOT_DIR_MAX_MB * 1024 * 1024) if max_bytes is None else max_bytes
+    max_files = SCREENSHOT_MAX_FILES if max_files is None else max_files
+    try:
+        entries = [e for e in os.scandir(directory) if e.is_file()]
+    except FileNotFoundError:
+        return
+    entries.sort(key=lambda e: e.stat().st_mtime)
+    total = sum(e.stat().st_size for e in entries)
+    while entries and (len(entries) + keep > max_files or total > max_bytes):
+        oldest = entries.pop(0)
+        total -= oldest.stat().st_size
+        try:
+            os.remove(oldest.path)
+        except FileNotFoundError:
+            pass
+
+def screenshot_path(name: str, directory: str = None) -> str:
+    """
+    실패 화면 스크린샷을 저장할 새 경로 (예: db/screenshots/20240101-120000_charge_failed.png).
+    상한을 넘지 않도록 오래된 스크린샷을 먼저 정리합니다.
+    """
+    directory = directory or SCREENSHOT_DIR
+    os.makedirs(directory, exist_ok=True)
+    rotate(directory, keep=1)
+    return os.path.join(directory, f"{datetime.now():%Y%m%d-%H%M%S}_{name}.png")
+
+def latest_screenshot(name: str, since: float = 0.0, directory: str = None) -> str | None:
+    """screenshot_path(name) 로 since(epoch 초) 이후 저장된 가장 최근 스크린샷 경로 (없으면 None)"""
+    directory = directory or SCREENSHOT_DIR
+    try:
+        found = [e for e in os.scandir(directory) if e.name.endswith(f"_{name}.png") and e.stat().st_mtime >= since]
+    except FileNotFoundError:
+        return None
+    return max(found, key=lambda e: e.stat().st_mtime).path if found else None
+
+def prepare(image_path: str, max_bytes: int, directory: str = None) -> str | None:
+    """
+    첨부할 이미지를 max_bytes 이하로 줄인 파일 경로를 반환합니다. (Pillow 로 축소 후 JPEG/WebP 변환)
+    변환 결과는 스크린샷 디렉터리에 저장해 재시도 때 다시 변환하지 않습니다.
+    Pillow 가 없으면 원본이 상한 이하일 때만 원본을 쓰고, 줄일 수 없으면 None (이미지 없이 전송)
+    """
+    if not image_path or not os.path.exists(image_path):
+        return None
+    try:
+        from PIL import Image
+    except ImportError:
+        return image_path if os.path.getsize(image_path) <= max_bytes else None
+
+    pil_format, suffix, _ = FORMATS.get(ATTACHMENT_FORMAT, FORMATS["jpeg"])
+    directory = directory or SCREENSHOT_DIR
+    stem = os.path.splitext(os.path.basename(image_path))[0]
+    target = os.path.join(directory, f"{stem}.{max_bytes}{suffix}")
+    if os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(image_path):
+        return target
+
+    with Image.open(image_path) as image:
+        image.draft("RGB", (ATTACHMENT_MAX_WIDTH, ATTACHMENT_MAX_HEIGHT))
+        scale = min(1.0, ATTACHMENT_MAX_WIDTH / image.width, ATTACHMENT_MAX_HEIGHT / image.height)
+        image = image.convert("RGB")
+        while True:
+            size = (max(1, int(image.width * scale)), max(1, int(image.height * scale)))
+            resized = image.resize(size, Image.LANCZOS) if size != image.size else image
+            for quality in range(ATTACHMENT_QUALITY, MIN_QUALITY - 1, -QUALITY_STEP):
+                buffer = io.BytesIO()
+                resized.save(buffer, pil_format, quality=quality, optimize=True)
+                if buffer.tell() <= max_bytes:
+                    os.makedirs(directory, exist_ok=True)
+                    tmp = f"{target}.{uuid.uuid4().hex}.tmp"
+                    with open(tmp, "wb") as f:
+                        f.write(buffer.getbuffer())
+                    os.replace(tmp, target)
+                    return target
+            if min(size) <= 1:
+                return None
+            scale *= SHRINK_RATIO
+
+class MultipartFile(io.RawIOBase):
+    """
+    multipart/form-data 본문을 파일에서 조금씩 읽어 보내는 읽기 전용 스트림.
+    길이를 알려 주므로 requests 가 Content-Length 를 붙이고 본문 전체를 메모리에 올리지 않고 전송합니다.
+    """
+
+    def __init__(self, fields: dict[str, str], file_field: str, path: str, mime_type: str = None):
+        self.boundary = uuid.uuid4().hex
+        head = b"".join(
+            f'--{self.boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+            for name, value in fields.items()
+        )
+        mime_type = mime_type or MIME_TYPES.get(os.path.splitext(path)[1].lower(), "application/octet-stream")
+        head += (f'--{self.boundary}\r\nContent-Disposition: form-data; name="{file_field}"; '
+                 f'filename="{os.path.basename(path)}"\r\nContent-Type: {mime_type}\r\n\r\n').encode()
+        self._parts = [io.BytesIO(head), open(path, "rb"), io.BytesIO(f"\r\n--{self.boundary}--\r\n".encode())]
+        self._length = len(head) + os.path.getsize(path) + len(self._parts[2].getvalue())
+        self._position = 0
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self) -> int:
+        return self._length
+
+    def readable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def readinto(self, buffer) -> int:
+        while self._parts:
+            n = self._parts[0].readinto(buffer)
+            if n:
+                self._position += n
+                return n
+            self._parts.pop(0).close()
+        return 0
+
+    def close(self):
+        for part in self._parts:
+            part.close()
+        self._parts = []
+        super().close()
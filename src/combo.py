@@ -0,0 +1,69 @@
+import numpy as np
+
+from src import scoring
+
+# 로또6/45 한 게임 = 45개 중 6개 조합 (8,145,060가지)
+# 정렬된 번호 n1 < ... < n6 를 colex 순위 sum(C(n_i - 1, i)) 로 0 ~ TOTAL-1 정수 하나에 대응시킵니다.
+TOTAL = 8145060
+
+# _BINOM[n, k] = C(n, k)  (0 <= n <= 45, 0 <= k <= 6)
+_BINOM = np.zeros((46, 7), dtype=np.int64)
+_BINOM[:, 0] = 1
+for _n in range(1, 46):
+    _BINOM[_n, 1:] = _BINOM[_n - 1, 1:] + _BINOM[_n - 1, :-1]
+
+# 내보내기 파일 형식: 게임당 little-endian int32 4바이트
+EXPORT_DTYPE = np.dtype("<i4")
+
+def encode(numbers) -> int:
+    """번호 6개를 조합 번호(0 ~ 8,145,059)로 바꿉니다. 순서는 상관없습니다."""
+    return int(sum(_BINOM[n - 1, i] for i, n in enumerate(sorted(numbers), 1)))
+
+def decode(idx: int) -> list[int]:
+    """조합 번호를 오름차순 번호 6개로 되돌립니다."""
+    return decode_array(np.asarray([idx]))[0].tolist()
+
+def encode_array(tickets) -> np.ndarray:
+    """(N, 6) 번호 배열을 조합 번호 int32 배열 (N,) 로 한 번에 바꿉니다."""
+    return rank_subsets(tickets, 6)
+
+def rank_subsets(subsets, k: int) -> np.ndarray:
+    """1~45 중 k 개 번호 묶음 (N, k) 의 colex 순위 (0 ~ C(45, k)-1) 를 int32 배열로 반환합니다."""
+    subsets = np.sort(np.asarray(subsets, dtype=np.int64).reshape(-1, k), axis=1)
+    return _BINOM[subsets - 1, np.arange(1, k + 1)].sum(axis=1).astype(np.int32)
+
+def unrank_subsets(idx, k: int) -> np.ndarray:
+    """rank_subsets 의 역변환: 순위 배열 (N,) 을 오름차순 (N, k) uint8 번호 배열로 되돌립니다."""
+    rest = np.asarray(idx, dtype=np.int64).reshape(-1).copy()
+    if len(rest) and (rest.min() < 0 or rest.max() >= _BINOM[45, k]):
+        raise ValueError(f"순위는 0 ~ {_BINOM[45, k] - 1} 사이여야 합니다.")
+    out = np.empty((len(rest), k), dtype=np.uint8)
+    # 큰 자리부터: C(a, j) <= rest 인 가장 큰 a 가 j 번째 번호 - 1
+    for j in range(k, 0, -1):
+        a = np.searchsorted(_BINOM[:, j], rest, side="right") - 1
+        out[:, j - 1] = a + 1
+        rest -= _BINOM[a, j]
+    return out
+
+def subset_count(k: int) -> int:
+    """C(45, k)"""
+    return int(_BINOM[45, k])
+
+def decode_array(idx) -> np.ndarray:
+    """조합 번호 배열 (N,) 을 오름차순 (N, 6) uint8 번호 배열로 되돌립니다."""
+    return unrank_subsets(idx, 6)
+
+def from_text(numbers: str) -> int | None:
+    """DB 에 저장된 "1,2,3,4,5,6" 형식의 번호를 조합 번호로 바꿉니다. 번호가 없거나 형식이 다르면 None"""
+    nums = scoring.parse_numbers(numbers)
+    return encode(nums) if nums is not None else None
+
+def write_export(f, idx) -> int:
+    """조합 번호들을 게임당 4바이트로 바이너리 파일 객체에 씁니다. 반환: 쓴 게임 수"""
+    data = np.asarray(idx, dtype=EXPORT_DTYPE)
+    f.write(data.tobytes())
+    return len(data)
+
+def read_export(f) -> np.ndarray:
+    """write_export 로 쓴 파일을 조합 번호 배열로 읽습니다."""
+    return np.frombuffer(f.read(), dtype=EXPORT_DTYPE).astype(np.int32)
@@ -7,10 +7,51 @@ DHLOTTERY_ID = os.getenv("DHLOTTERY_ID")
 DHLOTTERY_PW = os.getenv("DHLOTTERY_PW")
 CHARGE_PIN = os.getenv("CHARGE_PIN")  # 간편충전용 6자리 간편결제 비밀번호
 
+# 마지막 세션 검증 후 이 시간(초) 동안은 로그인 확인 페이지 이동을 생략 (0이면 매번 확인)
+SESSION_TTL = int(os.getenv("SESSION_TTL", "1800"))
+
+# 로컬 DB 파일 경로 (미지정 시 <프로젝트>/db/lottery.db, ":memory:" 는 인메모리 DB)
+DB_PATH = os.getenv("LOTTERY_DB_PATH")
+
+# 번호 생성기(generate)용 전체 조합 특징 테이블 디렉터리 (미지정 시 <프로젝트>/db/combo_features, 약 140MB)
+COMBO_FEATURES_DIR = os.getenv("COMBO_FEATURES_DIR", os.path.join(os.path.dirname(os.path.dirname(__file__)), "db", "combo_features"))
+
+# 다중 계정 레지스트리 (JSON 파일, 미존재 시 위 단일 계정만 사용)
+ACCOUNTS_FILE = os.getenv("ACCOUNTS_FILE", os.path.join(os.path.dirname(os.path.dirname(__file__)), "accounts.json"))
+# 여러 계정을 동시에 실행할 때의 최대 병렬 수
+MAX_PARALLEL_ACCOUNTS = int(os.getenv("MAX_PARALLEL_ACCOUNTS", "3"))
+
+# update 시 여러 회차 당첨 번호를 가져올 때의 동시 요청 수 / 요청 간 최소 간격(초)
+ROUND_FETCH_CONCURRENCY = int(os.getenv("ROUND_FETCH_CONCURRENCY", "4"))
+ROUND_FETCH_INTERVAL = float(os.getenv("ROUND_FETCH_INTERVAL", "0.2"))
+
+# 동행복권 사이트 주소를 대체할 서버 (예: 오프라인 테스트용 가짜 서버 http://127.0.0.1:8765)
+DHLOTTERY_BASE_URL = os.getenv("DHLOTTERY_BASE_URL")
+
 # 알림용 옵셔널 변수
 DISCORD_WEBHOOK_URL = os.getenv("DISCORD_WEBHOOK_URL")
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
+# 알림 요청의 연결/응답 대기 시간(초), 종료 직전 남은 알림을 기다릴 최대 시간(초)
+NOTIFY_CONNECT_TIMEOUT = float(os.getenv("NOTIFY_CONNECT_TIMEOUT", "3"))
+NOTIFY_READ_TIMEOUT = float(os.getenv("NOTIFY_READ_TIMEOUT", "10"))
+NOTIFY_FLUSH_TIMEOUT = float(os.getenv("NOTIFY_FLUSH_TIMEOUT", "15"))
+# 보내지 못한 알림의 재시도: 첫 대기 시간(초, 실패할 때마다 2배), 최대 대기 시간(초), 최대 시도 횟수
+NOTIFY_RETRY_BASE = float(os.getenv("NOTIFY_RETRY_BASE", "5"))
+NOTIFY_RETRY_MAX = float(os.getenv("NOTIFY_RETRY_MAX", "3600"))
+NOTIFY_MAX_ATTEMPTS = int(os.getenv("NOTIFY_MAX_ATTEMPTS", "10"))
+# 채널마다 전송 사이의 최소 간격(초). 그동안 쌓인 알림은 한 메시지로 묶어 보냅니다.
+NOTIFY_MIN_INTERVAL = float(os.getenv("NOTIFY_MIN_INTERVAL", "1"))
+
+# 실패 화면 스크린샷 저장 디렉터리와 용량/개수 상한 (넘으면 오래된 파일부터 삭제)
+SCREENSHOT_DIR = os.getenv("SCREENSHOT_DIR", os.path.join(os.path.dirname(os.path.dirname(__file__)), "db", "screenshots"))
+SCREENSHOT_DIR_MAX_MB = float(os.getenv("SCREENSHOT_DIR_MAX_MB", "50"))
+SCREENSHOT_MAX_FILES = int(os.getenv("SCREENSHOT_MAX_FILES", "30"))
+# 알림 첨부 이미지 변환: 형식(jpeg/webp), 품질, 최대 가로/세로 픽셀 (Pillow 가 있을 때만)
+ATTACHMENT_FORMAT = os.getenv("ATTACHMENT_FORMAT", "jpeg").lower()
+ATTACHMENT_QUALITY = int(os.getenv("ATTACHMENT_QUALITY", "80"))
+ATTACHMENT_MAX_WIDTH = int(os.getenv("ATTACHMENT_MAX_WIDTH", "1280"))
+ATTACHMENT_MAX_HEIGHT = int(os.getenv("ATTACHMENT_MAX_HEIGHT", "8000"))
 
 def validate_config():
     if not DHLOTTERY_ID or not DHLOTTERY_PW:
@@ -1,15 +1,48 @@
 import sqlite3
 import os
+import uuid
 from datetime import datetime
 
+from src.config import DB_PATH
+from src import combo
+
 DB_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'db')
-DB_FILE = os.path.join(DB_DIR, 'lottery.db')
+DEFAULT_DB_FILE = os.path.join(DB_DIR, 'lottery.db')
+DB_FILE = DB_PATH or DEFAULT_DB_FILE
+
+# DB_FILE 이 ":memory:" 이면 디스크 대신 프로세스 내 공유 인메모리 DB 를 사용합니다.
+MEMORY_DB = ":memory:"
+_memory_uri = None
+# 인메모리 DB 는 마지막 연결이 닫히면 사라지므로 연결 하나를 계속 열어 둡니다.
+_memory_anchor = None
+
+def set_db_path(path: str | None):
+    """
+    사용할 DB 경로를 바꿉니다. (None 이면 기본 경로 db/lottery.db)
+    ":memory:" 를 지정할 때마다 이전과 분리된 새 인메모리 DB 가 만들어집니다.
+    """
+    global DB_FILE, _memory_uri, _memory_anchor
+    if _memory_anchor is not None:
+        _memory_anchor.close()
+        _memory_uri, _memory_anchor = None, None
+    DB_FILE = path or DEFAULT_DB_FILE
+    if DB_FILE == MEMORY_DB:
+        _memory_uri = f"file:lottery-{uuid.uuid4().hex}?mode=memory&cache=shared"
+        _memory_anchor = sqlite3.connect(_memory_uri, uri=True, check_same_thread=False)
+
+def connect() -> sqlite3.Connection:
+    """현재 DB_FILE 에 대한 새 연결을 엽니다. (인메모리 DB 는 모든 연결이 같은 DB 를 공유)"""
+    if DB_FILE == MEMORY_DB:
+        if _memory_anchor is None:
+            set_db_path(MEMORY_DB)
+        return sqlite3.connect(_memory_uri, uri=True)
+    return sqlite3.connect(DB_FILE)
 
 def init_db():
-    if not os.path.exists(DB_DIR):
-        os.makedirs(DB_DIR)
+    if DB_FILE != MEMORY_DB:
+        os.makedirs(os.path.dirname(os.path.abspath(DB_FILE)), exist_ok=True)
 
-    conn = sqlite3.connect(DB_FILE)
+    conn = connect()
     cursor = conn.cursor()
 
     # Create rounds table
@@ -23,6 +56,55 @@ def init_db():
     )
     ''')
 
+    # 회차/등수별 1게임당 실제 당첨금 (로또6/45)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS prizes (
+        round_number INTEGER,
+        rank TEXT,
+        amount INTEGER,
+        winners INTEGER,
+        PRIMARY KEY (round_number, rank)
+    )
+    ''')
+
+    # 연금복권720+ 회차별 추첨 결과 (로또 rounds 와 회차 번호 체계가 다름)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS pension_rounds (
+        round_number INTEGER PRIMARY KEY,
+        draw_date DATE,
+        win_group INTEGER,
+        win_number TEXT,
+        bonus_number TEXT
+    )
+    ''')
+
+    # 당첨 번호 통계 (src.analytics): 배열별 BLOB 과, 이미 통계에 반영한 회차 목록
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS analytics (
+        name TEXT PRIMARY KEY,
+        dtype TEXT,
+        shape TEXT,
+        data BLOB
+    )
+    ''')
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS analytics_rounds (
+        round_number INTEGER PRIMARY KEY
+    )
+    ''')
+
+    # 휠(커버링) 설계 캐시 (src.wheel): 기본 번호 0 ~ base_size-1 기준 게임 비트마스크를 쉼표로 연결
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS wheel_designs (
+        base_size INTEGER,
+        drawn INTEGER,
+        match INTEGER,
+        size INTEGER,
+        tickets TEXT,
+        PRIMARY KEY (base_size, drawn, match)
+    )
+    ''')
+
     # Create purchases table
     cursor.execute('''
     CREATE TABLE IF NOT EXISTS purchases (
@@ -34,7 +116,8 @@ def init_db():
         cost INTEGER,
         win_amount INTEGER DEFAULT 0,
         win_rank TEXT DEFAULT '추첨 전',
-        is_user_checked BOOLEAN DEFAULT 0
+        is_user_checked BOOLEAN DEFAULT 0,
+        account_id TEXT DEFAULT 'default'
     )
     ''')
     
@@ -43,45 +126,760 @@ def init_db():
     columns = [col[1] for col in cursor.fetchall()]
     if 'is_user_checked' not in columns:
         cursor.execute("ALTER TABLE purchases ADD COLUMN is_user_checked BOOLEAN DEFAULT 0")
+    # 다중 계정 지원 이전의 내역은 모두 기본 계정 소유로 간주
+    if 'account_id' not in columns:
+        cursor.execute("ALTER TABLE purchases ADD COLUMN account_id TEXT DEFAULT 'default'")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_purchases_account_round ON purchases (account_id, round_number)")
+
+    # 로또 번호 조합을 정수 하나로 저장 (src.combo 참고). 번호가 없거나 연금복권이면 NULL
+    if 'combo_idx' not in columns:
+        cursor.execute("ALTER TABLE purchases ADD COLUMN combo_idx INTEGER")
+    cursor.execute("PRAGMA table_info(rounds)")
+    if 'combo_idx' not in [col[1] for col in cursor.fetchall()]:
+        cursor.execute("ALTER TABLE rounds ADD COLUMN combo_idx INTEGER")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_purchases_round_combo ON purchases (round_number, combo_idx)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_rounds_combo ON rounds (combo_idx)")
+    _backfill_combo_idx(cursor)
+    _create_rollups(cursor)
+    _create_ticket_numbers(cursor)
+
+    # 알림 보낼 편지함 (채널별 한 행, 보낼 때까지 남아 재시도)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS outbox (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        channel TEXT,
+        message TEXT,
+        image_path TEXT,
+        created_at DATETIME,
+        attempts INTEGER DEFAULT 0,
+        next_attempt_at REAL DEFAULT 0,
+        sent_at DATETIME,
+        last_error TEXT
+    )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (channel, next_attempt_at) WHERE sent_at IS NULL")
 
     conn.commit()
     conn.close()
 
-def insert_purchase(round_number: int, purchase_date: datetime, mode: str, numbers: str, cost: int = 1000):
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-    
+def _backfill_combo_idx(cursor):
+    """combo_idx 가 비어 있는 기존 로또 티켓/회차의 조합 번호를 채웁니다."""
+    for table, column, where in (
+        ("purchases", "numbers", "mode NOT LIKE '연금%' AND numbers != '확인필요'"),
+        ("rounds", "winning_numbers", "winning_numbers IS NOT NULL"),
+    ):
+        rows = cursor.execute(f"SELECT rowid, {column} FROM {table} WHERE combo_idx IS NULL AND {where}").fetchall()
+        updates = [(idx, rowid) for rowid, idx in ((r, combo.from_text(n)) for r, n in rows) if idx is not None]
+        cursor.executemany(f"UPDATE {table} SET combo_idx = ? WHERE rowid = ?", updates)
+
+# 기간별 집계 (report): 구매 일시 기준 주(월요일 날짜) / 월 / 연도
+ROLLUP_PERIODS = {
+    "week": "date({d}, 'weekday 0', '-6 days')",
+    "month": "strftime('%Y-%m', {d})",
+    "year": "strftime('%Y', {d})",
+}
+
+def _rollup_values(row: str) -> dict[str, str]:
+    """트리거에서 NEW/OLD 행을 집계 키와 값으로 바꾸는 SQL 식"""
+    return {
+        "account_id": f"COALESCE({row}.account_id, 'default')",
+        "mode": f"COALESCE({row}.mode, '')",
+        "cost": f"COALESCE({row}.cost, 0)",
+        "win_amount": f"COALESCE({row}.win_amount, 0)",
+        "graded": f"(COALESCE({row}.win_rank, '추첨 전') != '추첨 전')",
+        "wins": f"(COALESCE({row}.win_amount, 0) > 0)",
+        "rank": f"COALESCE({row}.win_rank, '추첨 전')",
+    }
+
+def _rollup_statements(row: str, sign: str) -> str:
+    """purchases 한 행(NEW 또는 OLD)을 모든 기간 집계에 sign(+/-) 방향으로 반영하는 트리거 본문"""
+    v = _rollup_values(row)
+    statements = []
+    for period_type, expr in ROLLUP_PERIODS.items():
+        period = f"COALESCE({expr.format(d=f'{row}.purchase_date')}, '-')"
+        statements.append(f'''
+        INSERT INTO rollups (period_type, period, account_id, mode, games, cost, win_amount, graded, wins)
+        VALUES ('{period_type}', {period}, {v['account_id']}, {v['mode']}, {sign}1, {sign}{v['cost']}, {sign}{v['win_amount']}, {sign}{v['graded']}, {sign}{v['wins']})
+        ON CONFLICT (period_type, period, account_id, mode) DO UPDATE SET
+            games = games + excluded.games, cost = cost + excluded.cost, win_amount = win_amount + excluded.win_amount,
+            graded = graded + excluded.graded, wins = wins + excluded.wins;
+        INSERT INTO rollup_ranks (period_type, period, account_id, mode, rank, count)
+        VALUES ('{period_type}', {period}, {v['account_id']}, {v['mode']}, {v['rank']}, {sign}1)
+        ON CONFLICT (period_type, period, account_id, mode, rank) DO UPDATE SET count = count + excluded.count;''')
+    return "".join(statements)
+
+def _create_rollups(cursor):
+    """
+    기간 x 계정 x 모드별 지출/당첨금/채점 수/당첨 수와 등수별 개수를 담는 집계 테이블을 만들고,
+    purchases 가 추가/수정/삭제될 때마다 트리거로 해당 행만 증감합니다. (처음 만들 때는 기존 내역으로 채움)
+    """
+    exists = cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'rollups'").fetchone()
     cursor.execute('''
-    INSERT INTO purchases (round_number, purchase_date, mode, numbers, cost, is_user_checked)
-    VALUES (?, ?, ?, ?, ?, 0)
-    ''', (round_number, purchase_date.strftime("%Y-%m-%d %H:%M:%S"), mode, numbers, cost))
-    
-    conn.commit()
+    CREATE TABLE IF NOT EXISTS rollups (
+        period_type TEXT,
+        period TEXT,
+        account_id TEXT,
+        mode TEXT,
+        games INTEGER DEFAULT 0,
+        cost INTEGER DEFAULT 0,
+        win_amount INTEGER DEFAULT 0,
+        graded INTEGER DEFAULT 0,
+        wins INTEGER DEFAULT 0,
+        PRIMARY KEY (period_type, period, account_id, mode)
+    )
+    ''')
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS rollup_ranks (
+        period_type TEXT,
+        period TEXT,
+        account_id TEXT,
+        mode TEXT,
+        rank TEXT,
+        count INTEGER DEFAULT 0,
+        PRIMARY KEY (period_type, period, account_id, mode, rank)
+    )
+    ''')
+    cursor.executescript(f'''
+    CREATE TRIGGER IF NOT EXISTS trg_rollups_insert AFTER INSERT ON purchases BEGIN {_rollup_statements("NEW", "+")}
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_rollups_delete AFTER DELETE ON purchases BEGIN {_rollup_statements("OLD", "-")}
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_rollups_update
+    AFTER UPDATE OF purchase_date, mode, account_id, cost, win_amount, win_rank ON purchases BEGIN
+    {_rollup_statements("OLD", "-")}{_rollup_statements("NEW", "+")}
+    END;
+    ''')
+    if not exists:
+        _fill_rollups(cursor)
+
+def _fill_rollups(cursor):
+    v = _rollup_values("p")
+    for period_type, expr in ROLLUP_PERIODS.items():
+        period = f"COALESCE({expr.format(d='p.purchase_date')}, '-')"
+        cursor.execute(f'''
+        INSERT INTO rollups (period_type, period, account_id, mode, games, cost, win_amount, graded, wins)
+        SELECT '{period_type}', {period} AS period, {v['account_id']} AS account_id, {v['mode']} AS mode,
+               COUNT(*), SUM({v['cost']}), SUM({v['win_amount']}), SUM({v['graded']}), SUM({v['wins']})
+        FROM purchases p
+        GROUP BY 2, 3, 4
+        ''')
+        cursor.execute(f'''
+        INSERT INTO rollup_ranks (period_type, period, account_id, mode, rank, count)
+        SELECT '{period_type}', {period}, {v['account_id']}, {v['mode']}, {v['rank']}, COUNT(*)
+        FROM purchases p
+        GROUP BY 2, 3, 4, 5
+        ''')
+
+def rebuild_rollups():
+    """집계 테이블을 purchases 전체로 다시 계산합니다. (트리거 도입 전 내역 정리/검증용)"""
+    conn = connect()
+    with conn:
+        conn.execute("DELETE FROM rollups")
+        conn.execute("DELETE FROM rollup_ranks")
+        _fill_rollups(conn.cursor())
+    conn.close()
+
+def _rollup_filter(account_ids: list[str] = None, game: str = "all") -> tuple[str, list]:
+    where, params = "", []
+    if account_ids:
+        where += f" AND account_id IN ({','.join('?' for _ in account_ids)})"
+        params.extend(account_ids)
+    if game == "lotto":
+        where += " AND mode NOT LIKE '연금%'"
+    elif game == "pension":
+        where += " AND mode LIKE '연금%'"
+    return where, params
+
+ROLLUP_GROUPS = {"none": "'전체'", "mode": "mode", "account": "account_id"}
+
+def get_rollup_report(period_type: str = "month", group_by: str = "mode", account_ids: list[str] = None,
+                      game: str = "all", last: int = None, window: int = 3) -> list[dict]:
+    """
+    집계 테이블에서 기간별 지출/당첨금/수익률/적중률과, 구분(모드/계정)별 누적 손익과 최근 window 개 기간의
+    이동 수익률을 윈도 함수로 계산합니다. 누적값은 전체 기간 기준이며 last 를 주면 최근 last 개 기간만 반환합니다.
+    """
+    where, params = _rollup_filter(account_ids, game)
+    group = ROLLUP_GROUPS[group_by]
+    conn = connect()
+    conn.row_factory = sqlite3.Row
+    rows = conn.execute(f'''
+    WITH base AS (
+        SELECT period, {group} AS grp, SUM(games) AS games, SUM(cost) AS cost, SUM(win_amount) AS win_amount,
+               SUM(graded) AS graded, SUM(wins) AS wins
+        FROM rollups
+        WHERE period_type = ?{where}
+        GROUP BY period, grp
+        HAVING SUM(games) > 0
+    ),
+    windowed AS (
+        SELECT *,
+               SUM(cost) OVER running AS total_cost,
+               SUM(win_amount) OVER running AS total_win,
+               SUM(games) OVER running AS total_games,
+               SUM(cost) OVER moving AS moving_cost,
+               SUM(win_amount) OVER moving AS moving_win,
+               DENSE_RANK() OVER (ORDER BY period DESC) AS recency
+        FROM base
+        WINDOW running AS (PARTITION BY grp ORDER BY period ROWS UNBOUNDED PRECEDING),
+               moving AS (PARTITION BY grp ORDER BY period ROWS BETWEEN ? PRECEDING AND CURRENT ROW)
+    )
+    SELECT period, grp, games, cost, win_amount, graded, wins, total_games, total_cost, total_win, moving_cost, moving_win
+    FROM windowed
+    WHERE recency <= ?
+    ORDER BY period, grp
+    ''', [period_type, *params, max(window, 1) - 1, last or 2 ** 62]).fetchall()
+    conn.close()
+
+    def roi(win, cost):
+        return win / cost - 1 if cost else None
+
+    return [
+        {
+            "period": r['period'],
+            "group": r['grp'],
+            "games": r['games'],
+            "cost": r['cost'],
+            "win_amount": r['win_amount'],
+            "roi": roi(r['win_amount'], r['cost']),
+            "hit_rate": r['wins'] / r['graded'] if r['graded'] else None,
+            "moving_roi": roi(r['moving_win'], r['moving_cost']),
+            "total_games": r['total_games'],
+            "total_cost": r['total_cost'],
+            "total_win": r['total_win'],
+            "cumulative_roi": roi(r['total_win'], r['total_cost']),
+        }
+        for r in rows
+    ]
+
+def get_rollup_rank_counts(period_type: str = "month", group_by: str = "mode", account_ids: list[str] = None,
+                           game: str = "all", periods: list[str] = None) -> dict[tuple[str, str], dict[str, int]]:
+    """집계 테이블의 (기간, 구분) 별 등수 개수. 반환: {(기간, 구분): {"5등": 3, "낙첨": 10, ...}}"""
+    where, params = _rollup_filter(account_ids, game)
+    if periods:
+        where += f" AND period IN ({','.join('?' for _ in periods)})"
+        params.extend(periods)
+    conn = connect()
+    rows = conn.execute(f'''
+    SELECT period, {ROLLUP_GROUPS[group_by]} AS grp, rank, SUM(count)
+    FROM rollup_ranks
+    WHERE period_type = ?{where}
+    GROUP BY period, grp, rank
+    HAVING SUM(count) > 0
+    ''', [period_type, *params]).fetchall()
+    conn.close()
+    counts = {}
+    for period, grp, rank, count in rows:
+        counts.setdefault((period, grp), {})[rank] = count
+    return counts
+
+# 1~45 를 행으로 펼치는 상수 (트리거 안에서는 WITH 를 쓸 수 없어 json_each 로 펼침)
+_ALL_NUMBERS = "json_each('[" + ",".join(str(n) for n in range(1, 46)) + "]')"
+
+def _ticket_numbers_select(row: str, source: str = "") -> str:
+    """
+    로또 티켓 한 행의 번호 6개를 (번호, 회차, 티켓 id) 행으로 펼치는 SELECT. (source 를 주면 그 테이블 전체)
+    combo_idx 가 있는(번호 6개가 올바른) 티켓만 대상이며, "1, 2" / "01,02" 형식도 받습니다.
+    """
+    padded = f"(',' || replace({row}.numbers, ' ', '') || ',')"
+    return f'''
+        SELECT n.value, {row}.round_number, {row}.id FROM {_ALL_NUMBERS} AS n{source}
+        WHERE {row}.combo_idx IS NOT NULL
+          AND (instr({padded}, ',' || n.value || ',') OR instr({padded}, ',' || printf('%02d', n.value) || ','))'''
+
+def _create_ticket_numbers(cursor):
+    """
+    "이 번호들이 들어간 내 티켓" 검색용 역색인 (번호, 회차, 티켓 id).
+    purchases 가 추가/수정/삭제될 때 트리거로 해당 티켓의 행만 갱신합니다. (처음 만들 때는 기존 티켓으로 채움)
+    """
+    exists = cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'ticket_numbers'").fetchone()
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS ticket_numbers (
+        number INTEGER,
+        round_number INTEGER,
+        purchase_id INTEGER,
+        PRIMARY KEY (number, round_number, purchase_id)
+    ) WITHOUT ROWID
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_ticket_numbers_purchase ON ticket_numbers (purchase_id)")
+    cursor.executescript(f'''
+    CREATE TRIGGER IF NOT EXISTS trg_ticket_numbers_insert AFTER INSERT ON purchases BEGIN
+        INSERT OR IGNORE INTO ticket_numbers (number, round_number, purchase_id) {_ticket_numbers_select("NEW")};
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_ticket_numbers_delete AFTER DELETE ON purchases BEGIN
+        DELETE FROM ticket_numbers WHERE purchase_id = OLD.id;
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_ticket_numbers_update AFTER UPDATE OF numbers, combo_idx, round_number ON purchases BEGIN
+        DELETE FROM ticket_numbers WHERE purchase_id = OLD.id;
+        INSERT OR IGNORE INTO ticket_numbers (number, round_number, purchase_id) {_ticket_numbers_select("NEW")};
+    END;
+    ''')
+    if not exists:
+        cursor.execute(f"INSERT OR IGNORE INTO ticket_numbers (number, round_number, purchase_id) {_ticket_numbers_select('p', ', purchases AS p')}")
+
+def search_tickets(numbers: list[int], min_match: int = None, from_round: int = None, to_round: int = None,
+                   account_ids: list[str] = None, limit: int = None) -> list[dict]:
+    """
+    numbers 중 min_match 개 이상(기본: 전부)을 포함한 로또 티켓을 ticket_numbers 역색인으로 찾습니다.
+    번호마다 (번호, 회차) 범위만 읽어 티켓 id 별로 세므로 purchases 전체를 훑지 않습니다.
+    반환: 일치 개수가 많은 순, 같으면 최근 회차 순 [{"id", "round_number", "purchase_date", "mode", "numbers",
+          "account_id", "win_rank", "win_amount", "matched"}, ...]
+    """
+    numbers = sorted(set(numbers))
+    min_match = len(numbers) if min_match is None else min_match
+    params = list(numbers)
+    where = ""
+    if from_round is not None:
+        where += " AND round_number >= ?"
+        params.append(from_round)
+    if to_round is not None:
+        where += " AND round_number <= ?"
+        params.append(to_round)
+    account_filter = ""
+    if account_ids:
+        account_filter = f" WHERE p.account_id IN ({','.join('?' for _ in account_ids)})"
+    conn = connect()
+    conn.row_factory = sqlite3.Row
+    rows = conn.execute(f'''
+    WITH hits AS (
+        SELECT purchase_id, COUNT(*) AS matched
+        FROM ticket_numbers
+        WHERE number IN ({','.join('?' for _ in numbers)}){where}
+        GROUP BY purchase_id
+        HAVING COUNT(*) >= ?
+    )
+    SELECT p.id, p.round_number, p.purchase_date, p.mode, p.numbers, p.account_id, p.win_rank, p.win_amount, h.matched
+    FROM hits AS h JOIN purchases AS p ON p.id = h.purchase_id{account_filter}
+    ORDER BY h.matched DESC, p.round_number DESC, p.id DESC
+    LIMIT ?
+    ''', [*params, min_match, *(account_ids or []), limit or -1]).fetchall()
+    conn.close()
+    return [dict(r) for r in rows]
+
+def ticket_combo_idx(mode: str, numbers: str) -> int | None:
+    """저장할 티켓의 조합 번호 (연금복권이거나 번호가 없으면 None)"""
+    return None if mode.startswith("연금") else combo.from_text(numbers)
+
+def insert_purchase(round_number: int, purchase_date: datetime, mode: str, numbers: str, cost: int = 1000, account_id: str = "default", notify: str = None):
+    """
+    구매한 티켓 1장을 저장합니다.
+    notify: 알림 메시지를 주면 같은 트랜잭션에서 편지함에 넣습니다. (구매가 저장되면 알림도 반드시 남음)
+    """
+    insert_purchases([(round_number, purchase_date, mode, numbers, cost)], account_id=account_id, notify=notify)
+
+def insert_purchases(tickets: list[tuple[int, datetime, str, str, int]], account_id: str = "default", notify: str = None):
+    """
+    한 번에 구매한 티켓들을 하나의 트랜잭션으로 저장합니다.
+    tickets: [(round_number, purchase_date, mode, numbers, cost), ...]
+    notify: 알림 메시지를 주면 같은 트랜잭션에서 편지함에 넣습니다.
+    """
+    if not tickets:
+        return
+    conn = connect()
+    with conn:
+        conn.executemany('''
+        INSERT INTO purchases (round_number, purchase_date, mode, numbers, cost, is_user_checked, account_id, combo_idx)
+        VALUES (?, ?, ?, ?, ?, 0, ?, ?)
+        ''', [
+            (round_number, purchase_date.strftime("%Y-%m-%d %H:%M:%S"), mode, numbers, cost, account_id,
+             ticket_combo_idx(mode, numbers))
+            for round_number, purchase_date, mode, numbers, cost in tickets
+        ])
+        if notify:
+            _enqueue_notification(conn, notify)
     conn.close()
 
 def add_or_update_round(round_number: int, draw_date: str, winning_numbers: str, bonus_number: int, is_drawn: bool = True):
-    conn = sqlite3.connect(DB_FILE)
+    conn = connect()
     cursor = conn.cursor()
     
     # Upsert logic
     cursor.execute('''
-    INSERT OR REPLACE INTO rounds (round_number, draw_date, winning_numbers, bonus_number, is_drawn)
-    VALUES (?, ?, ?, ?, ?)
-    ''', (round_number, draw_date, winning_numbers, bonus_number, is_drawn))
+    INSERT OR REPLACE INTO rounds (round_number, draw_date, winning_numbers, bonus_number, is_drawn, combo_idx)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ''', (round_number, draw_date, winning_numbers, bonus_number, is_drawn, combo.from_text(winning_numbers)))
     
     conn.commit()
     conn.close()
 
+def add_or_update_rounds(rounds: list[dict]):
+    """
+    여러 회차의 공식 당첨 정보를 하나의 트랜잭션으로 저장합니다.
+    rounds: [{"round_number", "draw_date", "winning_numbers": [..], "bonus_number"}, ...]
+    """
+    conn = connect()
+    with conn:
+        conn.executemany('''
+        INSERT OR REPLACE INTO rounds (round_number, draw_date, winning_numbers, bonus_number, is_drawn, combo_idx)
+        VALUES (?, ?, ?, ?, 1, ?)
+        ''', [
+            (r['round_number'], r['draw_date'], ",".join(map(str, r['winning_numbers'])), r['bonus_number'],
+             combo.encode(r['winning_numbers']))
+            for r in rounds
+        ])
+    conn.close()
+
+def get_drawn_rounds(round_numbers: list[int]) -> dict[int, dict]:
+    """
+    이미 저장된(추첨 완료) 회차 정보를 반환합니다. 캐시된 회차는 다시 스크래핑하지 않기 위함입니다.
+    반환: {회차: {"round_number", "draw_date", "winning_numbers": [..], "bonus_number"}}
+    """
+    if not round_numbers:
+        return {}
+    conn = connect()
+    conn.row_factory = sqlite3.Row
+    placeholders = ",".join("?" for _ in round_numbers)
+    rows = conn.execute(f'''
+    SELECT round_number, draw_date, winning_numbers, bonus_number
+    FROM rounds
+    WHERE is_drawn = 1 AND round_number IN ({placeholders})
+    ''', list(round_numbers)).fetchall()
+    conn.close()
+
+    return {
+        r['round_number']: {
+            "round_number": r['round_number'],
+            "draw_date": r['draw_date'],
+            "winning_numbers": [int(n) for n in str(r['winning_numbers']).split(',')],
+            "bonus_number": r['bonus_number'],
+        }
+        for r in rows
+    }
+
+def assign_unmapped_round(round_number: int, account_id: str = "default", pension: bool = False):
+    """회차를 알 수 없어 0으로 저장된 구매건에 회차를 부여합니다. (pension 이면 연금복권 구매건만, 아니면 로또만)"""
+    conn = connect()
+    with conn:
+        conn.execute(
+            f"UPDATE purchases SET round_number = ? WHERE round_number = 0 AND account_id = ? "
+            f"AND mode {'' if pension else 'NOT '}LIKE '연금%'",
+            (round_number, account_id),
+        )
+    conn.close()
+
+def add_or_update_pension_rounds(rounds: list[dict]):
+    """
+    연금복권720+ 회차별 추첨 결과를 하나의 트랜잭션으로 저장합니다.
+    rounds: [{"round_number", "draw_date", "win_group", "win_number", "bonus_number"}, ...]
+    """
+    if not rounds:
+        return
+    conn = connect()
+    with conn:
+        conn.executemany('''
+        INSERT OR REPLACE INTO pension_rounds (round_number, draw_date, win_group, win_number, bonus_number)
+        VALUES (?, ?, ?, ?, ?)
+        ''', [
+            (r['round_number'], r.get('draw_date'), r['win_group'], r['win_number'], r['bonus_number'])
+            for r in rounds
+        ])
+    conn.close()
+
+def get_pension_draws(round_numbers: list[int]) -> dict[int, dict]:
+    """저장된 연금복권720+ 추첨 결과를 반환합니다. {회차: {"win_group", "win_number", "bonus_number", ...}}"""
+    if not round_numbers:
+        return {}
+    conn = connect()
+    conn.row_factory = sqlite3.Row
+    placeholders = ",".join("?" for _ in round_numbers)
+    rows = conn.execute(
+        f"SELECT * FROM pension_rounds WHERE round_number IN ({placeholders})", list(round_numbers)
+    ).fetchall()
+    conn.close()
+    return {r['round_number']: dict(r) for r in rows}
+
+def get_pending_pension_tickets(account_id: str = None) -> list[dict]:
+    """'추첨 전' 연금복권 티켓을 반환합니다. (회차를 모르는 0회차 포함)"""
+    conn = connect()
+    conn.row_factory = sqlite3.Row
+    query = '''
+    SELECT id, round_number, numbers, cost, mode
+    FROM purchases
+    WHERE win_rank = '추첨 전' AND mode LIKE '연금%'
+    '''
+    params = []
+    if account_id is not None:
+        query += " AND account_id = ?"
+        params.append(account_id)
+    rows = conn.execute(query + " ORDER BY id", params).fetchall()
+    conn.close()
+    return [dict(r) for r in rows]
+
+def add_or_update_prizes(rounds: list[dict]):
+    """
+    회차별 등수 당첨금을 하나의 트랜잭션으로 저장합니다.
+    rounds: [{"round_number", "prizes": {"1등": {"amount", "winners"}, ...}}, ...]
+    """
+    rows = [
+        (r['round_number'], rank, p['amount'], p.get('winners'))
+        for r in rounds
+        for rank, p in (r.get('prizes') or {}).items()
+    ]
+    if not rows:
+        return
+    conn = connect()
+    with conn:
+        conn.executemany('''
+        INSERT OR REPLACE INTO prizes (round_number, rank, amount, winners)
+        VALUES (?, ?, ?, ?)
+        ''', rows)
+    conn.close()
+
+def get_prize_table(round_numbers: list[int]) -> dict[int, dict[str, int]]:
+    """
+    저장된 회차별 등수 당첨금을 반환합니다. 1~5등이 모두 저장된 회차만 포함합니다.
+    반환: {회차: {"1등": 금액, ..., "5등": 금액}}
+    """
+    if not round_numbers:
+        return {}
+    conn = connect()
+    placeholders = ",".join("?" for _ in round_numbers)
+    rows = conn.execute(f'''
+    SELECT round_number, rank, amount
+    FROM prizes
+    WHERE round_number IN ({placeholders})
+    ''', list(round_numbers)).fetchall()
+    conn.close()
+
+    table = {}
+    for rnd, rank, amount in rows:
+        table.setdefault(rnd, {})[rank] = amount
+    return {rnd: ranks for rnd, ranks in table.items() if len(ranks) >= 5}
+
+def get_graded_rounds_without_prizes() -> list[int]:
+    """채점이 끝난 로또 티켓이 있지만 실제 당첨금이 저장되지 않은 회차 목록"""
+    conn = connect()
+    rows = conn.execute('''
+    SELECT DISTINCT p.round_number
+    FROM purchases p
+    WHERE p.win_rank IN ('1등', '2등', '3등', '4등', '5등') AND p.mode NOT LIKE '연금%'
+      AND (SELECT COUNT(*) FROM prizes z WHERE z.round_number = p.round_number) < 5
+    ORDER BY p.round_number
+    ''').fetchall()
+    conn.close()
+    return [r[0] for r in rows]
+
+def regrade_prizes(round_numbers: list[int] = None) -> int:
+    """
+    이미 채점된 로또 당첨 티켓의 당첨금을 prizes 테이블의 실제 금액으로 한 번의 UPDATE 로 맞춥니다.
+    round_numbers 를 주면 해당 회차만 대상으로 합니다.
+    반환: 금액이 바뀐 티켓 수
+    """
+    query = '''
+    UPDATE purchases
+    SET win_amount = (
+        SELECT z.amount FROM prizes z
+        WHERE z.round_number = purchases.round_number AND z.rank = purchases.win_rank
+    )
+    WHERE win_rank IN ('1등', '2등', '3등', '4등', '5등') AND mode NOT LIKE '연금%'
+      AND EXISTS (
+        SELECT 1 FROM prizes z
+        WHERE z.round_number = purchases.round_number AND z.rank = purchases.win_rank
+          AND z.amount != purchases.win_amount
+    )
+    '''
+    params = []
+    if round_numbers is not None:
+        if not round_numbers:
+            return 0
+        query += f" AND round_number IN ({','.join('?' for _ in round_numbers)})"
+        params = list(round_numbers)
+    conn = connect()
+    with conn:
+        changed = conn.execute(query, params).rowcount
+    conn.close()
+    return changed
+
+def get_drawn_round_list(last: int = None) -> list[dict]:
+    """
+    저장된 추첨 완료 회차 전체(또는 최근 last 개)를 회차 오름차순으로 반환합니다.
+    반환: [{"round_number", "draw_date", "winning_numbers": [..], "bonus_number"}, ...]
+    """
+    conn = connect()
+    conn.row_factory = sqlite3.Row
+    query = '''
+    SELECT round_number, draw_date, winning_numbers, bonus_number
+    FROM rounds
+    WHERE is_drawn = 1
+    ORDER BY round_number DESC
+    '''
+    params = []
+    if last:
+        query += " LIMIT ?"
+        params.append(last)
+    rows = conn.execute(query, params).fetchall()
+    conn.close()
+
+    return [
+        {
+            "round_number": r['round_number'],
+            "draw_date": r['draw_date'],
+            "winning_numbers": [int(n) for n in str(r['winning_numbers']).split(',')],
+            "bonus_number": r['bonus_number'],
+        }
+        for r in reversed(rows)
+    ]
+
+def get_unanalyzed_rounds() -> list[dict]:
+    """추첨은 끝났지만 아직 번호 통계에 반영하지 않은 회차를 회차 오름차순으로 반환합니다."""
+    conn = connect()
+    conn.row_factory = sqlite3.Row
+    rows = conn.execute('''
+    SELECT r.round_number, r.winning_numbers, r.bonus_number
+    FROM rounds r
+    LEFT JOIN analytics_rounds a ON a.round_number = r.round_number
+    WHERE r.is_drawn = 1 AND a.round_number IS NULL
+    ORDER BY r.round_number
+    ''').fetchall()
+    conn.close()
+    return [
+        {
+            "round_number": r['round_number'],
+            "winning_numbers": [int(n) for n in str(r['winning_numbers']).split(',')],
+            "bonus_number": r['bonus_number'],
+        }
+        for r in rows
+    ]
+
+def load_analytics() -> dict[str, tuple[str, str, bytes]]:
+    """저장된 통계 배열을 {이름: (dtype, shape, 바이트)} 로 반환합니다."""
+    conn = connect()
+    rows = conn.execute("SELECT name, dtype, shape, data FROM analytics").fetchall()
+    conn.close()
+    return {name: (dtype, shape, data) for name, dtype, shape, data in rows}
+
+def save_analytics(arrays: dict[str, tuple[str, str, bytes]], round_numbers: list[int]):
+    """갱신한 통계 배열과 새로 반영한 회차를 하나의 트랜잭션으로 저장합니다."""
+    conn = connect()
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO analytics (name, dtype, shape, data) VALUES (?, ?, ?, ?)",
+            [(name, dtype, shape, data) for name, (dtype, shape, data) in arrays.items()],
+        )
+        conn.executemany("INSERT OR IGNORE INTO analytics_rounds (round_number) VALUES (?)", [(r,) for r in round_numbers])
+    conn.close()
+
+def get_wheel_design(base_size: int, drawn: int, match: int) -> list[int] | None:
+    """저장된 휠 설계의 게임 비트마스크 목록 (없으면 None)"""
+    conn = connect()
+    row = conn.execute(
+        "SELECT tickets FROM wheel_designs WHERE base_size = ? AND drawn = ? AND match = ?", (base_size, drawn, match)
+    ).fetchone()
+    conn.close()
+    return [int(t) for t in row[0].split(",")] if row else None
+
+def save_wheel_design(base_size: int, drawn: int, match: int, tickets: list[int]):
+    conn = connect()
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO wheel_designs (base_size, drawn, match, size, tickets) VALUES (?, ?, ?, ?, ?)",
+            (base_size, drawn, match, len(tickets), ",".join(map(str, tickets))),
+        )
+    conn.close()
+
+def get_purchased_combos(account_ids: list[str] = None) -> list[int]:
+    """
+    지금까지 구매한 로또 티켓의 조합 번호를 중복 없이 반환합니다. (번호가 저장되지 않은 '확인필요' 제외)
+    """
+    conn = connect()
+    query = "SELECT DISTINCT combo_idx FROM purchases WHERE combo_idx IS NOT NULL"
+    params = []
+    if account_ids:
+        query += f" AND account_id IN ({','.join('?' for _ in account_ids)})"
+        params.extend(account_ids)
+    rows = conn.execute(query + " ORDER BY combo_idx", params).fetchall()
+    conn.close()
+    return [r[0] for r in rows]
+
+def get_winning_combos() -> list[int]:
+    """지금까지 추첨된 회차의 1등 번호 조합 번호를 반환합니다."""
+    conn = connect()
+    rows = conn.execute("SELECT DISTINCT combo_idx FROM rounds WHERE is_drawn = 1 AND combo_idx IS NOT NULL ORDER BY combo_idx").fetchall()
+    conn.close()
+    return [r[0] for r in rows]
+
+def get_ticket_combos(account_ids: list[str] = None, round_numbers: list[int] = None) -> list[int]:
+    """구매 순서대로 로또 티켓의 조합 번호를 반환합니다. (내보내기용, 중복 포함)"""
+    conn = connect()
+    query = "SELECT combo_idx FROM purchases WHERE combo_idx IS NOT NULL"
+    params = []
+    if account_ids:
+        query += f" AND account_id IN ({','.join('?' for _ in account_ids)})"
+        params.extend(account_ids)
+    if round_numbers:
+        query += f" AND round_number IN ({','.join('?' for _ in round_numbers)})"
+        params.extend(round_numbers)
+    rows = conn.execute(query + " ORDER BY id", params).fetchall()
+    conn.close()
+    return [r[0] for r in rows]
+
+def get_duplicate_tickets(account_ids: list[str] = None) -> list[dict]:
+    """
+    같은 회차에 같은 번호 조합을 두 번 이상 구매한 경우를 (회차, 조합 번호) 인덱스로 찾습니다.
+    반환: [{"round_number", "combo_idx", "count", "accounts": "계정1,계정2"}, ...]
+    """
+    conn = connect()
+    conn.row_factory = sqlite3.Row
+    query = '''
+    SELECT round_number, combo_idx, COUNT(*) AS count, GROUP_CONCAT(DISTINCT account_id) AS accounts
+    FROM purchases
+    WHERE combo_idx IS NOT NULL AND round_number > 0
+    '''
+    params = []
+    if account_ids:
+        query += f" AND account_id IN ({','.join('?' for _ in account_ids)})"
+        params.extend(account_ids)
+    query += " GROUP BY round_number, combo_idx HAVING COUNT(*) > 1 ORDER BY round_number DESC, combo_idx"
+    rows = conn.execute(query, params).fetchall()
+    conn.close()
+    return [dict(r) for r in rows]
+
+def find_held_combos(round_number: int, combo_ids: list[int], unmapped_since: datetime = None) -> dict[int, list[str]]:
+    """
+    해당 회차에 이미 구매한 조합을 (회차, 조합 번호) 인덱스로 찾습니다. 등록된 모든 계정이 대상입니다.
+    unmapped_since 를 주면 그 이후 구매했지만 회차가 아직 0 으로 남은 티켓도 같은 회차로 간주합니다.
+    반환: {조합 번호: [보유 계정, ...]}
+    """
+    if not combo_ids:
+        return {}
+    conn = connect()
+    placeholders = ",".join("?" for _ in combo_ids)
+    query = f"SELECT combo_idx, account_id FROM purchases WHERE round_number = ? AND combo_idx IN ({placeholders})"
+    params = [round_number, *combo_ids]
+    if unmapped_since is not None:
+        query += f" UNION ALL SELECT combo_idx, account_id FROM purchases WHERE round_number = 0 AND combo_idx IN ({placeholders}) AND purchase_date >= ?"
+        params += [*combo_ids, unmapped_since.strftime("%Y-%m-%d %H:%M:%S")]
+    rows = conn.execute(query, params).fetchall()
+    conn.close()
+
+    held = {}
+    for combo_idx, account_id in rows:
+        held.setdefault(combo_idx, [])
+        if account_id not in held[combo_idx]:
+            held[combo_idx].append(account_id)
+    return held
+
+def count_tickets_matching_drawn() -> int:
+    """과거 어느 회차든 1등 당첨 번호와 같은 조합으로 구매한 로또 티켓 수 (조합 번호 인덱스 조인)"""
+    conn = connect()
+    count = conn.execute('''
+    SELECT COUNT(*)
+    FROM purchases p
+    WHERE p.combo_idx IS NOT NULL
+      AND EXISTS (SELECT 1 FROM rounds r WHERE r.combo_idx = p.combo_idx AND r.is_drawn = 1)
+    ''').fetchone()[0]
+    conn.close()
+    return count
+
 def update_winning_result(round_number: int, numbers: str, win_amount: int, win_rank: str):
-    conn = sqlite3.connect(DB_FILE)
+    conn = connect()
     cursor = conn.cursor()
     
     # Update the winning result based on round number and the specific numbers selected
     cursor.execute('''
     UPDATE purchases
     SET win_amount = ?, win_rank = ?
-    WHERE round_number = ? AND numbers = ? AND win_rank = '추첨 전'
-    ''', (win_amount, win_rank, round_number, numbers))
+    WHERE round_number = ? AND combo_idx = ? AND win_rank = '추첨 전'
+    ''', (win_amount, win_rank, round_number, combo.from_text(numbers)))
     
     conn.commit()
     conn.close()
@@ -90,7 +888,7 @@ def update_ticket_result(purchase_id: int, win_rank: str, win_amount: int):
     """
     고유한 티켓 ID를 기반으로 당첨 결과 및 등수를 정밀하게 업데이트합니다.
     """
-    conn = sqlite3.connect(DB_FILE)
+    conn = connect()
     cursor = conn.cursor()
     
     cursor.execute('''
@@ -102,19 +900,25 @@ def update_ticket_result(purchase_id: int, win_rank: str, win_amount: int):
     conn.commit()
     conn.close()
 
-def get_pending_purchases(round_number: int):
+def get_pending_purchases(round_number: int, account_id: str = None):
     """
     특정 회차 중 아직 채점되지 않은('추첨 전') 티켓 목록을 반환합니다.
+    account_id 를 지정하면 해당 계정의 티켓만 반환합니다.
     """
-    conn = sqlite3.connect(DB_FILE)
+    conn = connect()
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
-    cursor.execute('''
+    query = '''
     SELECT id, numbers, cost, mode
     FROM purchases
     WHERE round_number = ? AND win_rank = '추첨 전'
-    ''', (round_number,))
+    '''
+    params = [round_number]
+    if account_id is not None:
+        query += " AND account_id = ?"
+        params.append(account_id)
+    cursor.execute(query, params)
     
     rows = cursor.fetchall()
     conn.close()
@@ -122,16 +926,115 @@ def get_pending_purchases(round_number: int):
     return [dict(r) for r in rows]
 
 
+def get_pending_purchases_for_rounds(round_numbers: list[int], account_id: str = None):
+    """
+    여러 회차의 '추첨 전' 로또 티켓을 한 번의 쿼리로 반환합니다. (각 행에 round_number 포함, 연금복권 제외)
+    """
+    if not round_numbers:
+        return []
+    conn = connect()
+    conn.row_factory = sqlite3.Row
+
+    placeholders = ",".join("?" for _ in round_numbers)
+    query = f'''
+    SELECT id, round_number, numbers, cost, mode
+    FROM purchases
+    WHERE win_rank = '추첨 전' AND mode NOT LIKE '연금%' AND round_number IN ({placeholders})
+    '''
+    params = list(round_numbers)
+    if account_id is not None:
+        query += " AND account_id = ?"
+        params.append(account_id)
+    rows = conn.execute(query, params).fetchall()
+    conn.close()
+
+    return [dict(r) for r in rows]
+
+def get_unconfirmed_tickets(round_numbers: list[int], account_id: str = None) -> list[dict]:
+    """
+    번호를 확인하지 못해 "확인필요" 로 저장된 자동 티켓을 채점 여부와 관계없이 구매 순서대로 반환합니다.
+    """
+    if not round_numbers:
+        return []
+    conn = connect()
+    conn.row_factory = sqlite3.Row
+
+    placeholders = ",".join("?" for _ in round_numbers)
+    query = f'''
+    SELECT id, round_number, win_rank
+    FROM purchases
+    WHERE mode = '자동' AND numbers = '확인필요' AND round_number IN ({placeholders})
+    '''
+    params = list(round_numbers)
+    if account_id is not None:
+        query += " AND account_id = ?"
+        params.append(account_id)
+    rows = conn.execute(query + " ORDER BY id", params).fetchall()
+    conn.close()
+
+    return [dict(r) for r in rows]
+
+def get_confirmed_auto_numbers(round_numbers: list[int], account_id: str = None) -> dict[int, list[str]]:
+    """
+    회차별로 번호가 이미 기록된 자동 티켓의 번호 목록을 반환합니다. {회차: ["1,2,3,4,5,6", ...]}
+    """
+    if not round_numbers:
+        return {}
+    conn = connect()
+    placeholders = ",".join("?" for _ in round_numbers)
+    query = f'''
+    SELECT round_number, numbers
+    FROM purchases
+    WHERE mode = '자동' AND numbers != '확인필요' AND round_number IN ({placeholders})
+    '''
+    params = list(round_numbers)
+    if account_id is not None:
+        query += " AND account_id = ?"
+        params.append(account_id)
+    rows = conn.execute(query, params).fetchall()
+    conn.close()
+
+    numbers_by_round = {}
+    for round_number, numbers in rows:
+        numbers_by_round.setdefault(round_number, []).append(numbers)
+    return numbers_by_round
+
+def update_ticket_results(results: list[tuple[int, str, int]], numbers: dict[int, str] = None, notify: str = None):
+    """
+    여러 티켓의 채점 결과를 하나의 트랜잭션으로 반영합니다.
+    results: [(purchase_id, win_rank, win_amount), ...]
+    numbers: {purchase_id: "1,2,3,4,5,6"} 를 주면 같은 트랜잭션에서 티켓 번호도 바꿉니다. ("확인필요" 티켓 보정용)
+    notify: 알림 메시지를 주면 같은 트랜잭션에서 편지함에 넣습니다. (채점이 저장되면 알림도 반드시 남음)
+    """
+    if not results and not numbers:
+        return
+    conn = connect()
+    with conn:
+        if notify:
+            _enqueue_notification(conn, notify)
+        if numbers:
+            conn.executemany('''
+            UPDATE purchases
+            SET numbers = ?, combo_idx = ?
+            WHERE id = ?
+            ''', [(nums, combo.from_text(nums), purchase_id) for purchase_id, nums in numbers.items()])
+        conn.executemany('''
+        UPDATE purchases
+        SET win_rank = ?, win_amount = ?
+        WHERE id = ?
+        ''', [(rank, amount, purchase_id) for purchase_id, rank, amount in results])
+    conn.close()
+
 def get_pending_tickets():
     """
     추첨 전(미확인) 티켓 전체 목록을 반환합니다.
     """
-    conn = sqlite3.connect(DB_FILE)
+    conn = connect()
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
 
     cursor.execute('''
-    SELECT id, round_number, purchase_date, mode, numbers, cost
+    SELECT id, round_number, purchase_date, mode, numbers, cost, account_id
     FROM purchases
     WHERE win_rank = '추첨 전'
     ORDER BY purchase_date DESC, id DESC
@@ -147,7 +1050,7 @@ def get_unchecked_results():
     Returns results that have been drawn but not yet checked by the user.
     Once retrieved, they are immediately marked as checked.
     """
-    conn = sqlite3.connect(DB_FILE)
+    conn = connect()
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
@@ -157,15 +1060,26 @@ def get_unchecked_results():
            r.winning_numbers, r.bonus_number, r.draw_date
     FROM purchases p
     JOIN rounds r ON p.round_number = r.round_number
-    WHERE r.is_drawn = 1 AND p.is_user_checked = 0 AND p.win_rank != '추첨 전'
+    WHERE r.is_drawn = 1 AND p.is_user_checked = 0 AND p.win_rank != '추첨 전' AND p.mode NOT LIKE '연금%'
     ORDER BY p.round_number DESC, p.id ASC
     ''')
     
     rows = cursor.fetchall()
+
+    # 연금복권720+ 는 회차 번호 체계가 달라 pension_rounds 와 따로 조인
+    cursor.execute('''
+    SELECT p.id, p.win_rank, p.win_amount, p.cost, p.numbers, p.round_number,
+           r.win_group, r.win_number, r.bonus_number, r.draw_date
+    FROM purchases p
+    JOIN pension_rounds r ON p.round_number = r.round_number
+    WHERE p.is_user_checked = 0 AND p.win_rank != '추첨 전' AND p.mode LIKE '연금%'
+    ORDER BY p.round_number DESC, p.id ASC
+    ''')
+    pension_rows = cursor.fetchall()
     
-    total_games = len(rows)
-    total_cost = sum(r['cost'] for r in rows)
-    total_win = sum(r['win_amount'] for r in rows)
+    total_games = len(rows) + len(pension_rows)
+    total_cost = sum(r['cost'] for r in rows) + sum(r['cost'] for r in pension_rows)
+    total_win = sum(r['win_amount'] for r in rows) + sum(r['win_amount'] for r in pension_rows)
     
     rank_counts = {}
     ids_to_update = []
@@ -194,6 +1108,26 @@ def get_unchecked_results():
             "win_amount": row['win_amount'],
             "cost": row['cost']
         })
+
+    pension_rank_counts = {}
+    pension_rounds_data = {}
+    for row in pension_rows:
+        ids_to_update.append(row['id'])
+        pension_rank_counts[row['win_rank']] = pension_rank_counts.get(row['win_rank'], 0) + 1
+        data = pension_rounds_data.setdefault(row['round_number'], {
+            "draw_date": row['draw_date'],
+            "win_group": row['win_group'],
+            "win_number": row['win_number'],
+            "bonus_number": row['bonus_number'],
+            "tickets": [],
+        })
+        data["tickets"].append({
+            "id": row['id'],
+            "numbers": row['numbers'],
+            "win_rank": row['win_rank'],
+            "win_amount": row['win_amount'],
+            "cost": row['cost'],
+        })
         
     # Mark as checked
     if ids_to_update:
@@ -212,19 +1146,21 @@ def get_unchecked_results():
         "total_cost": total_cost,
         "total_win": total_win,
         "rank_counts": rank_counts,
-        "rounds_data": rounds_data
+        "rounds_data": rounds_data,
+        "pension_rank_counts": pension_rank_counts,
+        "pension_rounds_data": pension_rounds_data,
     }
 
 def get_all_checked_results():
     """
     Returns aggregated stats over all items the user HAS checked.
     """
-    conn = sqlite3.connect(DB_FILE)
+    conn = connect()
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
     cursor.execute('''
-    SELECT p.win_rank, p.win_amount, p.cost
+    SELECT p.win_rank, p.win_amount, p.cost, p.mode LIKE '연금%' AS is_pension
     FROM purchases p
     WHERE p.is_user_checked = 1 AND p.win_rank != '추첨 전'
     ''')
@@ -235,10 +1171,13 @@ def get_all_checked_results():
     total_cost = sum(r['cost'] for r in rows)
     total_win = sum(r['win_amount'] for r in rows)
     
+    # 로또와 연금복권은 등수 체계가 다르므로 따로 집계
     rank_counts = {}
+    pension_rank_counts = {}
     for row in rows:
         rank = row['win_rank']
-        rank_counts[rank] = rank_counts.get(rank, 0) + 1
+        counts = pension_rank_counts if row['is_pension'] else rank_counts
+        counts[rank] = counts.get(rank, 0) + 1
         
     conn.close()
     
@@ -247,14 +1186,15 @@ def get_all_checked_results():
         "total_cost": total_cost,
         "total_win": total_win,
         "net_profit": total_win - total_cost,
-        "rank_counts": rank_counts
+        "rank_counts": rank_counts,
+        "pension_rank_counts": pension_rank_counts,
     }
 
 def get_round_details(round_number: int):
     """
     Specific details for a given round, including official winning numbers and user's tickets.
     """
-    conn = sqlite3.connect(DB_FILE)
+    conn = connect()
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
@@ -264,7 +1204,7 @@ def get_round_details(round_number: int):
     cursor.execute('''
     SELECT numbers, cost, win_amount, win_rank
     FROM purchases
-    WHERE round_number = ?
+    WHERE round_number = ? AND mode NOT LIKE '연금%'
     ORDER BY win_amount DESC
     ''', (round_number,))
     tickets = cursor.fetchall()
@@ -277,7 +1217,7 @@ def get_round_details(round_number: int):
     }
 
 def get_stats():
-    conn = sqlite3.connect(DB_FILE)
+    conn = connect()
     cursor = conn.cursor()
     
     # 총 지출 금액
@@ -310,3 +1250,81 @@ def get_stats():
         "pending_games": pending_games,
         "recent_history": recent_history
     }
+
+def _enqueue_notification(conn: sqlite3.Connection, message: str, image_path: str = None, channels: list[str] = None):
+    """conn 의 진행 중인 트랜잭션 안에서 채널별로 알림을 편지함에 넣습니다. (channels 미지정 시 설정된 모든 채널)"""
+    if channels is None:
+        # circular 임포트 방지
+        from src.notifier import channel_names
+        channels = channel_names()
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    conn.executemany(
+        "INSERT INTO outbox (channel, message, image_path, created_at) VALUES (?, ?, ?, ?)",
+        [(channel, message, image_path, now) for channel in channels],
+    )
+
+def enqueue_notification(message: str, image_path: str = None, channels: list[str] = None):
+    conn = connect()
+    with conn:
+        _enqueue_notification(conn, message, image_path, channels)
+    conn.close()
+
+def get_due_notifications(channel: str, now: float, max_attempts: int, limit: int = 100) -> list[dict]:
+    """채널에서 보낼 차례가 된(재시도 대기 시간이 지난) 알림을 먼저 들어온 순서로 반환합니다."""
+    conn = connect()
+    conn.row_factory = sqlite3.Row
+    rows = conn.execute('''
+    SELECT id, message, image_path, attempts FROM outbox
+    WHERE channel = ? AND sent_at IS NULL AND next_attempt_at <= ? AND attempts < ?
+    ORDER BY id
+    LIMIT ?
+    ''', (channel, now, max_attempts, limit)).fetchall()
+    conn.close()
+    return [dict(r) for r in rows]
+
+def next_notification_time(channels: list[str], max_attempts: int) -> float | None:
+    """아직 보내지 못한 알림 중 가장 이른 재시도 시각 (없으면 None)"""
+    if not channels:
+        return None
+    conn = connect()
+    row = conn.execute(f'''
+    SELECT MIN(next_attempt_at) FROM outbox
+    WHERE channel IN ({','.join('?' for _ in channels)}) AND sent_at IS NULL AND attempts < ?
+    ''', (*channels, max_attempts)).fetchone()
+    conn.close()
+    return row[0]
+
+def mark_notifications_sent(ids: list[int]):
+    conn = connect()
+    with conn:
+        conn.executemany("UPDATE outbox SET sent_at = ?, last_error = NULL WHERE id = ?",
+                         [(datetime.now().strftime("%Y-%m-%d %H:%M:%S"), i) for i in ids])
+    conn.close()
+
+def mark_notifications_failed(ids: list[int], error: str, next_attempt_at: float):
+    """전송 실패: 시도 횟수를 늘리고 next_attempt_at 이후에 다시 보내도록 합니다."""
+    conn = connect()
+    with conn:
+        conn.executemany("UPDATE outbox SET attempts = attempts + 1, last_error = ?, next_attempt_at = ? WHERE id = ?",
+                         [(error, next_attempt_at, i) for i in ids])
+    conn.close()
+
+def get_pending_notifications() -> list[dict]:
+    """아직 보내지 못한 알림 전체 (포기한 알림 포함)"""
+    conn = connect()
+    conn.row_factory = sqlite3.Row
+    rows = conn.execute('''
+    SELECT id, channel, message, image_path, created_at, attempts, next_attempt_at, last_error
+    FROM outbox WHERE sent_at IS NULL ORDER BY id
+    ''').fetchall()
+    conn.close()
+    return [dict(r) for r in rows]
+
+def retry_notifications() -> int:
+    """보내지 못한 알림(포기한 알림 포함)을 지금 바로 다시 보내도록 초기화합니다. 반환: 알림 수"""
+    conn = connect()
+    with conn:
+        count = conn.execute("UPDATE outbox SET attempts = 0, next_attempt_at = 0 WHERE sent_at IS NULL").rowcount
+    conn.close()
+    return count
+
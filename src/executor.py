@@ -0,0 +1,61 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from src.scraper import LottoScraper, run_sync, launch_browser, close_browser
+
+# job(scraper, account) -> (성공 여부, 결과 메시지)
+AccountJob = Callable[[LottoScraper, dict], tuple[bool, str]]
+
+def _run_account(browser, account: dict, job: AccountJob, login_lazy: bool, login_failed_msg: str) -> dict:
+    started = time.perf_counter()
+    try:
+        with LottoScraper(
+            user_id=account["user_id"],
+            user_pw=account["user_pw"],
+            account_id=account["account_id"],
+            browser=browser,
+        ) as scraper:
+            if not scraper.login(lazy=login_lazy):
+                success, message = False, login_failed_msg
+            else:
+                success, message = job(scraper, account)
+    except Exception as e:
+        success, message = False, f"실행 중 오류: {e}"
+    return {
+        "account_id": account["account_id"],
+        "success": success,
+        "message": message,
+        "elapsed": time.perf_counter() - started,
+    }
+
+def run_for_accounts(
+    accounts: list[dict],
+    job: AccountJob,
+    max_parallel: int = 3,
+    headless: bool = True,
+    login_lazy: bool = True,
+    login_failed_msg: str = "로그인 실패",
+) -> list[dict]:
+    """
+    여러 계정에 대해 같은 작업을 최대 max_parallel 개씩 동시에 실행합니다.
+    Chromium 은 하나만 띄우고 계정마다 별도 BrowserContext 를 만듭니다.
+    (LottoScraper 의 모든 브라우저 작업은 공용 이벤트 루프에서 실행되므로 스레드 간 공유가 안전합니다)
+    반환: 계정 순서대로 [{"account_id", "success", "message", "elapsed"}, ...]
+    """
+    try:
+        playwright, browser = run_sync(launch_browser(headless))
+    except Exception as e:
+        return [
+            {"account_id": a["account_id"], "success": False, "message": f"브라우저를 실행하지 못했습니다: {e}", "elapsed": 0.0}
+            for a in accounts
+        ]
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_parallel, len(accounts)))) as pool:
+            return list(pool.map(
+                lambda account: _run_account(browser, account, job, login_lazy, login_failed_msg),
+                accounts,
+            ))
+    finally:
+        run_sync(close_browser(playwright, browser))
@@ -0,0 +1,143 @@
+import os
+import shutil
+
+import numpy as np
+
+from src import combo
+from src.config import COMBO_FEATURES_DIR
+
+# 8,145,060개 조합 전체의 특징 테이블. 조합 번호(src.combo colex 순위)가 곧 행 번호이며,
+# 특징마다 .npy 파일 하나로 저장해 필요한 열만 메모리 맵으로 읽습니다.
+#   mask    uint64   번호 n 이 있으면 (n-1) 번째 비트가 1 (포함/제외 번호 필터용)
+#   sum     uint8    번호 합 (21 ~ 255)
+#   odd     uint8    홀수 개수 (0 ~ 6)
+#   span    uint8    가장 큰 번호 - 가장 작은 번호
+#   run     uint8    가장 길게 이어지는 연속 번호 개수 (1 ~ 6)
+#   decades uint8x5  번호대(1~9, 10~19, 20~29, 30~39, 40~45)별 개수
+FEATURES_DIR = COMBO_FEATURES_DIR
+FEATURES = {
+    "mask": (np.uint64, ()),
+    "sum": (np.uint8, ()),
+    "odd": (np.uint8, ()),
+    "span": (np.uint8, ()),
+    "run": (np.uint8, ()),
+    "decades": (np.uint8, (5,)),
+}
+
+# 한 번에 처리할 조합 수 (특징 계산/필터링 시 임시 메모리 사용량 조절)
+CHUNK = 1 << 20
+
+def compute_features(nums: np.ndarray) -> dict[str, np.ndarray]:
+    """오름차순 (N, 6) 번호 배열의 특징들을 계산합니다."""
+    nums = np.asarray(nums, dtype=np.int64)
+    consecutive = np.diff(nums, axis=1) == 1
+    cur = np.zeros(len(nums), dtype=np.int64)
+    longest = np.zeros(len(nums), dtype=np.int64)
+    for j in range(consecutive.shape[1]):
+        cur = (cur + 1) * consecutive[:, j]
+        np.maximum(longest, cur, out=longest)
+    return {
+        "mask": np.bitwise_or.reduce(np.left_shift(np.uint64(1), (nums - 1).astype(np.uint64)), axis=1),
+        "sum": nums.sum(axis=1).astype(np.uint8),
+        "odd": (nums & 1).sum(axis=1).astype(np.uint8),
+        "span": (nums[:, -1] - nums[:, 0]).astype(np.uint8),
+        "run": (longest + 1).astype(np.uint8),
+        "decades": (nums[:, :, None] // 10 == np.arange(5)).sum(axis=1).astype(np.uint8),
+    }
+
+def build_features(path: str = None) -> str:
+    """특징 테이블을 path 디렉터리에 만듭니다. 다 만든 뒤에 자리를 바꾸므로 중간에 끊겨도 반쪽 테이블이 남지 않습니다."""
+    path = path or FEATURES_DIR
+    tmp = path + ".tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    columns = {
+        name: np.lib.format.open_memmap(os.path.join(tmp, f"{name}.npy"), mode="w+", dtype=dtype, shape=(combo.TOTAL, *shape))
+        for name, (dtype, shape) in FEATURES.items()
+    }
+    for start in range(0, combo.TOTAL, CHUNK):
+        stop = min(start + CHUNK, combo.TOTAL)
+        for name, values in compute_features(combo.unrank_subsets(np.arange(start, stop), 6)).items():
+            columns[name][start:stop] = values
+    for column in columns.values():
+        column.flush()
+    del columns
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp, path)
+    return path
+
+def features_ready(path: str = None) -> bool:
+    """특징 테이블이 모두 만들어져 있는지 확인합니다."""
+    path = path or FEATURES_DIR
+    for name, (dtype, shape) in FEATURES.items():
+        try:
+            column = np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+        except (OSError, ValueError):
+            return False
+        if column.dtype != dtype or column.shape != (combo.TOTAL, *shape):
+            return False
+    return True
+
+def load_features(path: str = None, build: bool = True) -> dict[str, np.ndarray]:
+    """특징 테이블을 메모리 맵으로 엽니다. 없거나 형식이 다르면 (build=True 일 때) 새로 만듭니다."""
+    path = path or FEATURES_DIR
+    if not features_ready(path):
+        if not build:
+            raise FileNotFoundError(f"조합 특징 테이블이 없습니다: {path}")
+        build_features(path)
+    return {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in FEATURES}
+
+def parse_range(text: str, low: int, high: int) -> tuple[int, int]:
+    """"100-170" 또는 "3" 형식의 범위를 (최소, 최대) 로 읽습니다."""
+    try:
+        lo, _, hi = str(text).partition("-")
+        lo, hi = int(lo), int(hi or lo)
+    except ValueError:
+        raise ValueError(f"범위 형식이 올바르지 않습니다: '{text}' (예: 100-170 또는 3)")
+    if not low <= lo <= hi <= high:
+        raise ValueError(f"범위는 {low} ~ {high} 사이에서 최소 <= 최대여야 합니다: '{text}'")
+    return lo, hi
+
+def filter_combos(features: dict[str, np.ndarray], sum_range: tuple[int, int] = None, odd: tuple[int, int] = None,
+                  span: tuple[int, int] = None, max_run: int = None, max_per_decade: int = None,
+                  include=(), exclude=(), avoid=()) -> np.ndarray:
+    """
+    조건을 모두 만족하는 조합 번호를 오름차순 int32 배열로 반환합니다.
+    include 의 번호는 모두 포함하고, exclude 의 번호는 하나도 포함하지 않으며, avoid 의 조합 번호는 제외합니다.
+    """
+    include_mask = np.uint64(sum(1 << (n - 1) for n in set(include)))
+    exclude_mask = np.uint64(sum(1 << (n - 1) for n in set(exclude)))
+    found = []
+    for start in range(0, combo.TOTAL, CHUNK):
+        stop = min(start + CHUNK, combo.TOTAL)
+        keep = np.ones(stop - start, dtype=bool)
+        if sum_range:
+            column = features["sum"][start:stop]
+            keep &= (column >= sum_range[0]) & (column <= sum_range[1])
+        if odd:
+            column = features["odd"][start:stop]
+            keep &= (column >= odd[0]) & (column <= odd[1])
+        if span:
+            column = features["span"][start:stop]
+            keep &= (column >= span[0]) & (column <= span[1])
+        if max_run is not None:
+            keep &= features["run"][start:stop] <= max_run
+        if max_per_decade is not None:
+            keep &= features["decades"][start:stop].max(axis=1) <= max_per_decade
+        if include_mask or exclude_mask:
+            column = features["mask"][start:stop]
+            if include_mask:
+                keep &= (column & include_mask) == include_mask
+            if exclude_mask:
+                keep &= (column & exclude_mask) == 0
+        found.append(np.flatnonzero(keep).astype(np.int32) + start)
+    candidates = np.concatenate(found)
+    if len(avoid):
+        candidates = candidates[~np.isin(candidates, np.asarray(avoid, dtype=np.int32))]
+    return candidates
+
+def pick(candidates: np.ndarray, count: int, seed: int = None) -> list[list[int]]:
+    """후보 조합 중 count 개를 중복 없이 균등하게 뽑아 번호 목록으로 반환합니다. (후보가 적으면 전부)"""
+    rng = np.random.default_rng(seed)
+    chosen = rng.choice(candidates, size=min(count, len(candidates)), replace=False)
+    return combo.decode_array(chosen).tolist()
@@ -1,56 +1,251 @@
 import os
+import time
+import atexit
+import threading
+
 import requests
+from requests.adapters import HTTPAdapter
+
+from src import attachments, db
+from src.config import (
+    NOTIFY_CONNECT_TIMEOUT, NOTIFY_READ_TIMEOUT, NOTIFY_FLUSH_TIMEOUT,
+    NOTIFY_RETRY_BASE, NOTIFY_RETRY_MAX, NOTIFY_MAX_ATTEMPTS, NOTIFY_MIN_INTERVAL,
+)
+
+# 알림 채널(디스코드, 텔레그램)마다 연결을 재사용하도록 프로세스 전체에서 세션 하나를 공유합니다.
+_session = None
+_session_lock = threading.Lock()
+
+# notify_result 는 DB 편지함에 넣고 바로 돌아오며, 백그라운드 작업 스레드가 채널들로 동시에 보냅니다.
+_wake = threading.Event()
+_worker = None
+_worker_lock = threading.Lock()
+# 채널별 마지막 전송 시각 (전송 간격 제한용)
+_last_sent = {}
+
+def _timeout() -> tuple[float, float]:
+    return (NOTIFY_CONNECT_TIMEOUT, NOTIFY_READ_TIMEOUT)
+
+def get_session() -> requests.Session:
+    """연결 풀을 쓰는 공용 requests 세션 (처음 호출 시 생성)"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+def _post_with_image(url: str, fields: dict[str, str], file_field: str, image_path: str):
+    """이미지를 multipart 본문으로 파일에서 조금씩 읽어 올리는 POST (본문 전체를 메모리에 올리지 않음)"""
+    with attachments.MultipartFile(fields, file_field, image_path) as body:
+        return get_session().post(url, data=body, headers={"Content-Type": body.content_type}, timeout=_timeout())
+
+def _attachment(channel: str, image_path: str) -> str | None:
+    """채널 용량 상한에 맞춘 첨부 이미지 경로 (첨부할 수 없으면 None)"""
+    if not image_path:
+        return None
+    path = attachments.prepare(image_path, attachments.MAX_UPLOAD_BYTES[channel])
+    if path is None and os.path.exists(image_path):
+        print(f"첨부 이미지가 너무 커서 메시지만 보냅니다: {image_path}")
+    return path
 
-def send_discord_message(webhook_url: str, message: str, image_path: str = None):
-    """디스코드 웹훅으로 메시지와 스크린샷 캡처를 전송합니다."""
+def send_discord_message(webhook_url: str, message: str, image_path: str = None) -> bool:
+    """디스코드 웹훅으로 메시지와 스크린샷 캡처를 전송합니다. 반환: 전송 성공 여부"""
     if not webhook_url:
-        return
-        
+        return False
+
     data = {"content": message}
-    files = {}
-    
+
     try:
-        if image_path and os.path.exists(image_path):
-            with open(image_path, "rb") as f:
-                files["file"] = (os.path.basename(image_path), f.read())
-            response = requests.post(webhook_url, data=data, files=files)
+        image_path = _attachment("discord", image_path)
+        if image_path:
+            response = _post_with_image(webhook_url, data, "file", image_path)
         else:
-            response = requests.post(webhook_url, json=data)
-            
+            response = get_session().post(webhook_url, json=data, timeout=_timeout())
+
         if response.status_code not in [200, 204]:
             print(f"디스코드 알림 전송 실패: {response.status_code}")
+            return False
+        return True
     except Exception as e:
         print(f"디스코드 알림 전송 중 오류 발생: {e}")
+        return False
 
-def send_telegram_message(bot_token: str, chat_id: str, message: str, image_path: str = None):
-    """텔레그램 봇 API로 메시지와 스크린샷 캡처를 전송합니다."""
+def send_telegram_message(bot_token: str, chat_id: str, message: str, image_path: str = None) -> bool:
+    """텔레그램 봇 API로 메시지와 스크린샷 캡처를 전송합니다. 반환: 전송 성공 여부"""
     if not bot_token or not chat_id:
-        return
-        
+        return False
+
     try:
-        if image_path and os.path.exists(image_path):
+        image_path = _attachment("telegram", image_path)
+        if image_path:
             url = f"https://api.telegram.org/bot{bot_token}/sendPhoto"
-            data = {"chat_id": chat_id, "caption": message}
-            with open(image_path, "rb") as f:
-                files = {"photo": f.read()}
-                response = requests.post(url, data=data, files=files)
+            data = {"chat_id": chat_id, "caption": message[:TELEGRAM_CAPTION_LIMIT]}
+            response = _post_with_image(url, data, "photo", image_path)
         else:
             url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
             data = {"chat_id": chat_id, "text": message}
-            response = requests.post(url, json=data)
-            
+            response = get_session().post(url, json=data, timeout=_timeout())
+
         if response.status_code != 200:
             print(f"텔레그램 알림 전송 실패: {response.status_code}")
+            return False
+        return True
     except Exception as e:
          print(f"텔레그램 알림 전송 중 오류 발생: {e}")
+         return False
+
+# 한 메시지의 최대 글자 수 (디스코드 2,000자, 텔레그램 4,096자). 묶음 알림은 이 안에서 자릅니다.
+MESSAGE_LIMITS = {"discord": 2000, "telegram": 4096}
+# 텔레그램 사진 설명(caption) 최대 글자 수
+TELEGRAM_CAPTION_LIMIT = 1024
+DIGEST_SEPARATOR = "\n\n"
 
-def notify_result(message: str, image_path: str = None):
-    """설정된 메신저들로 결과 알림을 브로드캐스팅합니다."""
+def _channels() -> dict:
+    """설정된 메신저별 전송 함수 {채널 이름: fn(message, image_path) -> bool}"""
     # 환경변수 동적 로드 (circular 임포트 방지)
     from src.config import DISCORD_WEBHOOK_URL, TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID
-    
+
+    channels = {}
     if DISCORD_WEBHOOK_URL:
-        send_discord_message(DISCORD_WEBHOOK_URL, message, image_path)
-        
+        channels["discord"] = lambda message, image_path: send_discord_message(DISCORD_WEBHOOK_URL, message, image_path)
     if TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID:
-        send_telegram_message(TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID, message, image_path)
+        channels["telegram"] = lambda message, image_path: send_telegram_message(TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID, message, image_path)
+    return channels
+
+def channel_names() -> list[str]:
+    return list(_channels())
+
+def coalesce(rows: list[dict], limit: int) -> tuple[list[dict], str, str | None]:
+    """
+    먼저 들어온 알림부터 limit 글자 안에서 한 메시지로 묶습니다.
+    이미지가 있는 알림은 따로 보냅니다. (맨 앞이면 그 알림 하나만)
+    반환: (묶은 알림 행들, 보낼 메시지, 이미지 경로)
+    """
+    if rows[0]['image_path']:
+        return rows[:1], rows[0]['message'], rows[0]['image_path']
+    batch, length = [], 0
+    for row in rows:
+        if row['image_path'] or (batch and length + len(DIGEST_SEPARATOR) + len(row['message']) > limit):
+            break
+        batch.append(row)
+        length += len(row['message']) + (len(DIGEST_SEPARATOR) if len(batch) > 1 else 0)
+    message = DIGEST_SEPARATOR.join(r['message'] for r in batch)
+    if len(batch) > 1:
+        message = f"📬 알림 {len(batch)}건\n\n{message}"
+    return batch, message[:limit], None
+
+def backoff(attempts: int) -> float:
+    """attempts 번 실패한 뒤 다시 보내기까지 기다릴 시간(초)"""
+    return min(NOTIFY_RETRY_BASE * 2 ** (attempts - 1), NOTIFY_RETRY_MAX)
+
+def deliver(channel: str, send, now: float) -> float | None:
+    """
+    채널 하나에서 보낼 차례가 된 알림을 묶어 한 번 보냅니다. 채널별 최소 전송 간격을 지킵니다.
+    반환: 이 채널을 다시 확인할 시각 (보낼 알림이 없으면 None)
+    """
+    ready_at = _last_sent.get(channel, 0.0) + NOTIFY_MIN_INTERVAL
+    if now < ready_at:
+        return ready_at
+    rows = db.get_due_notifications(channel, now, NOTIFY_MAX_ATTEMPTS)
+    if not rows:
+        return db.next_notification_time([channel], NOTIFY_MAX_ATTEMPTS)
+    batch, message, image_path = coalesce(rows, MESSAGE_LIMITS.get(channel, 2000))
+    ids = [r['id'] for r in batch]
+    _last_sent[channel] = time.time()
+    if send(message, image_path):
+        db.mark_notifications_sent(ids)
+    else:
+        attempts = max(r['attempts'] for r in batch) + 1
+        db.mark_notifications_failed(ids, f"전송 실패 ({attempts}회째)", time.time() + backoff(attempts))
+    return _last_sent[channel] + NOTIFY_MIN_INTERVAL
+
+def _deliver_all(now: float) -> list[float]:
+    """
+    채널별 전송을 동시에 진행합니다. (한 채널이 느려도 다른 채널은 기다리지 않음)
+    종료 직전(atexit)에도 보낼 수 있도록 concurrent.futures 대신 스레드를 직접 씁니다.
+    반환: 채널별로 다시 확인할 시각들
+    """
+    due, errors = [], []
+
+    def run(name, send):
+        try:
+            t = deliver(name, send, now)
+            if t is not None:
+                due.append(t)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=item, name=f"notifier-{item[0]}", daemon=True) for item in _channels().items()]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+    return due
+
+def _run_worker():
+    while True:
+        wait = None
+        try:
+            due = _deliver_all(time.time())
+            wait = max(0.0, min(due) - time.time()) if due else None
+        except Exception as e:
+            print(f"알림 전송 중 오류 발생: {e}")
+            wait = NOTIFY_MIN_INTERVAL
+        _wake.wait(wait)
+        _wake.clear()
+
+def _ensure_worker():
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            atexit.register(flush)
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_run_worker, name="notifier", daemon=True)
+            _worker.start()
+    _wake.set()
+
+def _due_count() -> int:
+    now = time.time()
+    return sum(len(db.get_due_notifications(channel, now, NOTIFY_MAX_ATTEMPTS, limit=1)) for channel in channel_names())
+
+def flush(timeout: float = None) -> bool:
+    """
+    지금 보낼 차례인 알림이 모두 처리될 때까지 최대 timeout 초 기다립니다.
+    실패해 재시도를 기다리는 알림은 편지함에 남아 다음 실행 때 다시 보냅니다. 반환: 남은 알림 없이 끝났는지 여부
+    """
+    timeout = NOTIFY_FLUSH_TIMEOUT if timeout is None else timeout
+    if not channel_names():
+        return True
+    _ensure_worker()
+    deadline = time.time() + timeout
+    while _due_count():
+        if time.time() > deadline:
+            print("[경고] 보내지 못한 알림을 편지함에 남기고 종료합니다. (다음 실행 때 다시 보냄)")
+            return False
+        time.sleep(0.05)
+    return True
+
+def notify_result(message: str, image_path: str = None, wait: bool = False):
+    """
+    설정된 메신저들로 결과 알림을 브로드캐스팅합니다.
+    알림은 먼저 DB 편지함(outbox)에 저장되고, 백그라운드에서 채널별로 동시에 보내므로 바로 돌아옵니다.
+    실패한 알림은 점점 간격을 늘려 다시 보내며, 종료 직전에는 보낼 차례인 알림을 기다려 보냅니다.
+    wait=True 면 이 알림까지 전송이 끝난 뒤 돌아옵니다.
+    """
+    if not channel_names():
+        return
+    db.enqueue_notification(message, image_path)
+    _ensure_worker()
+    if wait:
+        flush()
+
+def resume():
+    """이전 실행에서 보내지 못한 알림이 있으면 백그라운드 전송을 시작합니다."""
+    channels = channel_names()
+    if channels and db.next_notification_time(channels, NOTIFY_MAX_ATTEMPTS) is not None:
+        _ensure_worker()
@@ -0,0 +1,210 @@
+from functools import lru_cache
+from math import comb
+
+import numpy as np
+
+from src import combo, scoring
+
+# 로또6/45 한 회차의 모든 경우 = 1등 번호 6개 조합 x 남은 39개 중 보너스 번호
+LOTTO_DRAWS = comb(45, 6) * 39
+# 연금복권720+ 한 회차의 모든 경우 = 1등 조(5) x 6자리 번호 (보너스 번호는 따로 독립 추첨)
+PENSION_DRAWS = 5 * 10 ** 6
+PENSION_NUMBERS = 10 ** 6
+
+# 한 번에 채점할 (당첨 번호 경우 x 게임) 칸 수
+CHUNK_CELLS = 4_000_000
+
+# 일치 개수 -> 등수 코드 (5개 일치는 보너스 번호에 따라 2등/3등)
+_LOTTO_RANK_BY_MATCH = [0, 0, 0, 5, 4, 3, 1]
+
+def _summary(weight_total: int, first: float, second: float, best: list[int], any_rank: list[int], hits: list[int]) -> dict:
+    """가중치 합으로 누적한 값을 확률/기댓값으로 바꿉니다."""
+    expected = first / weight_total
+    return {
+        "expected": expected,
+        "variance": max(second / weight_total - expected ** 2, 0.0),
+        "best_rank": [b / weight_total for b in best],
+        "any_rank": [a / weight_total for a in any_rank],
+        "expected_hits": [h / weight_total for h in hits],
+    }
+
+def _lotto_rank(match: int, bonus: bool) -> int:
+    return 2 if match == 5 and bonus else _LOTTO_RANK_BY_MATCH[match]
+
+@lru_cache(maxsize=None)
+def lotto_pair_table(shared: int) -> np.ndarray:
+    """
+    공통 번호가 shared 개인 두 게임 A, B 의 (A 등수, B 등수) 별 경우의 수 (6, 6) int64. 합은 LOTTO_DRAWS.
+    45개 번호를 A∩B, A만, B만, 나머지로 나눠 각 부분에서 당첨 번호가 몇 개 나오는지와 보너스가 어디서 나오는지로 셉니다.
+    (shared = 6 이면 대각선이 게임 하나의 등수별 경우의 수)
+    """
+    only = 6 - shared
+    rest = 45 - shared - 2 * only
+    table = np.zeros((6, 6), dtype=np.int64)
+    for a in range(shared + 1):
+        for b in range(only + 1):
+            for c in range(only + 1):
+                d = 6 - a - b - c
+                if not 0 <= d <= rest:
+                    continue
+                ways = comb(shared, a) * comb(only, b) * comb(only, c) * comb(rest, d)
+                # 보너스 번호는 남은 39개 중 어느 부분에서 나오는지에 따라 A/B 의 2등 여부가 갈림
+                for left, in_a, in_b in ((shared - a, True, True), (only - b, True, False), (only - c, False, True), (rest - d, False, False)):
+                    if left:
+                        table[_lotto_rank(a + b, in_a), _lotto_rank(a + c, in_b)] += ways * left
+    return table
+
+def lotto_outcomes(lines, prizes: np.ndarray = scoring.DEFAULT_PRIZES) -> dict:
+    """
+    로또 게임 묶음의 정확한 등수 확률과 당첨금 기댓값/분산을 계산합니다. (시뮬레이션 없이 조합 계산)
+    - 기댓값/분산: 두 게임의 당첨금 곱의 기댓값은 공통 번호 개수로만 정해지므로 lotto_pair_table 로
+      게임 쌍마다 정확히 더합니다.
+    - 등수 확률: 게임들이 쓰는 번호 U 밖의 번호는 서로 구별할 필요가 없으므로, 당첨 번호와 U 의 교집합 S 만
+      나열하고 각 S 에 C(45-|U|, 6-|S|) 의 가중치를 줍니다. 보너스 번호는 5개 일치한 게임의 빠진 번호일 때만
+      의미가 있어 39가지 중 몇 가지인지로 셉니다.
+
+    반환 (등수 코드 0~5 순서의 목록):
+      expected / variance   게임 묶음 전체 당첨금의 기댓값 / 분산
+      best_rank[r]          가장 좋은 등수가 r 일 확률 (0 = 모두 낙첨)
+      any_rank[r]           적어도 한 게임이 r 등일 확률
+      expected_hits[r]      r 등에 당첨되는 게임 수의 기댓값
+    """
+    tickets = scoring.to_array(lines)
+    masks = scoring.to_masks(tickets)
+    prizes = np.asarray(prizes, dtype=np.float64)
+
+    single = np.diag(lotto_pair_table(6))
+    shared = scoring.popcount(masks[:, None] & masks[None, :]).astype(np.int64)
+    pairs = np.bincount(shared.ravel(), minlength=7)
+    first = float(len(masks) * (single @ prizes))
+    second = float(sum(pairs[k] * (prizes @ lotto_pair_table(k) @ prizes) for k in range(7) if pairs[k]))
+    hits = (single * len(masks)).tolist()
+
+    union = np.unique(tickets).astype(np.int64)
+    u = len(union)
+    best, any_rank = [0] * 6, [0] * 6
+    step = max(1, CHUNK_CELLS // max(len(masks), 1))
+    for j in range(0, min(u, 6) + 1):
+        weight = comb(45 - u, 6 - j)
+        total = comb(u, j)
+        if not weight:
+            continue
+        if j < 3:
+            # 3개 이상 일치하는 게임이 있을 수 없음
+            best[0] += weight * 39 * total
+            continue
+        for start in range(0, total, step):
+            local = combo.unrank_subsets(np.arange(start, min(start + step, total)), j)
+            drawn = scoring.to_masks(union[local.astype(np.int64) - 1])
+            match = scoring.popcount(drawn[:, None] & masks[None, :]).astype(np.uint8)
+            # 행마다 나온 일치 개수들을 비트로 모음 (비트 k = k개 일치한 게임이 있음)
+            seen = np.bitwise_or.reduce(np.left_shift(np.uint8(1), match), axis=1)
+            any6, has5, any4, any3 = ((seen >> k) & 1 == 1 for k in (6, 5, 4, 3))
+
+            # 5개 일치 게임이 있는 행: 빠진 번호가 서로 다른 개수 = 2등이 되는 보너스 번호 개수
+            distinct = np.zeros(len(drawn), dtype=np.int64)
+            rows5 = np.flatnonzero(has5)
+            if len(rows5):
+                rows, cols = np.nonzero(match[rows5] == 5)
+                missing = masks[cols] & ~drawn[rows5[rows]]
+                keys = np.unique(np.stack([rows5[rows].astype(np.uint64), missing], axis=1), axis=0)
+                np.add.at(distinct, keys[:, 0].astype(np.int64), 1)
+
+            any_rank[1] += weight * 39 * int(any6.sum())
+            any_rank[2] += weight * int(distinct.sum())
+            any_rank[3] += weight * int((np.where(distinct == 1, 38, 39) * has5).sum())
+            any_rank[4] += weight * 39 * int(any4.sum())
+            any_rank[5] += weight * 39 * int(any3.sum())
+
+            best[1] += weight * 39 * int(any6.sum())
+            rest = ~any6
+            best[2] += weight * int(distinct[rest].sum())
+            best[3] += weight * int((39 - distinct[rest & has5]).sum())
+            rest &= ~has5
+            best[4] += weight * 39 * int((rest & any4).sum())
+            rest &= ~any4
+            best[5] += weight * 39 * int((rest & any3).sum())
+            best[0] += weight * 39 * int((rest & ~any3).sum())
+
+    any_rank[0] = best[0]
+    return _summary(LOTTO_DRAWS, first, second, best, any_rank, hits)
+
+def pension_outcomes(tickets, prizes: np.ndarray = scoring.PENSION_PRIZES, bonus_prize: int = scoring.PENSION_BONUS_PRIZE) -> dict:
+    """
+    연금복권720+ 티켓 [(조, 6자리 번호), ...] 의 정확한 등수 확률과 당첨금 기댓값/분산을 계산합니다.
+    등수는 끝자리부터 일치한 길이로 정해지므로, 티켓 번호들의 끝자리 트리를 따라 내려가며
+    "당첨 번호의 끝 k 자리가 이 노드와 같고 k+1 자리부터 갈라지는" 경우를 한 번씩 셉니다.
+    보너스(조 무관 6자리 일치)는 본 추첨과 독립이라 기댓값/분산을 따로 더합니다.
+    반환 형식은 lotto_outcomes 와 같으며(등수 코드 0~7), bonus_probability 가 추가됩니다.
+    """
+    tickets = [(int(g), int(n)) for g, n in tickets]
+    prizes = np.asarray(prizes, dtype=np.float64)
+    first = second = 0.0
+    best, any_rank, hits = [0] * 8, [0] * 8, [0] * 8
+
+    def add(weight: int, counts: np.ndarray):
+        nonlocal first, second
+        payout = float(counts @ prizes)
+        first += weight * payout
+        second += weight * payout ** 2
+        ranks = np.flatnonzero(counts[1:]) + 1
+        best[int(ranks[0]) if len(ranks) else 0] += weight
+        for r in ranks:
+            any_rank[r] += weight
+        for r in range(1, 8):
+            hits[r] += weight * int(counts[r])
+
+    def visit(depth: int, group: list[tuple[int, int]], diverged: np.ndarray):
+        # group: 끝 depth 자리가 당첨 번호와 같은 티켓들, diverged: 이미 갈라진 티켓들의 등수별 개수
+        if depth == 6:
+            for win_group in range(1, 6):
+                counts = diverged.copy()
+                for g, _ in group:
+                    counts[1 if g == win_group else 2] += 1
+                add(1, counts)
+            return
+        rank = scoring._PENSION_RANK_BY_SUFFIX[depth]
+        children = {}
+        for ticket in group:
+            children.setdefault(ticket[1] // 10 ** depth % 10, []).append(ticket)
+        counts = diverged.copy()
+        counts[rank] += len(group)
+        # 다음 자리가 어느 티켓과도 다른 경우 (깊이 0 에서는 모두 낙첨)
+        add((10 - len(children)) * 10 ** (5 - depth) * 5, counts)
+        for child in children.values():
+            counts = diverged.copy()
+            counts[rank] += len(group) - len(child)
+            visit(depth + 1, child, counts)
+
+    visit(0, tickets, np.zeros(8, dtype=np.int64))
+    any_rank[0] = best[0]
+    hits[0] = PENSION_DRAWS * len(tickets) - sum(hits[1:])
+    result = _summary(PENSION_DRAWS, first, second, best, any_rank, hits)
+
+    # 보너스: 번호 n 을 가진 티켓 수 c_n 이면 보너스 당첨금 = bonus_prize * c_B (B 는 0~999999 균등)
+    per_number = np.unique([n for _, n in tickets], return_counts=True)[1] if tickets else np.zeros(0)
+    bonus_mean = bonus_prize * len(tickets) / PENSION_NUMBERS
+    bonus_second = float(bonus_prize) ** 2 * float((per_number.astype(np.float64) ** 2).sum()) / PENSION_NUMBERS
+    result["expected"] += bonus_mean
+    result["variance"] += max(bonus_second - bonus_mean ** 2, 0.0)
+    result["bonus_probability"] = len(per_number) / PENSION_NUMBERS
+    return result
+
+def random_lines(count: int, prizes: np.ndarray = scoring.DEFAULT_PRIZES) -> tuple[float, float]:
+    """
+    번호를 모르는 자동 게임 count 개의 (기댓값, 분산).
+    무작위 게임의 당첨금은 어떤 당첨 번호에 대해서도 조건부 기댓값이 같아 다른 게임과의 공분산이 0 이므로 그대로 더합니다.
+    """
+    one = lotto_outcomes([[1, 2, 3, 4, 5, 6]], prizes)
+    return one["expected"] * count, one["variance"] * count
+
+def random_pension_sets(count: int, prizes: np.ndarray = scoring.PENSION_PRIZES, bonus_prize: int = scoring.PENSION_BONUS_PRIZE) -> tuple[float, float]:
+    """번호를 모르는 연금복권 '모든조' 세트(같은 번호 1~5조) count 개의 (기댓값, 분산)"""
+    one = pension_outcomes([(g, 0) for g in range(1, 6)], prizes, bonus_prize)
+    return one["expected"] * count, one["variance"] * count
+
+def average_prizes(tables: dict[int, dict[str, int]]) -> np.ndarray:
+    """회차별 실제 당첨금 {회차: {"1등": 금액, ...}} 의 등수별 평균 (없으면 기본 금액)"""
+    if not tables:
+        return scoring.DEFAULT_PRIZES.copy()
+    return np.stack([scoring.prize_array(t) for t in tables.values()]).mean(axis=0).round().astype(np.int64)
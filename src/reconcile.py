@@ -0,0 +1,37 @@
+from collections import Counter
+
+from src import scoring
+
+def match_unconfirmed_tickets(unconfirmed: list[dict], confirmed_numbers: dict[int, list[str]],
+                              details: dict[int, list[dict]]) -> dict[int, list[int]]:
+    """
+    "확인필요" 로 저장된 자동 티켓에 구매 상세 내역의 실제 번호를 배정합니다.
+    회차마다 상세 내역의 자동 게임에서 이미 번호가 기록된 자동 티켓을 빼고,
+    남은 게임을 구매 순서대로 "확인필요" 티켓(id 순)에 하나씩 대응시킵니다.
+    상세 내역이 없거나 게임 수가 모자라면 남는 티켓은 배정하지 않습니다.
+    반환: {purchase_id: 번호 6개}
+    """
+    known = {
+        rnd: Counter(tuple(sorted(n)) for n in map(scoring.parse_numbers, numbers) if n)
+        for rnd, numbers in confirmed_numbers.items()
+    }
+    remaining = {}
+    for rnd, games in details.items():
+        seen = Counter(known.get(rnd, {}))
+        queue = []
+        for game in games:
+            nums = tuple(game['numbers'])
+            if game['mode'] != "자동" or scoring.parse_numbers(",".join(map(str, nums))) is None:
+                continue
+            if seen[nums]:
+                seen[nums] -= 1
+                continue
+            queue.append(list(nums))
+        remaining[rnd] = queue
+
+    assigned = {}
+    for t in unconfirmed:
+        queue = remaining.get(t['round_number'])
+        if queue:
+            assigned[t['id']] = queue.pop(0)
+    return assigned
@@ -0,0 +1,83 @@
+import numpy as np
+
+from src import scoring
+
+# 한 번에 채점할 (티켓 x 회차) 칸 수. 메모리 사용량은 대략 이 값의 수 배 바이트로 제한됩니다.
+DEFAULT_CHUNK_CELLS = 4_000_000
+
+def parse_ticket_lines(lines) -> list[list[int]]:
+    """파일/표준 입력의 줄마다 있는 6개 번호를 읽습니다. (쉼표 또는 공백 구분, 빈 줄과 # 주석 무시)"""
+    tickets = []
+    for lineno, line in enumerate(lines, 1):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        nums = scoring.parse_numbers(",".join(line.replace(",", " ").split()))
+        if nums is None:
+            raise ValueError(f"{lineno}번째 줄: 1~45 사이의 서로 다른 번호 6개가 필요합니다: {line}")
+        tickets.append(sorted(nums))
+    return tickets
+
+def iter_rank_chunks(tickets: np.ndarray, rounds: list[dict], chunk_cells: int = DEFAULT_CHUNK_CELLS):
+    """
+    티켓 (N, 6) 을 모든 회차에 대해 채점한 (n, M) 등수 행렬을 티켓 구간별로 나눠서 내보냅니다.
+    yield (시작 인덱스, 등수 코드 행렬)
+    """
+    win_masks = scoring.to_masks(scoring.to_array([r['winning_numbers'] for r in rounds]))[None, :]
+    bonus_masks = np.array([scoring.number_mask([r['bonus_number']]) for r in rounds], dtype=np.uint64)[None, :]
+    ticket_masks = scoring.to_masks(tickets)
+    step = max(1, chunk_cells // max(1, len(rounds)))
+    for start in range(0, len(ticket_masks), step):
+        yield start, scoring.grade_masks(ticket_masks[start:start + step, None], win_masks, bonus_masks)
+
+def replay(tickets: np.ndarray, rounds: list[dict], chunk_cells: int = DEFAULT_CHUNK_CELLS,
+           prizes: np.ndarray = scoring.DEFAULT_PRIZES, on_chunk=None) -> dict:
+    """
+    티켓 묶음을 과거 모든 회차에 대입해 봤을 때의 결과를 집계합니다.
+    prizes 는 등수 코드별 당첨금 (6,) 또는 회차별 당첨금 (M, 6) 입니다.
+    on_chunk(시작 인덱스, 티켓별 등수 개수 (n, 6), 티켓별 당첨금 (n,)) 를 주면 구간마다 호출합니다.
+    반환: {"tickets", "rounds", "rank_counts", "total_cost", "total_win",
+           "per_round_win" (M,), "per_round_hits" (M,), "ticket_best_rank" (N,)}
+    """
+    n, m = len(tickets), len(rounds)
+    rank_counts = np.zeros(len(scoring.RANK_NAMES), dtype=np.int64)
+    per_round_win = np.zeros(m, dtype=np.int64)
+    per_round_hits = np.zeros(m, dtype=np.int64)
+    ticket_best_rank = np.zeros(n, dtype=np.int8)
+
+    for start, ranks in iter_rank_chunks(tickets, rounds, chunk_cells):
+        amounts = prizes[ranks] if prizes.ndim == 1 else prizes[np.arange(m), ranks]
+        per_round_win += amounts.sum(axis=0)
+        per_round_hits += (ranks != 0).sum(axis=0)
+        # 티켓별 등수 개수: 등수 코드를 열 방향으로 세기 위해 오프셋을 더해 한 번에 bincount
+        offsets = np.arange(len(ranks), dtype=np.int64)[:, None] * len(scoring.RANK_NAMES)
+        ticket_counts = np.bincount((ranks + offsets).ravel(), minlength=len(ranks) * len(scoring.RANK_NAMES))
+        ticket_counts = ticket_counts.reshape(len(ranks), len(scoring.RANK_NAMES))
+        rank_counts += ticket_counts.sum(axis=0)
+        # 가장 높은 등수 = 0(낙첨)이 아닌 코드 중 최솟값
+        best = np.where(ranks == 0, 99, ranks).min(axis=1)
+        ticket_best_rank[start:start + len(ranks)] = np.where(best == 99, 0, best)
+        if on_chunk:
+            on_chunk(start, ticket_counts, amounts.sum(axis=1))
+
+    return {
+        "tickets": n,
+        "rounds": m,
+        "rank_counts": {scoring.RANK_NAMES[i]: int(c) for i, c in enumerate(rank_counts)},
+        "total_cost": 1000 * n * m,
+        "total_win": int(per_round_win.sum()),
+        "per_round_win": per_round_win,
+        "per_round_hits": per_round_hits,
+        "ticket_best_rank": ticket_best_rank,
+    }
+
+def best_and_worst_rounds(result: dict, rounds: list[dict], top: int = 5) -> tuple[list[dict], list[dict]]:
+    """당첨금 합계 기준 최고/최저 회차 (동률이면 당첨 게임 수, 최신 회차 순)"""
+    rows = [
+        {"round_number": r['round_number'], "draw_date": r.get('draw_date'),
+         "win": int(result['per_round_win'][i]), "hits": int(result['per_round_hits'][i])}
+        for i, r in enumerate(rounds)
+    ]
+    best = sorted(rows, key=lambda x: (-x['win'], -x['hits'], -x['round_number']))[:top]
+    worst = sorted(rows, key=lambda x: (x['win'], x['hits'], -x['round_number']))[:top]
+    return best, worst
@@ -0,0 +1,18 @@
+from datetime import datetime, timedelta
+
+# 로또6/45 제1회 추첨일. 이후 매주 토요일 추첨이며 판매는 추첨 당일 20시에 마감됩니다.
+FIRST_DRAW_DATE = datetime(2002, 12, 7)
+SALES_CLOSE = timedelta(hours=20)
+WEEK = timedelta(weeks=1)
+
+def sales_deadline(round_number: int) -> datetime:
+    """해당 회차의 판매 마감 시각 (추첨일 20:00)"""
+    return FIRST_DRAW_DATE + SALES_CLOSE + WEEK * (round_number - 1)
+
+def next_draw_round(now: datetime = None) -> int:
+    """지금 구매하면 참여하게 되는 회차 (판매 마감이 지나면 다음 회차)"""
+    now = now or datetime.now()
+    elapsed = now - sales_deadline(1)
+    if elapsed < timedelta(0):
+        return 1
+    return elapsed // WEEK + 2
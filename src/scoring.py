@@ -0,0 +1,125 @@
+import re
+
+import numpy as np
+
+# 등수 코드: 0 = 낙첨, 1~5 = 1등~5등
+RANK_NAMES = ["낙첨", "1등", "2등", "3등", "4등", "5등"]
+
+# 등수별 당첨금 (1~3등은 회차마다 다르므로 평균적인 가상 금액)
+DEFAULT_PRIZES = np.array([0, 2000000000, 50000000, 1500000, 50000, 5000], dtype=np.int64)
+
+# (일치 개수 * 2 + 보너스 일치 여부) -> 등수 코드
+_RANK_TABLE = np.zeros(14, dtype=np.int8)
+_RANK_TABLE[[6, 7]] = 5      # 3개 일치
+_RANK_TABLE[[8, 9]] = 4      # 4개 일치
+_RANK_TABLE[10] = 3          # 5개 일치
+_RANK_TABLE[11] = 2          # 5개 + 보너스
+_RANK_TABLE[[12, 13]] = 1    # 6개 일치
+
+_ONE = np.uint64(1)
+
+def prize_array(prizes: dict[str, int] | None) -> np.ndarray:
+    """{"1등": 금액, ...} 형태의 회차별 실제 당첨금을 등수 코드 순서의 배열로 바꿉니다. (없는 등수는 기본값)"""
+    amounts = DEFAULT_PRIZES.copy()
+    for code, name in enumerate(RANK_NAMES[1:], 1):
+        if prizes and prizes.get(name) is not None:
+            amounts[code] = prizes[name]
+    return amounts
+
+def parse_numbers(numbers: str) -> list[int] | None:
+    """DB 에 저장된 "1, 2, 3, 4, 5, 6" 형식의 번호를 파싱합니다. 번호가 없거나 형식이 다르면 None"""
+    try:
+        nums = [int(n) for n in numbers.replace(" ", "").split(",")]
+    except (AttributeError, ValueError):
+        return None
+    if len(nums) != 6 or len(set(nums)) != 6 or not all(1 <= n <= 45 for n in nums):
+        return None
+    return nums
+
+def to_array(tickets) -> np.ndarray:
+    """번호 목록들을 (N, 6) uint8 배열로 변환합니다."""
+    return np.asarray(tickets, dtype=np.uint8).reshape(-1, 6)
+
+def to_masks(tickets: np.ndarray) -> np.ndarray:
+    """(N, 6) 번호 배열을 번호 n 이 n 번째 비트인 uint64 비트마스크 (N,) 로 변환합니다."""
+    tickets = np.asarray(tickets)
+    return np.bitwise_or.reduce(np.left_shift(_ONE, tickets.astype(np.uint64)), axis=-1)
+
+def number_mask(numbers) -> np.uint64:
+    mask = np.uint64(0)
+    for n in numbers:
+        mask |= _ONE << np.uint64(n)
+    return mask
+
+if hasattr(np, "bitwise_count"):
+    def popcount(x: np.ndarray) -> np.ndarray:
+        return np.bitwise_count(x)
+else:  # NumPy 2.0 미만
+    def popcount(x: np.ndarray) -> np.ndarray:
+        x = x - ((x >> np.uint64(1)) & np.uint64(0x5555555555555555))
+        x = (x & np.uint64(0x3333333333333333)) + ((x >> np.uint64(2)) & np.uint64(0x3333333333333333))
+        x = (x + (x >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+        return ((x * np.uint64(0x0101010101010101)) >> np.uint64(56)).astype(np.uint8)
+
+def grade_masks(ticket_masks: np.ndarray, win_masks, bonus_masks) -> np.ndarray:
+    """
+    비트마스크끼리 채점하여 등수 코드 배열을 반환합니다.
+    브로드캐스팅을 지원하므로 티켓 (N, 1) 과 회차 (1, M) 를 넘기면 (N, M) 결과를 얻습니다.
+    """
+    matches = popcount(ticket_masks & win_masks).astype(np.int8)
+    has_bonus = (ticket_masks & bonus_masks) != 0
+    return _RANK_TABLE[matches * 2 + has_bonus]
+
+def grade(tickets: np.ndarray, winning_numbers, bonus_number: int, prizes: np.ndarray = DEFAULT_PRIZES) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (N, 6) 티켓 배열을 한 회차의 당첨 번호로 한 번에 채점합니다.
+    반환: (등수 코드 int8 배열, 당첨금 int64 배열)
+    """
+    ranks = grade_masks(to_masks(tickets), number_mask(winning_numbers), number_mask([bonus_number]))
+    return ranks, prizes[ranks]
+
+# --- 연금복권720+ ------------------------------------------------------------
+# 등수 코드: 0 = 낙첨, 1~7 = 1등~7등 (보너스는 등수와 별도로 판정)
+PENSION_RANK_NAMES = ["낙첨", "1등", "2등", "3등", "4등", "5등", "6등", "7등"]
+
+# 등수별 당첨금 총액 (1등 월 700만원 x 20년, 2등/보너스 월 100만원 x 10년)
+PENSION_PRIZES = np.array([0, 1680000000, 120000000, 1000000, 100000, 50000, 5000, 1000], dtype=np.int64)
+PENSION_BONUS_PRIZE = 120000000
+
+# 끝에서부터 일치한 자리 수 -> 등수 코드 (6자리 일치는 조 일치 여부로 1등/2등을 가름)
+_PENSION_RANK_BY_SUFFIX = np.array([0, 7, 6, 5, 4, 3, 2], dtype=np.int8)
+_POW10 = 10 ** np.arange(1, 7, dtype=np.int64)
+
+def pension_suffix_matches(numbers, win_number) -> np.ndarray:
+    """6자리 번호(정수)끼리 끝자리부터 연속으로 일치하는 자리 수 (0~6)"""
+    numbers = np.asarray(numbers, dtype=np.int64)[..., None]
+    win_number = np.asarray(win_number, dtype=np.int64)[..., None]
+    # 끝 k 자리 일치는 끝 k-1 자리 일치를 포함하므로 일치한 k 의 개수가 곧 최장 일치 길이
+    return ((numbers % _POW10) == (win_number % _POW10)).sum(axis=-1)
+
+def grade_pension(groups, numbers, win_group, win_number, bonus_number,
+                  prizes: np.ndarray = PENSION_PRIZES, bonus_prize: int = PENSION_BONUS_PRIZE):
+    """
+    연금복권720+ 티켓(조, 6자리 번호)을 한 번에 채점합니다. 브로드캐스팅을 지원합니다.
+    반환: (등수 코드 int8 배열, 보너스 당첨 여부 bool 배열, 당첨금 int64 배열)
+    """
+    groups = np.asarray(groups)
+    numbers = np.asarray(numbers, dtype=np.int64)
+    suffix = pension_suffix_matches(numbers, win_number)
+    ranks = np.where((suffix == 6) & (groups == np.asarray(win_group)), np.int8(1), _PENSION_RANK_BY_SUFFIX[suffix])
+    bonus = numbers == np.asarray(bonus_number, dtype=np.int64)
+    return ranks, bonus, prizes[ranks] + bonus * np.int64(bonus_prize)
+
+def parse_pension_ticket(ticket: str) -> tuple[int, int] | None:
+    """DB 에 저장된 "3조 012345" 형식의 연금복권 번호를 (조, 6자리 번호) 로 파싱합니다. 형식이 다르면 None"""
+    m = re.fullmatch(r"\s*([1-5])\s*조\s*(\d{6})\s*", ticket or "")
+    return (int(m.group(1)), int(m.group(2))) if m else None
+
+def format_pension_ticket(group: int, number) -> str:
+    return f"{int(group)}조 {int(number):06d}"
+
+def pension_rank_name(rank: int, bonus: bool) -> str:
+    """등수 코드와 보너스 당첨 여부를 DB 에 저장할 등수 이름으로 바꿉니다. (예: "7등", "보너스", "7등+보너스")"""
+    if not bonus:
+        return PENSION_RANK_NAMES[rank]
+    return "보너스" if rank == 0 else f"{PENSION_RANK_NAMES[rank]}+보너스"
@@ -1,40 +1,205 @@
 import os
-from playwright.sync_api import sync_playwright, Page, BrowserContext
-import time
+import asyncio
+import threading
+from playwright.async_api import async_playwright, Page, BrowserContext
 from datetime import datetime
 import re
+from urllib.parse import urlsplit
 
 # DB 로직
-from src.db import insert_purchase
+from src.db import insert_purchase, insert_purchases
+from src.rounds import next_draw_round
+from src.config import SESSION_TTL, ROUND_FETCH_CONCURRENCY, ROUND_FETCH_INTERVAL, DHLOTTERY_BASE_URL
+from src.session import (
+    session_paths, load_storage_state, persist_storage_state, state_fingerprint,
+    load_session_meta, save_session_meta, clear_session_meta,
+    build_session_meta, is_session_fresh,
+)
 
 # 동행복권 URL 상수 (모바일 기준)
-URL_LOGIN = "https://m.dhlottery.co.kr/login"
-URL_BUY_LOTTO = "https://ol.dhlottery.co.kr/olotto/game_mobile/game645.do"
-URL_BALANCE_CHECK = "https://m.dhlottery.co.kr/mypage/home"
-URL_BUY_LIST = "https://www.dhlottery.co.kr/mypage/selectMyLotteryledger.do" # API Endpoints may remain same
+# set_site_base_url() 로 모든 호스트를 하나의 대체 서버(가짜 서버 등)로 돌릴 수 있습니다.
+_SITE_URLS = {
+    "URL_LOGIN": "https://m.dhlottery.co.kr/login",
+    "URL_BUY_LOTTO": "https://ol.dhlottery.co.kr/olotto/game_mobile/game645.do",
+    "URL_BUY_720": "https://el.dhlottery.co.kr/game_mobile/pension720/game.jsp",
+    "URL_BALANCE_CHECK": "https://m.dhlottery.co.kr/mypage/home",
+    "URL_CHARGE": "https://m.dhlottery.co.kr/mypage/mndpChrg",
+    "URL_LEDGER_PAGE": "https://www.dhlottery.co.kr/mypage/mylotteryledger",
+    "URL_BUY_LIST": "https://www.dhlottery.co.kr/mypage/selectMyLotteryledger.do", # API Endpoints may remain same
+    "URL_BUY_DETAIL": "https://www.dhlottery.co.kr/mypage/selectMyLotteryledgerDetail.do",
+    "URL_LOTTO_NUMBER": "https://www.dhlottery.co.kr/common.do",
+    "URL_WIN_RESULT": "https://www.dhlottery.co.kr/gameResult.do",
+}
 
-SESSION_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'session.json')
+def set_site_base_url(base_url: str | None):
+    """
+    URL 상수의 스킴/호스트를 base_url 로 바꿉니다. (경로는 그대로 유지)
+    None 이면 실제 동행복권 주소로 되돌립니다.
+    """
+    for name, url in _SITE_URLS.items():
+        if base_url:
+            parts = urlsplit(url)
+            url = base_url.rstrip("/") + parts.path
+        globals()[name] = url
 
-class LottoScraper:
-    def __init__(self, user_id: str, user_pw: str, headless: bool = True):
+URL_LOGIN = URL_BUY_LOTTO = URL_BUY_720 = URL_BALANCE_CHECK = URL_CHARGE = None
+URL_LEDGER_PAGE = URL_BUY_LIST = URL_BUY_DETAIL = URL_LOTTO_NUMBER = URL_WIN_RESULT = None
+set_site_base_url(DHLOTTERY_BASE_URL)
+
+# 4등/5등은 회차와 관계없이 고정 금액
+FIXED_PRIZES_DETAIL = {"4등": {"amount": 50000, "winners": None}, "5등": {"amount": 5000, "winners": None}}
+
+def parse_prize_table(html: str) -> dict[str, dict]:
+    """
+    회차별 등위 당첨금 페이지(gameResult.do?method=byWin)의 표를 파싱합니다.
+    표 열: 순위 | 등위별 총 당첨금액 | 당첨게임 수 | 1게임당 당첨금액 | ...
+    반환: {"1등": {"amount": 1게임당 당첨금, "winners": 당첨게임 수}, ...}
+    """
+    prizes = {}
+    for row in re.findall(r"<tr[^>]*>(.*?)</tr>", html, re.S):
+        cells = [re.sub(r"<[^>]+>", "", c).strip() for c in re.findall(r"<td[^>]*>(.*?)</td>", row, re.S)]
+        if len(cells) < 4 or not re.fullmatch(r"[1-5]등", cells[0]):
+            continue
+        amount = re.sub(r"[^0-9]", "", cells[3])
+        winners = re.sub(r"[^0-9]", "", cells[2])
+        if amount:
+            prizes[cells[0]] = {"amount": int(amount), "winners": int(winners) if winners else None}
+    return prizes
+
+def parse_pension_result(html: str) -> dict | None:
+    """
+    연금복권720+ 회차별 당첨 결과 페이지(gameResult.do?method=win720)를 파싱합니다.
+    반환: {"round_number", "draw_date", "win_group", "win_number", "bonus_number"} (추첨 전이면 None)
+    """
+    m_round = re.search(r"(\d+)\s*회", html)
+    m_win = re.search(r'class="win_num"(.*?)</div>', html, re.S)
+    m_bonus = re.search(r'class="bonus_num"(.*?)</div>', html, re.S)
+    if not (m_round and m_win and m_bonus):
+        return None
+    m_group = re.search(r"(\d)\s*(?:</span>\s*)*조", m_win.group(1))
+    win_digits = re.findall(r">\s*(\d)\s*<", re.sub(r'<span class="group">.*?조</span>', "", m_win.group(1), flags=re.S))
+    bonus_digits = re.findall(r">\s*(\d)\s*<", re.sub(r'<span class="group">.*?</span>', "", m_bonus.group(1), flags=re.S))
+    if not m_group or len(win_digits) != 6 or len(bonus_digits) != 6:
+        return None
+    m_date = re.search(r"(\d{4})[-.](\d{2})[-.](\d{2})", html)
+    return {
+        "round_number": int(m_round.group(1)),
+        "draw_date": "-".join(m_date.groups()) if m_date else None,
+        "win_group": int(m_group.group(1)),
+        "win_number": "".join(win_digits),
+        "bonus_number": "".join(bonus_digits),
+    }
+
+def parse_ticket_details(data: dict) -> list[dict]:
+    """구매 상세 내역 API 응답에서 게임별 (주문 번호, 선택 방식, 번호 6개) 를 구매 순서대로 읽습니다."""
+    games = []
+    for order in data.get("data", {}).get("list", []):
+        for game in order.get("gameList", []):
+            numbers = game.get("numbers")
+            if isinstance(numbers, str):
+                numbers = re.findall(r"\d+", numbers)
+            games.append({
+                "order_no": order.get("ntslOrdrNo"),
+                "mode": game.get("selType", ""),
+                "numbers": sorted(int(n) for n in numbers or []),
+            })
+    return games
+
+async def _paced_gather(fetch, round_numbers, concurrency: int, min_interval: float) -> dict:
+    """
+    회차마다 fetch(회차) 를 동시에 실행하되, 동시 실행은 concurrency 개로 제한하고
+    요청 시작 간격은 min_interval 초 이상 벌립니다. 결과가 없는(None/빈 값) 회차는 제외합니다.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    pace_lock = asyncio.Lock()
+    last_start = [0.0]
+    loop = asyncio.get_running_loop()
+
+    async def paced(round_no: int):
+        async with semaphore:
+            async with pace_lock:
+                wait = last_start[0] + min_interval - loop.time()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                last_start[0] = loop.time()
+            return round_no, await fetch(round_no)
+
+    fetched = await asyncio.gather(*(paced(r) for r in sorted(set(round_numbers))))
+    return {round_no: data for round_no, data in fetched if data}
+
+async def _accept_dialog(dialog):
+    # 팝업 및 Alert 디폴트 승인 처리
+    await dialog.accept()
+
+# ---------------------------------------------------------------------------
+# 공용 이벤트 루프: 동기 호출부(LottoScraper)의 모든 코루틴은 이 루프 하나에서 실행되므로
+# 여러 스레드/계정이 같은 Chromium 을 공유하면서 동시에 대기할 수 있습니다.
+# ---------------------------------------------------------------------------
+_loop = None
+_loop_thread = None
+_loop_guard = threading.Lock()
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    global _loop, _loop_thread
+    with _loop_guard:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            _loop_thread = threading.Thread(target=_loop.run_forever, name="lotto-scraper-loop", daemon=True)
+            _loop_thread.start()
+    return _loop
+
+def run_sync(coro):
+    """코루틴을 공용 이벤트 루프에서 실행하고 결과를 기다립니다."""
+    loop = get_event_loop()
+    if threading.current_thread() is _loop_thread:
+        raise RuntimeError("run_sync 는 이벤트 루프 스레드 안에서 호출할 수 없습니다. await 를 사용하세요.")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+async def launch_browser(headless: bool = True):
+    """여러 AsyncLottoScraper 가 공유할 Chromium 을 띄웁니다. 반환: (playwright, browser)"""
+    playwright = await async_playwright().start()
+    try:
+        browser = await playwright.chromium.launch(headless=headless)
+    except Exception:
+        await playwright.stop()
+        raise
+    return playwright, browser
+
+async def close_browser(playwright, browser):
+    try:
+        await browser.close()
+    finally:
+        await playwright.stop()
+
+class AsyncLottoScraper:
+    def __init__(self, user_id: str, user_pw: str, headless: bool = True, account_id: str = "default", browser=None):
         self.user_id = user_id
         self.user_pw = user_pw
         self.headless = headless
+        self.account_id = account_id
         self.playwright = None
-        self.browser = None
+        # 외부에서 브라우저를 넘겨받으면 컨텍스트만 만들고 브라우저는 닫지 않음 (다중 계정 실행용)
+        self.browser = browser
+        self._owns_browser = browser is None
         self.context = None
         self.page = None
+        # 계정별 세션 파일 (병렬 실행 시 서로 덮어쓰지 않도록 분리)
+        self.session_path, self.session_meta_path = session_paths(user_id)
+        self._loaded_state_fingerprint = None
+        # 세션 캐시로 로그인 확인을 생략한 경우, 첫 페이지 이동 시 검증
+        self._session_unverified = False
+        self._verify_lock = asyncio.Lock()
 
-    def _extract_numbers_from_report(self) -> tuple[int | None, list[list[int]]]:
+    async def _extract_numbers_from_report(self) -> tuple[int | None, list[list[int]]]:
         """
         구매 영수증(#report) 텍스트에서 회차 및 로또 번호를 최대한 추출합니다.
         반환: (round_number_or_None, [[n1..n6], ...])
         """
         try:
             report = self.page.locator("#report")
-            if not report.is_visible():
+            if not await report.is_visible():
                 return None, []
-            text = report.inner_text()
+            text = await report.inner_text()
         except Exception:
             return None, []
 
@@ -52,15 +217,44 @@ class LottoScraper:
         groups = [nums[i:i+6] for i in range(0, len(nums), 6) if len(nums[i:i+6]) == 6]
         return round_no, groups
 
-    def __enter__(self):
-        self.playwright = sync_playwright().start()
-        self.browser = self.playwright.chromium.launch(headless=self.headless)
+    async def _extract_pension_tickets(self) -> tuple[int | None, list[tuple[int, str]]]:
+        """
+        연금복권720+ 구매 결과 레이어 텍스트에서 회차와 (조, 6자리 번호) 목록을 추출합니다.
+        반환: (round_number_or_None, [(조, "012345"), ...])
+        """
+        try:
+            result = self.page.locator("#resultText, #resultLayer").first
+            text = await result.inner_text()
+        except Exception:
+            return None, []
+        m = re.search(r"(\d+)\s*회", text)
+        round_no = int(m.group(1)) if m else None
+        tickets = [(int(g), n) for g, n in re.findall(r"([1-5])\s*조\s*(\d{6})", text)]
+        return round_no, tickets
+
+    def _record_pension_purchase(self, round_no: int | None, tickets: list[tuple[int, str]], notify: str = None):
+        """
+        연금복권 구매 내역을 조별 1매(1,000원)씩 저장합니다. 번호를 못 읽으면 1세트를 '확인필요'로 저장
+        notify 를 주면 구매 내역과 같은 트랜잭션에서 알림을 편지함에 넣습니다.
+        """
+        now = datetime.now()
+        if not tickets:
+            rows = [(round_no or 0, now, "연금자동", "확인필요", 5000)]
+        else:
+            rows = [(round_no or 0, now, "연금자동", f"{group}조 {number}", 1000) for group, number in tickets]
+        insert_purchases(rows, account_id=self.account_id, notify=notify)
+
+    async def __aenter__(self):
+        if self._owns_browser:
+            self.playwright = await async_playwright().start()
+            self.browser = await self.playwright.chromium.launch(headless=self.headless)
         
         # 세션(쿠키)이 존재하면 로드하여 브라우저 컨텍스트 생성
-        storage_state = SESSION_PATH if os.path.exists(SESSION_PATH) else None
+        storage_state = load_storage_state(self.session_path)
+        self._loaded_state_fingerprint = state_fingerprint(storage_state)
         
         # Mobile Context Emulation (iPhone 12/13 style)
-        self.context = self.browser.new_context(
+        self.context = await self.browser.new_context(
             locale="ko-KR",
             timezone_id="Asia/Seoul",
             storage_state=storage_state,
@@ -69,102 +263,167 @@ class LottoScraper:
             has_touch=True,
             user_agent="Mozilla/5.0 (iPhone; CPU iPhone OS 15_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/15.0 Mobile/15E148 Safari/604.1"
         )
-        self.page = self.context.new_page()
+        self.page = await self.context.new_page()
         
         # 팝업 및 Alert 디폴트 승인 처리
-        self.page.on("dialog", lambda dialog: dialog.accept())
+        self.page.on("dialog", _accept_dialog)
         
         return self
 
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.context:
-            self.context.storage_state(path=SESSION_PATH)
-            self.context.close()
-        if self.browser:
-            self.browser.close()
-        if self.playwright:
-            self.playwright.stop()
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        # 세션 저장이나 컨텍스트 종료가 실패해도 브라우저와 playwright 는 반드시 정리
+        try:
+            if self.context:
+                try:
+                    # 세션이 바뀐 경우에만 잠금 후 원자적으로 저장 (파일 잠금 대기가 공용 이벤트 루프를 막지 않도록 스레드에서 실행)
+                    state = await self.context.storage_state()
+                    await asyncio.to_thread(persist_storage_state, self.session_path, state, self._loaded_state_fingerprint)
+                finally:
+                    await self.context.close()
+        finally:
+            try:
+                if self.browser and self._owns_browser:
+                    await self.browser.close()
+            finally:
+                if self.playwright:
+                    await self.playwright.stop()
 
-    def is_logged_in(self) -> bool:
+    async def is_logged_in(self) -> bool:
         """세션 쿠키를 통해 이미 로그인이 되어있는지 확인"""
-        self.page.goto(URL_BALANCE_CHECK, timeout=15000)
+        await self.page.goto(URL_BALANCE_CHECK, timeout=15000)
         # myPage로 갔을 때 로그인 페이지로 리다이렉트 안 당하고 사용자 이름이나 총 예치금이 보이면 성공
         try:
             if "/login" in self.page.url:
                 return False
             # 모바일 마이페이지 잔액 element 확인
-            self.page.wait_for_selector(".pntDpstAmt, #navTotalAmt, .header_money", timeout=5000)
+            await self.page.wait_for_selector(".pntDpstAmt, #navTotalAmt, .header_money", timeout=5000)
             return True
         except Exception:
             return False
 
-    def login(self) -> bool:
-        """동행복권 사이트에 로그인합니다. (세션이 있으면 생략)"""
+    async def _mark_session_verified(self):
+        """세션이 유효함을 확인한 시각과 쿠키 만료 시각을 기록합니다."""
+        self._session_unverified = False
+        meta = build_session_meta(await self.context.cookies())
+        # 파일 잠금 대기가 공용 이벤트 루프를 막지 않도록 스레드에서 저장
+        await asyncio.to_thread(save_session_meta, meta, self.session_meta_path)
+
+    async def _goto(self, url: str, page=None, **kwargs):
+        """
+        페이지 이동 후, 검증을 미뤄둔 세션이 만료되어 로그인 페이지로 튕겼다면
+        다시 로그인한 뒤 원래 페이지로 한 번 더 이동합니다.
+        다시 로그인하지 못하면 로그인 페이지에서 작업을 이어가지 않도록 RuntimeError 를 발생시킵니다.
+        """
+        page = page or self.page
+        if not self._session_unverified:
+            await page.goto(url, **kwargs)
+            return
+        # 여러 페이지가 동시에 이동하더라도 세션 검증/재로그인은 한 번만 수행
+        async with self._verify_lock:
+            await page.goto(url, **kwargs)
+            if not self._session_unverified:
+                return
+            if "/login" in page.url:
+                print("저장된 세션이 만료되어 다시 로그인합니다...")
+                self._session_unverified = False
+                clear_session_meta(self.session_meta_path)
+                if not await self._login_with_credentials():
+                    raise RuntimeError("저장된 세션이 만료되었고 다시 로그인하지 못했습니다.")
+                await page.goto(url, **kwargs)
+            else:
+                await self._mark_session_verified()
+
+    async def login(self, lazy: bool = True) -> bool:
+        """
+        동행복권 사이트에 로그인합니다. (세션이 있으면 생략)
+        lazy=True 이고 SESSION_TTL 내에 검증된 세션이라면 확인 페이지 이동을 생략하고
+        첫 실제 페이지 이동(_goto) 시점에 세션을 검증합니다.
+        """
         print("로그인 상태 확인 및 진행...")
-        if self.is_logged_in():
+        if (
+            lazy
+            and self._loaded_state_fingerprint is not None
+            and is_session_fresh(load_session_meta(self.session_meta_path), SESSION_TTL)
+        ):
+            print("최근 검증된 세션 사용 (로그인 확인 생략)")
+            self._session_unverified = True
+            return True
+
+        if await self.is_logged_in():
             print("기존 세션으로 로그인 성공!")
+            await self._mark_session_verified()
             return True
-            
-        self.page.goto(URL_LOGIN)
+
+        return await self._login_with_credentials()
+
+    async def _login_with_credentials(self) -> bool:
+        """아이디/비밀번호로 로그인 폼을 제출합니다."""
+        await self.page.goto(URL_LOGIN)
         
         try:
             # Mobile Login Selectors
-            self.page.wait_for_selector("#inpUserId", state="visible", timeout=5000)
-            self.page.fill("#inpUserId", self.user_id)
-            self.page.fill("#inpUserPswdEncn", self.user_pw)
-            self.page.click("#btnLogin") # 또는 Enter
+            await self.page.wait_for_selector("#inpUserId", state="visible", timeout=5000)
+            await self.page.fill("#inpUserId", self.user_id)
+            await self.page.fill("#inpUserPswdEncn", self.user_pw)
+            await self.page.click("#btnLogin") # 또는 Enter
             
             # 로그인 완료 대기 (마이페이지 또는 메인으로 이동)
-            self.page.wait_for_url("**/mypage/**", timeout=10000)
+            await self.page.wait_for_url("**/mypage/**", timeout=10000)
             print("새 계정 정보로 로그인 성공!")
+            await self._mark_session_verified()
             return True
         except Exception as e:
             print(f"로그인 실패! 에러: {e}")
             # 한번 더 체크
-            if self.is_logged_in():
+            if await self.is_logged_in():
                  print("...하지만 로그인 확인됨.")
+                 await self._mark_session_verified()
                  return True
+            clear_session_meta(self.session_meta_path)
             return False
 
-    def get_balance(self) -> str:
+    async def get_balance(self, page=None) -> str:
         """현재 예치금 잔액을 조회합니다."""
         print("예치금 잔액 조회 중...")
-        self.page.goto(URL_BALANCE_CHECK)
+        page = page or self.page
+        await self._goto(URL_BALANCE_CHECK, page=page)
         try:
             # Mobile Selectors for Balance
             # .pntDpstAmt or #navTotalAmt
-            el = self.page.locator(".pntDpstAmt, #navTotalAmt").first
-            el.wait_for(state="visible", timeout=5000)
-            return el.inner_text().strip()
+            el = page.locator(".pntDpstAmt, #navTotalAmt").first
+            await el.wait_for(state="visible", timeout=5000)
+            return (await el.inner_text()).strip()
         except Exception as e:
             print(f"잔액 조회 실패: {e}")
             return "조회 불가"
 
-    def buy_auto(self, amount: int = 1) -> bool:
-        """지정된 개수(amount)만큼 자동으로 로또를 구매하고 DB에 기록합니다."""
+    async def buy_auto(self, amount: int = 1, notify: str = None) -> bool:
+        """
+        지정된 개수(amount)만큼 자동으로 로또를 구매하고 DB에 기록합니다.
+        notify 를 주면 구매 내역과 같은 트랜잭션에서 알림을 편지함에 넣습니다.
+        """
         print(f"로또 자동 {amount}게임 구매 시도 중...")
         if amount < 1 or amount > 5:
             print("한 번에 1~5게임만 구매 가능합니다.")
             return False
             
-        GAME_URL = "https://ol.dhlottery.co.kr/olotto/game_mobile/game645.do"
-        self.page.goto(GAME_URL, wait_until="domcontentloaded")
-        time.sleep(1)
+        await self._goto(URL_BUY_LOTTO, wait_until="domcontentloaded")
+        await asyncio.sleep(1)
         
         # '자동 1매 추가' 버튼
         auto_btn = self.page.locator("button:has-text('자동 1매 추가')")
         for i in range(amount):
-            if auto_btn.is_visible(timeout=3000):
-                auto_btn.click()
-                time.sleep(0.5)
+            if await auto_btn.is_visible(timeout=3000):
+                await auto_btn.click()
+                await asyncio.sleep(0.5)
             else:
                 print(f"자동 추가 버튼을 찾을 수 없습니다 ({i+1}번째)")
                 return False
 
         # 구매하기 버튼 클릭
         buy_btn = self.page.locator("#btnBuy, button:has-text('구매하기')").first
-        if buy_btn.is_visible(timeout=5000):
-            buy_btn.click()
+        if await buy_btn.is_visible(timeout=5000):
+            await buy_btn.click()
         else:
             print("구매하기 버튼을 찾을 수 없습니다.")
             return False
@@ -172,8 +431,8 @@ class LottoScraper:
         # 구매 확인 팝업 승인
         confirm_btn = self.page.locator("#popupLayerConfirm .buttonOk, #popupLayerConfirm button:has-text('확인')").first
         try:
-            confirm_btn.wait_for(state="visible", timeout=5000)
-            confirm_btn.click()
+            await confirm_btn.wait_for(state="visible", timeout=5000)
+            await confirm_btn.click()
             print("구매 최종 승인 버튼 클릭됨.")
         except Exception as e:
             print(f"구매 승인 팝업 클릭 실패: {e}")
@@ -181,36 +440,23 @@ class LottoScraper:
 
         # 결과 확인
         try:
-            self.page.wait_for_selector("#report:visible, #popupLayerAlert:visible, #popupLayerConfirm:visible", timeout=15000)
+            await self.page.wait_for_selector("#report:visible, #popupLayerAlert:visible, #popupLayerConfirm:visible", timeout=15000)
             
-            if self.page.locator("#report").is_visible():
+            if await self.page.locator("#report").is_visible():
                 print("구매 성공 영수증 확인 완료!")
-                round_no, groups = self._extract_numbers_from_report()
-                now = datetime.now()
-                # 추출된 번호가 있으면 우선 저장, 부족하면 확인필요로 채움
-                for i in range(amount):
-                    if i < len(groups):
-                        nums = ",".join(map(str, sorted(groups[i])))
-                    else:
-                        nums = "확인필요"
-                    insert_purchase(round_number=round_no or 0, purchase_date=now, mode="자동", numbers=nums, cost=1000)
+                round_no, groups = await self._extract_numbers_from_report()
+                self._record_auto_purchase(amount, round_no, groups, notify)
                 return True
             
             # 알럿 텍스트 체크 (잔액 부족 등)
             alert_text = ""
-            if self.page.locator("#popupLayerAlert").is_visible():
-                alert_text = self.page.locator("#popupLayerAlert").inner_text()
+            if await self.page.locator("#popupLayerAlert").is_visible():
+                alert_text = await self.page.locator("#popupLayerAlert").inner_text()
             
             if "구매가 완료되었습니다" in alert_text or "구매를 완료하였습니다" in alert_text:
                 print("알림창을 통한 구매 성공 확인 완료!")
-                round_no, groups = self._extract_numbers_from_report()
-                now = datetime.now()
-                for i in range(amount):
-                    if i < len(groups):
-                        nums = ",".join(map(str, sorted(groups[i])))
-                    else:
-                        nums = "확인필요"
-                    insert_purchase(round_number=round_no or 0, purchase_date=now, mode="자동", numbers=nums, cost=1000)
+                round_no, groups = await self._extract_numbers_from_report()
+                self._record_auto_purchase(amount, round_no, groups, notify)
                 return True
                 
             print(f"구매 실패 알림: {alert_text}")
@@ -220,55 +466,66 @@ class LottoScraper:
             print(f"결과 확인 중 오류: {e}")
             return False
 
-    def buy_manual(self, numbers: list[int]) -> bool:
-        """사용자가 지정한 6개의 번호로 수동 로또를 1게임 구매합니다."""
+    def _record_auto_purchase(self, amount: int, round_no: int | None, groups: list[list[int]], notify: str = None):
+        """자동 구매 내역을 하나의 트랜잭션으로 저장합니다. 추출된 번호가 있으면 우선 저장, 부족하면 확인필요로 채움"""
+        now = datetime.now()
+        rows = [
+            (round_no or next_draw_round(now), now, "자동", ",".join(map(str, sorted(groups[i]))) if i < len(groups) else "확인필요", 1000)
+            for i in range(amount)
+        ]
+        insert_purchases(rows, account_id=self.account_id, notify=notify)
+
+    async def buy_manual(self, numbers: list[int], notify: str = None) -> bool:
+        """
+        사용자가 지정한 6개의 번호로 수동 로또를 1게임 구매합니다.
+        notify 를 주면 구매 내역과 같은 트랜잭션에서 알림을 편지함에 넣습니다.
+        """
         print(f"수동 번호 {numbers} 구매 시작...")
         if len(numbers) != 6:
             print("수동 번호는 정확히 6개여야 합니다.")
             return False
             
-        GAME_URL = "https://ol.dhlottery.co.kr/olotto/game_mobile/game645.do"
-        self.page.goto(GAME_URL, wait_until="domcontentloaded")
-        time.sleep(1)
+        await self._goto(URL_BUY_LOTTO, wait_until="domcontentloaded")
+        await asyncio.sleep(1)
         
         # '번호 선택하기' 열기
         open_btn = self.page.locator("button:has-text('번호 선택하기')").first
-        if open_btn.is_visible(timeout=3000):
-            open_btn.click()
-            time.sleep(1)
+        if await open_btn.is_visible(timeout=3000):
+            await open_btn.click()
+            await asyncio.sleep(1)
         else:
             print("'번호 선택하기' 팝업 버튼을 찾을 수 없습니다.")
             return False
             
         # 초기화 버튼 클릭 (안전장치)
         reset_btn = self.page.locator("#btnInit, button:has-text('초기화')").first
-        if reset_btn.is_visible(timeout=2000):
-            reset_btn.click()
-            time.sleep(0.5)
+        if await reset_btn.is_visible(timeout=2000):
+            await reset_btn.click()
+            await asyncio.sleep(0.5)
 
         # 각 번호 클릭
         for num in numbers:
             num_el = self.page.locator(f"xpath=//div[contains(@class, 'lt-num') and text()='{num}']").first
-            if num_el.is_visible(timeout=2000):
-                num_el.click()
-                time.sleep(0.1)
+            if await num_el.is_visible(timeout=2000):
+                await num_el.click()
+                await asyncio.sleep(0.1)
             else:
                 print(f"번호 {num}을(를) 찾을 수 없습니다.")
                 return False
 
         # 선택완료 클릭
         select_done = self.page.locator("#btnSelectNum, button:has-text('선택완료')").first
-        if select_done.is_visible(timeout=2000):
-            select_done.click()
-            time.sleep(1)
+        if await select_done.is_visible(timeout=2000):
+            await select_done.click()
+            await asyncio.sleep(1)
         else:
             print("선택완료 버튼을 찾을 수 없습니다.")
             return False
             
         # 기존 로직: 구매하기 버튼 클릭
         buy_btn = self.page.locator("#btnBuy, button:has-text('구매하기')").first
-        if buy_btn.is_visible(timeout=5000):
-            buy_btn.click()
+        if await buy_btn.is_visible(timeout=5000):
+            await buy_btn.click()
         else:
             print("구매하기 버튼을 찾을 수 없습니다.")
             return False
@@ -276,8 +533,8 @@ class LottoScraper:
         # 구매 확인 팝업 승인
         confirm_btn = self.page.locator("#popupLayerConfirm .buttonOk, #popupLayerConfirm button:has-text('확인')").first
         try:
-            confirm_btn.wait_for(state="visible", timeout=5000)
-            confirm_btn.click()
+            await confirm_btn.wait_for(state="visible", timeout=5000)
+            await confirm_btn.click()
             print("구매 최종 승인 버튼 클릭됨.")
         except Exception as e:
             print(f"구매 승인 팝업 클릭 실패: {e}")
@@ -285,22 +542,21 @@ class LottoScraper:
 
         # 결과 확인
         try:
-            self.page.wait_for_selector("#report:visible, #popupLayerAlert:visible, #popupLayerConfirm:visible", timeout=15000)
+            await self.page.wait_for_selector("#report:visible, #popupLayerAlert:visible, #popupLayerConfirm:visible", timeout=15000)
             
-            if self.page.locator("#report").is_visible():
+            if await self.page.locator("#report").is_visible():
                 print("수동 구매 성공 영수증 확인 완료!")
-                mock_round = 0 
-                insert_purchase(round_number=mock_round, purchase_date=datetime.now(), mode="수동", numbers=",".join(map(str, sorted(numbers))), cost=1000)
+                round_no, _ = await self._extract_numbers_from_report()
+                insert_purchase(round_number=round_no or next_draw_round(), purchase_date=datetime.now(), mode="수동", numbers=",".join(map(str, sorted(numbers))), cost=1000, account_id=self.account_id, notify=notify)
                 return True
             
             alert_text = ""
-            if self.page.locator("#popupLayerAlert").is_visible():
-                alert_text = self.page.locator("#popupLayerAlert").inner_text()
+            if await self.page.locator("#popupLayerAlert").is_visible():
+                alert_text = await self.page.locator("#popupLayerAlert").inner_text()
             
             if "완료" in alert_text:
                 print("알림창을 통한 수동 구매 성공 확인 완료!")
-                mock_round = 0 
-                insert_purchase(round_number=mock_round, purchase_date=datetime.now(), mode="수동", numbers=",".join(map(str, sorted(numbers))), cost=1000)
+                insert_purchase(round_number=next_draw_round(), purchase_date=datetime.now(), mode="수동", numbers=",".join(map(str, sorted(numbers))), cost=1000, account_id=self.account_id, notify=notify)
                 return True
                 
             print(f"구매 실패 알림: {alert_text}")
@@ -310,20 +566,21 @@ class LottoScraper:
             print(f"결과 확인 중 오류: {e}")
             return False
 
-    def buy_720(self) -> bool:
-        """연금복권 720+를 자동으로 구매합니다. (모든 조 1세트 = 5,000원)"""
+    async def buy_720(self, notify: str = None) -> bool:
+        """
+        연금복권 720+를 자동으로 구매합니다. (모든 조 1세트 = 5,000원)
+        notify 를 주면 구매 내역과 같은 트랜잭션에서 알림을 편지함에 넣습니다.
+        """
         print("연금복권 720+ (모든 조, 자동) 1세트 구매 시도 중...")
-        GAME_URL = "https://el.dhlottery.co.kr/game_mobile/pension720/game.jsp"
-        
-        self.page.goto(GAME_URL, wait_until="domcontentloaded")
-        time.sleep(1)
+        await self._goto(URL_BUY_720, wait_until="domcontentloaded")
+        await asyncio.sleep(1)
         
         # 1. 번호 선택하기 진입
         try:
             select_btn = self.page.locator("a.btn_gray_st1.large.full, a:has-text('번호 선택하기')").first
-            select_btn.wait_for(state="visible", timeout=10000)
-            select_btn.click()
-            time.sleep(1)
+            await select_btn.wait_for(state="visible", timeout=10000)
+            await select_btn.click()
+            await asyncio.sleep(1)
         except Exception as e:
             print(f"'번호 선택하기' 버튼 진입 실패: {e}")
             return False
@@ -331,23 +588,23 @@ class LottoScraper:
         # 2. '모든조' 선택 및 '자동번호' 클릭
         try:
             all_jo = self.page.locator("li:has-text('모든조'), span.group.all").first
-            if all_jo.is_visible(timeout=3000):
-                all_jo.click()
-                time.sleep(0.5)
+            if await all_jo.is_visible(timeout=3000):
+                await all_jo.click()
+                await asyncio.sleep(0.5)
                 
-            self.page.locator("a.btn_wht.xsmall:has-text('자동번호'), a:has-text('자동번호')").first.click()
-            self.page.wait_for_selector("text=통신중입니다", state="hidden", timeout=5000)
-            time.sleep(0.5)
+            await self.page.locator("a.btn_wht.xsmall:has-text('자동번호'), a:has-text('자동번호')").first.click()
+            await self.page.wait_for_selector("text=통신중입니다", state="hidden", timeout=5000)
+            await asyncio.sleep(0.5)
         except Exception as e:
             print(f"자동번호 생성 오류: {e}")
             return False
             
         # 3. 선택완료 및 구매하기
         try:
-            self.page.locator("a.btn_blue.full.large:has-text('선택완료'), a:has-text('선택완료')").first.click()
-            time.sleep(1)
+            await self.page.locator("a.btn_blue.full.large:has-text('선택완료'), a:has-text('선택완료')").first.click()
+            await asyncio.sleep(1)
             
-            self.page.locator("a.btn_blue.large.full:has-text('구매하기'), a:has-text('구매하기')").first.click()
+            await self.page.locator("a.btn_blue.large.full:has-text('구매하기'), a:has-text('구매하기')").first.click()
         except Exception as e:
             print(f"구매하기 버튼 클릭 오류: {e}")
             return False
@@ -355,24 +612,21 @@ class LottoScraper:
         # 4. 결과 확인
         try:
             final_confirm = self.page.locator("a.btn_lgray.medium:has-text('확인'), a.btn_blue:has-text('확인'), a:has-text('확인')").first
-            if final_confirm.is_visible(timeout=10000):
-                final_confirm.click()
+            if await final_confirm.is_visible(timeout=10000):
+                # 결과 레이어를 닫기 전에 회차와 조별 번호를 읽어 둠
+                round_no, tickets = await self._extract_pension_tickets()
+                await final_confirm.click()
                 print("연금복권 720+ 구매 성공 (UI 확인 완료)!")
-                
-                # 가상의 회차 및 내역을 DB에 저장
-                mock_round = 0 
-                now = datetime.now()
-                insert_purchase(round_number=mock_round, purchase_date=now, mode="연금자동", numbers="확인필요", cost=5000)
+                self._record_pension_purchase(round_no, tickets, notify)
                 return True
             else:
                 # 팝업 알럿 확인
                 alert_text = ""
-                if self.page.locator("#popupLayerAlert").is_visible():
-                    alert_text = self.page.locator("#popupLayerAlert").inner_text()
+                if await self.page.locator("#popupLayerAlert").is_visible():
+                    alert_text = await self.page.locator("#popupLayerAlert").inner_text()
                     if "완료" in alert_text:
                         print("연금복권 720+ 구매 성공 (알림창 확인)!")
-                        mock_round = 0 
-                        insert_purchase(round_number=mock_round, purchase_date=datetime.now(), mode="연금자동", numbers="확인필요", cost=5000)
+                        self._record_pension_purchase(*await self._extract_pension_tickets(), notify=notify)
                         return True
                     print(f"구매 실패 알림: {alert_text}")
                 return False
@@ -380,11 +634,15 @@ class LottoScraper:
              print(f"결과 확인 타임아웃 오류: {e}")
              return False
 
-    def update_buy_list(self) -> list:
-        """당첨 내역을 조회해서 결과를 파싱하여 반환합니다"""
+    async def update_buy_list(self, page=None, game: str = "로또6/45") -> list | None:
+        """
+        당첨 내역을 조회해서 결과를 파싱하여 반환합니다 (game: "로또6/45" 또는 "연금복권720+")
+        내역이 없으면 빈 리스트, 조회에 실패하면 None
+        """
         print("당첨 내역 조회 중...")
+        page = page or self.page
         # 마이페이지 복권 내역 프레임 접근
-        self.page.goto("https://www.dhlottery.co.kr/mypage/mylotteryledger")
+        await self._goto(URL_LEDGER_PAGE, page=page)
         
         # Playwright의 request를 이용하여 브라우저 쿠키가 실린 채로 API 호출
         end_dt = datetime.now()
@@ -402,26 +660,26 @@ class LottoScraper:
         headers = {
             "Accept": "application/json, text/javascript, */*; q=0.01",
             "X-Requested-With": "XMLHttpRequest",
-            "Referer": "https://www.dhlottery.co.kr/mypage/mylotteryledger",
+            "Referer": URL_LEDGER_PAGE,
         }
         
-        resp = self.page.request.get(
-            "https://www.dhlottery.co.kr/mypage/selectMyLotteryledger.do", 
+        resp = await page.request.get(
+            URL_BUY_LIST, 
             params=params, 
             headers=headers
         )
         
         if not resp.ok:
             print("API 응답 오류:", resp.status)
-            return []
+            return None
             
-        data = resp.json()
+        data = await resp.json()
         items = data.get("data", {}).get("list", [])
         
         results = []
         for item in items:
             lottery_name = item.get("ltGdsNm", "")
-            if lottery_name == "로또6/45":
+            if lottery_name == game:
                 round_no = item.get("ltEpsdView", "") # 회차
                 win_result = item.get("ltWnResult", "") # 당첨결과 (미추첨, 낙첨, 당첨)
                 win_amt = item.get("ltWnAmt", 0) or 0
@@ -431,3 +689,219 @@ class LottoScraper:
                     "win_amount": int(win_amt)
                 })
         return results
+
+    async def get_official_winning_numbers(self, round_no: int) -> dict | None:
+        """공식 API에서 특정 회차의 당첨 번호 6개와 보너스 번호를 조회합니다."""
+        try:
+            resp = await self.context.request.get(
+                URL_LOTTO_NUMBER,
+                params={"method": "getLottoNumber", "drwNo": str(round_no)},
+                headers={"Accept": "application/json, text/javascript, */*; q=0.01"},
+            )
+            if not resp.ok:
+                return None
+            # 대기열(WAF)이 걸리면 JSON 대신 HTML 페이지가 내려옴
+            data = await resp.json()
+        except Exception as e:
+            print(f"[{round_no}회차] 당첨 번호 조회 실패: {e}")
+            return None
+
+        if data.get("returnValue") != "success":
+            return None
+        prizes = {}
+        if data.get("firstWinamnt"):
+            prizes["1등"] = {"amount": int(data["firstWinamnt"]), "winners": int(data.get("firstPrzwnerCo") or 0)}
+        return {
+            "round_number": round_no,
+            "draw_date": data.get("drwNoDate"),
+            "winning_numbers": [int(data[f"drwtNo{i}"]) for i in range(1, 7)],
+            "bonus_number": int(data["bnusNo"]),
+            "is_drawn": True,
+            "prizes": prizes,
+        }
+
+    async def get_prize_breakdown(self, round_no: int) -> dict[str, dict]:
+        """
+        회차별 1~5등 1게임당 실제 당첨금을 조회합니다.
+        페이지를 읽지 못하면 빈 dict 를 반환합니다. (호출 측에서 공식 API 의 1등 금액/고정 금액으로 보완)
+        """
+        try:
+            resp = await self.context.request.get(
+                URL_WIN_RESULT,
+                params={"method": "byWin", "drwNo": str(round_no)},
+            )
+            if not resp.ok:
+                return {}
+            return parse_prize_table(await resp.text())
+        except Exception as e:
+            print(f"[{round_no}회차] 등위별 당첨금 조회 실패: {e}")
+            return {}
+
+    async def get_official_winning_numbers_bulk(
+        self,
+        round_numbers: list[int],
+        concurrency: int = ROUND_FETCH_CONCURRENCY,
+        min_interval: float = ROUND_FETCH_INTERVAL,
+        with_prizes: bool = True,
+    ) -> dict[int, dict]:
+        """
+        여러 회차의 당첨 번호를 동시에 조회합니다.
+        with_prizes 면 등위별 당첨금 페이지도 함께 읽어 결과의 "prizes" 를 1~5등으로 채웁니다.
+        동시 요청은 concurrency 개로 제한하고, 요청 시작 간격은 min_interval 초 이상 벌려
+        대기열(WAF)을 자극하지 않도록 합니다. (_paced_gather 참고)
+        반환: {회차: get_official_winning_numbers 결과} (조회 실패 회차는 제외)
+        """
+        async def fetch(round_no: int):
+            data = await self.get_official_winning_numbers(round_no)
+            if data and with_prizes:
+                data["prizes"] = {**FIXED_PRIZES_DETAIL, **data["prizes"], **await self.get_prize_breakdown(round_no)}
+            return data
+
+        return await _paced_gather(fetch, round_numbers, concurrency, min_interval)
+
+    async def get_pension_result(self, round_no: int) -> dict | None:
+        """연금복권720+ 특정 회차의 1등 조/번호와 보너스 번호를 조회합니다. (추첨 전이거나 실패하면 None)"""
+        try:
+            resp = await self.context.request.get(URL_WIN_RESULT, params={"method": "win720", "Round": str(round_no)})
+            if not resp.ok:
+                return None
+            result = parse_pension_result(await resp.text())
+        except Exception as e:
+            print(f"[연금 {round_no}회차] 당첨 결과 조회 실패: {e}")
+            return None
+        return result if result and result["round_number"] == round_no else None
+
+    async def get_pension_results_bulk(
+        self,
+        round_numbers: list[int],
+        concurrency: int = ROUND_FETCH_CONCURRENCY,
+        min_interval: float = ROUND_FETCH_INTERVAL,
+    ) -> dict[int, dict]:
+        """여러 회차의 연금복권720+ 당첨 결과를 동시에 조회합니다. 반환: {회차: get_pension_result 결과}"""
+        return await _paced_gather(self.get_pension_result, round_numbers, concurrency, min_interval)
+
+    async def get_ticket_details(self, round_no: int) -> list[dict] | None:
+        """
+        구매 내역 상세 API 에서 한 회차에 구매한 로또6/45 게임 번호를 한 번의 요청으로 모두 조회합니다.
+        반환: [{"order_no", "mode" (자동/수동/반자동), "numbers" [6개]}, ...] (조회 실패 시 None)
+        """
+        try:
+            resp = await self.context.request.get(
+                URL_BUY_DETAIL,
+                params={"ltEpsd": str(round_no), "ltGdsCd": "LO40"},
+                headers={
+                    "Accept": "application/json, text/javascript, */*; q=0.01",
+                    "X-Requested-With": "XMLHttpRequest",
+                    "Referer": URL_LEDGER_PAGE,
+                },
+            )
+            if not resp.ok:
+                return None
+            data = await resp.json()
+        except Exception as e:
+            print(f"[{round_no}회차] 구매 상세 내역 조회 실패: {e}")
+            return None
+
+        return parse_ticket_details(data)
+
+    async def get_ticket_details_bulk(
+        self,
+        round_numbers: list[int],
+        concurrency: int = ROUND_FETCH_CONCURRENCY,
+        min_interval: float = ROUND_FETCH_INTERVAL,
+    ) -> dict[int, list[dict]]:
+        """
+        여러 회차의 구매 상세 내역을 회차당 한 번씩 동시에 조회합니다. (요청 간격 제한은 당첨 번호 일괄 조회와 동일)
+        반환: {회차: get_ticket_details 결과} (조회 실패 회차는 제외)
+        """
+        return await _paced_gather(self.get_ticket_details, round_numbers, concurrency, min_interval)
+
+    async def get_balance_and_ledger(self) -> tuple[str, list | None]:
+        """잔액 조회와 당첨 내역 조회를 같은 컨텍스트의 두 페이지에서 동시에 수행합니다."""
+        ledger_page = await self.context.new_page()
+        ledger_page.on("dialog", _accept_dialog)
+        try:
+            balance, ledger = await asyncio.gather(self.get_balance(), self.update_buy_list(page=ledger_page))
+        finally:
+            await ledger_page.close()
+        return balance, ledger
+
+    async def charge_deposit(self, amount: int = 10000, pin: str = None) -> bool:
+        """간편충전으로 예치금을 충전합니다. (src.charge 참고)"""
+        from src.charge import charge_deposit
+        return await charge_deposit(self.page, amount, pin=pin)
+
+
+class LottoScraper:
+    """
+    기존 동기 호출부를 위한 파사드입니다.
+    실제 작업은 공용 이벤트 루프 스레드에서 AsyncLottoScraper 가 수행하므로,
+    여러 스레드에서 각자 LottoScraper 를 써도 한 프로세스의 Chromium 하나를 함께 쓸 수 있습니다.
+    """
+    def __init__(self, user_id: str, user_pw: str, headless: bool = True, account_id: str = "default", browser=None):
+        self.engine = AsyncLottoScraper(user_id, user_pw, headless=headless, account_id=account_id, browser=browser)
+
+    @property
+    def user_id(self) -> str:
+        return self.engine.user_id
+
+    @property
+    def account_id(self) -> str:
+        return self.engine.account_id
+
+    @property
+    def page(self) -> Page:
+        return self.engine.page
+
+    @property
+    def context(self) -> BrowserContext:
+        return self.engine.context
+
+    def __enter__(self):
+        run_sync(self.engine.__aenter__())
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        run_sync(self.engine.__aexit__(exc_type, exc_val, exc_tb))
+
+    def is_logged_in(self) -> bool:
+        return run_sync(self.engine.is_logged_in())
+
+    def login(self, lazy: bool = True) -> bool:
+        return run_sync(self.engine.login(lazy=lazy))
+
+    def get_balance(self) -> str:
+        return run_sync(self.engine.get_balance())
+
+    def buy_auto(self, amount: int = 1, notify: str = None) -> bool:
+        return run_sync(self.engine.buy_auto(amount, notify=notify))
+
+    def buy_manual(self, numbers: list[int], notify: str = None) -> bool:
+        return run_sync(self.engine.buy_manual(numbers, notify=notify))
+
+    def buy_720(self, notify: str = None) -> bool:
+        return run_sync(self.engine.buy_720(notify=notify))
+
+    def update_buy_list(self, game: str = "로또6/45") -> list | None:
+        return run_sync(self.engine.update_buy_list(game=game))
+
+    def get_official_winning_numbers(self, round_no: int) -> dict | None:
+        return run_sync(self.engine.get_official_winning_numbers(round_no))
+
+    def get_official_winning_numbers_bulk(self, round_numbers: list[int], **kwargs) -> dict[int, dict]:
+        return run_sync(self.engine.get_official_winning_numbers_bulk(round_numbers, **kwargs))
+
+    def get_prize_breakdown(self, round_no: int) -> dict[str, dict]:
+        return run_sync(self.engine.get_prize_breakdown(round_no))
+
+    def get_pension_results_bulk(self, round_numbers: list[int], **kwargs) -> dict[int, dict]:
+        return run_sync(self.engine.get_pension_results_bulk(round_numbers, **kwargs))
+
+    def get_ticket_details_bulk(self, round_numbers: list[int], **kwargs) -> dict[int, list[dict]]:
+        return run_sync(self.engine.get_ticket_details_bulk(round_numbers, **kwargs))
+
+    def get_balance_and_ledger(self) -> tuple[str, list]:
+        return run_sync(self.engine.get_balance_and_ledger())
+
+    def charge_deposit(self, amount: int = 10000, pin: str = None) -> bool:
+        return run_sync(self.engine.charge_deposit(amount, pin=pin))
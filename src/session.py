@@ -0,0 +1,154 @@
+import os
+import re
+import json
+import time
+import hashlib
+import tempfile
+from contextlib import contextmanager
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+
+# 단일 계정 시절의 세션 파일 (계정별 파일이 없을 때 초기 상태로만 읽어옵니다)
+SESSION_PATH = os.path.join(BASE_DIR, 'session.json')
+SESSION_META_PATH = os.path.join(BASE_DIR, 'session_meta.json')
+
+# 계정별 세션 파일 디렉터리: sessions/<계정>.json, sessions/<계정>.meta.json
+SESSION_DIR = os.path.join(BASE_DIR, 'sessions')
+
+def session_paths(user_id: str | None) -> tuple[str, str]:
+    """계정별 세션 파일 경로와 메타데이터 파일 경로를 반환합니다."""
+    if not user_id:
+        return SESSION_PATH, SESSION_META_PATH
+    safe_id = re.sub(r"[^A-Za-z0-9_.-]", "_", user_id)
+    return (
+        os.path.join(SESSION_DIR, f"{safe_id}.json"),
+        os.path.join(SESSION_DIR, f"{safe_id}.meta.json"),
+    )
+
+@contextmanager
+def file_lock(path: str):
+    """
+    `<path>.lock` 파일에 프로세스 간 배타 잠금을 겁니다.
+    계정마다 파일이 다르므로 다른 계정의 실행은 서로 막지 않습니다.
+    """
+    lock_path = path + ".lock"
+    os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+    with open(lock_path, "a+") as f:
+        if os.name == "nt":
+            import msvcrt
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.05)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+def atomic_write_json(path: str, data):
+    """임시 파일에 먼저 쓴 뒤 rename 하여, 읽는 쪽이 반쯤 쓰인 파일을 보지 않게 합니다."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def _load_json(path: str):
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def state_fingerprint(state: dict | None) -> str | None:
+    if state is None:
+        return None
+    return hashlib.sha256(json.dumps(state, sort_keys=True).encode("utf-8")).hexdigest()
+
+def load_storage_state(path: str) -> dict | None:
+    """
+    계정별 세션(storage_state)을 읽습니다.
+    아직 계정별 파일이 없다면 기존 공용 session.json을 초기 상태로 사용합니다.
+    """
+    state = _load_json(path)
+    if state is None and path != SESSION_PATH:
+        state = _load_json(SESSION_PATH)
+    return state
+
+def persist_storage_state(path: str, state: dict, loaded_fingerprint: str | None) -> bool:
+    """
+    세션 내용이 바뀐 경우에만 잠금을 잡고 원자적으로 저장합니다.
+    반환: 실제로 파일을 썼는지 여부
+    """
+    fingerprint = state_fingerprint(state)
+    if fingerprint == loaded_fingerprint and os.path.exists(path):
+        return False
+    with file_lock(path):
+        # 잠금 대기 중 다른 프로세스가 같은 내용을 이미 저장했을 수 있음
+        if state_fingerprint(_load_json(path)) == fingerprint:
+            return False
+        atomic_write_json(path, state)
+    return True
+
+def load_session_meta(path: str = SESSION_META_PATH) -> dict:
+    """세션 검증 메타데이터(마지막 검증 시각, 쿠키 만료 시각)를 읽어옵니다."""
+    meta = _load_json(path)
+    return meta if isinstance(meta, dict) else {}
+
+def save_session_meta(meta: dict, path: str = SESSION_META_PATH):
+    with file_lock(path):
+        atomic_write_json(path, meta)
+
+def clear_session_meta(path: str = SESSION_META_PATH):
+    if os.path.exists(path):
+        os.remove(path)
+
+def cookie_expiry(cookies: list[dict]) -> float | None:
+    """
+    동행복권 도메인 쿠키 중 가장 빨리 만료되는 시각(epoch)을 반환합니다.
+    브라우저 세션 쿠키(expires=-1)는 서버 세션 만료에 맡기므로 제외합니다.
+    """
+    expiries = [
+        c["expires"] for c in cookies
+        if "dhlottery" in c.get("domain", "") and c.get("expires", -1) > 0
+    ]
+    return min(expiries) if expiries else None
+
+def build_session_meta(cookies: list[dict], now: float = None) -> dict:
+    return {
+        "last_verified": now if now is not None else time.time(),
+        "cookie_expiry": cookie_expiry(cookies),
+    }
+
+def is_session_fresh(meta: dict, ttl: int, now: float = None) -> bool:
+    """마지막 검증 후 ttl(초)이 지나지 않았고 쿠키도 만료되지 않았다면 True"""
+    if ttl <= 0 or not meta.get("last_verified"):
+        return False
+    now = now if now is not None else time.time()
+    if now - meta["last_verified"] > ttl:
+        return False
+    expiry = meta.get("cookie_expiry")
+    if expiry is not None and expiry <= now:
+        return False
+    return True
@@ -0,0 +1,165 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src import scoring
+
+LOTTO_PRICE = 1000
+PENSION_SET_PRICE = 5000  # 연금복권 '모든조' 1세트 = 1~5조 5매 (buy720 과 동일)
+
+# 한 프로세스 작업(샤드)당 시뮬레이션할 최대 시행 수
+SHARD_TRIALS = 2000
+
+DEFAULT_STRATEGIES = [
+    "자동5:auto=5",
+    "고정수동5:manual=5",
+    "혼합(자동3+수동2):auto=3,manual=2",
+    "자동5+연금1:auto=5,pension=1",
+]
+
+def parse_strategy(text: str) -> dict:
+    """
+    "이름:auto=3,manual=2,pension=1" 형식의 전략을 읽습니다. (이름 생략 가능)
+    - auto: 매주 새로 뽑는 자동 게임 수
+    - manual: 고정 수동 번호. 개수(N, 시행마다 한 번 무작위로 정해 계속 사용) 또는
+              "1-2-3-4-5-6/7-8-9-10-11-12" 처럼 번호를 직접 지정
+    - pension: 매주 구매하는 연금복권720+ '모든조' 세트 수
+    """
+    name, _, spec = text.rpartition(":")
+    strategy = {"name": name or text, "auto": 0, "manual_count": 0, "manual": [], "pension": 0}
+    for item in filter(None, (s.strip() for s in spec.split(","))):
+        key, _, value = item.partition("=")
+        key = key.strip()
+        try:
+            if key == "auto":
+                strategy["auto"] = int(value)
+            elif key == "pension":
+                strategy["pension"] = int(value)
+            elif key == "manual" and "-" in value:
+                for line in value.split("/"):
+                    nums = scoring.parse_numbers(line.replace("-", ","))
+                    if nums is None:
+                        raise ValueError(line)
+                    strategy["manual"].append(sorted(nums))
+            elif key == "manual":
+                strategy["manual_count"] = int(value)
+            else:
+                raise ValueError(key)
+        except ValueError:
+            raise ValueError(f"전략 형식이 올바르지 않습니다: '{item}' (예: 혼합:auto=3,manual=2,pension=1)")
+    if strategy["auto"] < 0 or strategy["manual_count"] < 0 or strategy["pension"] < 0:
+        raise ValueError(f"게임 수는 0 이상이어야 합니다: {text}")
+    if not (strategy["auto"] or strategy["manual_count"] or strategy["manual"] or strategy["pension"]):
+        raise ValueError(f"구매할 게임이 없는 전략입니다: {text}")
+    return strategy
+
+def weekly_cost(strategy: dict) -> int:
+    lines = strategy["auto"] + strategy["manual_count"] + len(strategy["manual"])
+    return LOTTO_PRICE * lines + PENSION_SET_PRICE * strategy["pension"]
+
+def tickets_per_week(strategy: dict) -> int:
+    return strategy["auto"] + strategy["manual_count"] + len(strategy["manual"]) + 5 * strategy["pension"]
+
+def _random_combos(rng: np.random.Generator, n: int, k: int = 6) -> np.ndarray:
+    """1~45 중 서로 다른 k 개 번호 n 세트. 무작위 키의 작은 쪽 k 개 위치를 고르는 방식"""
+    return rng.random((n, 45), dtype=np.float32).argpartition(k - 1, axis=1)[:, :k] + 1
+
+def _simulate_shard(strategy: dict, trials: int, weeks: int, seed, prizes: np.ndarray = scoring.DEFAULT_PRIZES) -> dict:
+    """한 샤드(trials 개 시행 x weeks 주)를 시뮬레이션하고 시행별 결과를 반환합니다. prizes: 로또 등수 코드별 당첨금"""
+    rng = np.random.default_rng(seed)
+    auto, pension = strategy["auto"], strategy["pension"]
+
+    manual_masks = np.empty((trials, 0), dtype=np.uint64)
+    if strategy["manual"]:
+        fixed = scoring.to_masks(scoring.to_array(strategy["manual"]))
+        manual_masks = np.broadcast_to(fixed, (trials, len(fixed)))
+    if strategy["manual_count"]:
+        chosen = scoring.to_masks(_random_combos(rng, trials * strategy["manual_count"]))
+        manual_masks = np.concatenate([manual_masks, chosen.reshape(trials, -1)], axis=1)
+
+    weekly_win = np.zeros((trials, weeks), dtype=np.int64)
+    for w in range(weeks):
+        # 7개 중 가장 큰 키를 가진 번호를 보너스로 사용 (argpartition(6) 의 6번 위치)
+        draw = _random_combos(rng, trials, 7)
+        win_masks = scoring.to_masks(draw[:, :6])[:, None]
+        bonus_masks = np.left_shift(np.uint64(1), draw[:, 6].astype(np.uint64))[:, None]
+
+        ticket_masks = manual_masks
+        if auto:
+            auto_masks = scoring.to_masks(_random_combos(rng, trials * auto)).reshape(trials, auto)
+            ticket_masks = np.concatenate([manual_masks, auto_masks], axis=1)
+        if ticket_masks.shape[1]:
+            ranks = scoring.grade_masks(ticket_masks, win_masks, bonus_masks)
+            weekly_win[:, w] += prizes[ranks].sum(axis=1)
+
+        if pension:
+            # '모든조' 구매: 세트마다 같은 6자리 번호로 1~5조
+            numbers = rng.integers(0, 1000000, size=(trials, pension, 1))
+            groups = np.arange(1, 6)[None, None, :]
+            win_group = rng.integers(1, 6, size=(trials, 1, 1))
+            win_number = rng.integers(0, 1000000, size=(trials, 1, 1))
+            bonus_number = rng.integers(0, 1000000, size=(trials, 1, 1))
+            _, _, amounts = scoring.grade_pension(groups, numbers, win_group, win_number, bonus_number)
+            weekly_win[:, w] += amounts.reshape(trials, -1).sum(axis=1)
+
+    cost = weekly_cost(strategy)
+    cumulative = np.cumsum(weekly_win - cost, axis=1)
+    peak = np.maximum.accumulate(np.maximum(cumulative, 0), axis=1)
+    won = weekly_win > 0
+    return {
+        "total_win": weekly_win.sum(axis=1),
+        "max_drawdown": (peak - cumulative).max(axis=1),
+        # 첫 당첨 주차 (1부터), 기간 내 당첨이 없으면 0
+        "first_win_week": np.where(won.any(axis=1), won.argmax(axis=1) + 1, 0),
+    }
+
+def simulate(strategy: dict, trials: int = 10000, weeks: int = 520, seed: int = 0,
+             workers: int = None, shard_trials: int = SHARD_TRIALS, prizes: np.ndarray = None) -> dict:
+    """
+    전략 하나를 trials 번(각 weeks 주 동안) 시뮬레이션하여 ROI 분포, 최대 낙폭, 첫 당첨까지의 기간을 집계합니다.
+    같은 seed 와 shard_trials 이면 workers 수와 관계없이 같은 결과가 나옵니다.
+    prizes: 로또 등수 코드별 당첨금 (기본: 고정 기본 금액)
+    """
+    prizes = scoring.DEFAULT_PRIZES if prizes is None else prizes
+    shards = [min(shard_trials, trials - start) for start in range(0, trials, shard_trials)]
+    seeds = np.random.SeedSequence(seed).spawn(len(shards))
+    workers = workers or os.cpu_count() or 1
+
+    started = time.perf_counter()
+    if workers == 1 or len(shards) == 1:
+        parts = [_simulate_shard(strategy, n, weeks, s, prizes) for n, s in zip(shards, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(shards))) as pool:
+            parts = list(pool.map(_simulate_shard, [strategy] * len(shards), shards, [weeks] * len(shards), seeds,
+                                  [prizes] * len(shards)))
+    elapsed = time.perf_counter() - started
+
+    total_win = np.concatenate([p["total_win"] for p in parts])
+    max_drawdown = np.concatenate([p["max_drawdown"] for p in parts])
+    first_win = np.concatenate([p["first_win_week"] for p in parts])
+
+    total_cost = weekly_cost(strategy) * weeks
+    roi = (total_win - total_cost) / total_cost
+    hit = first_win[first_win > 0]
+    simulated_tickets = trials * weeks * tickets_per_week(strategy)
+    return {
+        "strategy": strategy["name"],
+        "trials": trials,
+        "weeks": weeks,
+        "weekly_cost": weekly_cost(strategy),
+        "total_cost": total_cost,
+        "mean_win": float(total_win.mean()),
+        "roi_mean": float(roi.mean()),
+        "roi_std": float(roi.std()),
+        "roi_percentiles": {f"p{q}": float(np.percentile(roi, q)) for q in (5, 25, 50, 75, 95, 99)},
+        "profit_probability": float((roi > 0).mean()),
+        "max_drawdown_mean": float(max_drawdown.mean()),
+        "max_drawdown_p95": float(np.percentile(max_drawdown, 95)),
+        "first_win_week_median": float(np.median(hit)) if len(hit) else None,
+        "never_won_ratio": float((first_win == 0).mean()),
+        "simulated_tickets": simulated_tickets,
+        "elapsed_s": elapsed,
+        "tickets_per_second": simulated_tickets / elapsed if elapsed else None,
+    }
@@ -0,0 +1,197 @@
+import itertools
+import time
+from functools import lru_cache
+
+import numpy as np
+
+from src import db
+
+# 휠(커버링 설계): 기본 번호 v 개 중 drawn 개가 당첨 번호로 나오면, 어떤 drawn 개가 나오든
+# 적어도 한 게임은 그중 match 개 이상을 맞히도록 하는 가능한 적은 수의 6개 번호 게임 모음.
+# 기본 번호는 0 ~ v-1 로 바꿔 비트마스크(번호 i 가 있으면 i 번째 비트)로 다루므로,
+# 같은 (v, drawn, match) 설계는 어떤 기본 번호에도 그대로 쓸 수 있어 DB 에 저장해 재사용합니다.
+MAX_BASE = 20
+TICKET_SIZE = 6
+
+# 후보 게임 x 커버 대상 칸 수 상한. 넘으면 후보 게임을 무작위로 줄여 메모리/시간을 제한합니다.
+POOL_CELLS = 25_000_000
+# 지역 탐색 반복 횟수와 시간 상한(초). STALL_ITERATIONS 번 연속으로 줄지 않으면 멈춥니다.
+SEARCH_ITERATIONS = 5000
+STALL_ITERATIONS = 1000
+SEARCH_SECONDS = 1.0
+
+_POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+@lru_cache(maxsize=1)
+def _popcount_table() -> np.ndarray:
+    """0 ~ 2^MAX_BASE - 1 의 켜진 비트 수"""
+    table = np.zeros(1 << MAX_BASE, dtype=np.uint8)
+    values = np.arange(1 << MAX_BASE, dtype=np.uint32)
+    for bit in range(MAX_BASE):
+        table += ((values >> bit) & 1).astype(np.uint8)
+    return table
+
+@lru_cache(maxsize=64)
+def subset_masks(v: int, k: int) -> np.ndarray:
+    """0 ~ v-1 중 k 개 묶음 전체를 비트마스크 배열로 반환합니다."""
+    return np.fromiter((sum(1 << i for i in c) for c in itertools.combinations(range(v), k)), dtype=np.uint32)
+
+def _coverage(tickets: np.ndarray, targets: np.ndarray, match: int) -> np.ndarray:
+    """게임별로 match 개 이상 겹치는 대상 묶음을 비트 단위로 묶은 (게임 수, ceil(대상 수/8)) 배열"""
+    popcount = _popcount_table()
+    rows = max(1, POOL_CELLS // 20 // max(len(targets), 1))
+    out = np.empty((len(tickets), (len(targets) + 7) // 8), dtype=np.uint8)
+    for start in range(0, len(tickets), rows):
+        hits = popcount[tickets[start:start + rows, None] & targets[None, :]] >= match
+        out[start:start + rows] = np.packbits(hits, axis=1)
+    return out
+
+def _column(cover: np.ndarray, target: int) -> np.ndarray:
+    """대상 묶음 하나를 덮는 후보 게임 여부 (후보 수,) bool"""
+    return (cover[:, target >> 3] >> (7 - (target & 7))) & 1 == 1
+
+def _covering_all(cover: np.ndarray, holes: np.ndarray) -> np.ndarray:
+    """대상 묶음(holes)을 모두 덮는 후보 게임 번호 배열. 첫 대상을 덮는 후보에서 시작해 좁혀 나갑니다."""
+    found = np.flatnonzero(_column(cover, holes[0]))
+    for target in holes[1:]:
+        if not len(found):
+            break
+        found = found[_column(cover[found], target)]
+    return found
+
+def _fallback_ticket(target: int, v: int) -> int:
+    """대상 묶음을 그대로 포함하도록 부족한 자리를 작은 번호로 채운 게임"""
+    ticket = int(target)
+    for i in range(v):
+        if bin(ticket).count("1") >= TICKET_SIZE:
+            break
+        ticket |= 1 << i
+    return ticket
+
+def search(v: int, drawn: int, match: int, seed: int = 0, iterations: int = SEARCH_ITERATIONS,
+           seconds: float = SEARCH_SECONDS, start: list[int] = None) -> list[int]:
+    """
+    탐욕법으로 설계를 만든 뒤 지역 탐색으로 게임 수를 줄입니다. start 를 주면 그 설계에서 줄이기 시작합니다.
+    반환: 게임 비트마스크 목록
+    """
+    rng = np.random.default_rng(seed)
+    targets = subset_masks(v, drawn)
+    pool = subset_masks(v, TICKET_SIZE)
+    if len(pool) * len(targets) > POOL_CELLS:
+        pool = np.sort(rng.choice(pool, size=max(POOL_CELLS // len(targets), 1), replace=False))
+    extra = list(start or [])
+    if not start:
+        # 후보를 줄였을 때 어느 후보도 덮지 못하는 대상은 그 대상을 포함하는 게임을 후보에 더함
+        cover = _coverage(pool, targets, match)
+        orphans = np.flatnonzero(~np.unpackbits(np.bitwise_or.reduce(cover, axis=0))[:len(targets)].astype(bool))
+        extra = [_fallback_ticket(targets[t], v) for t in orphans]
+    if extra:
+        pool = np.union1d(pool, np.asarray(extra, dtype=np.uint32))
+        cover = _coverage(pool, targets, match)
+    n = len(targets)
+
+    if start:
+        chosen = [int(i) for i in np.searchsorted(pool, np.asarray(start, dtype=np.uint32))]
+    else:
+        # 탐욕법: 아직 못 덮은 첫 대상을 덮는 후보 중, 못 덮은 대상을 가장 많이 덮는 게임을 고름
+        uncovered = np.ones(n, dtype=bool)
+        chosen = []
+        while uncovered.any():
+            candidates = np.flatnonzero(_column(cover, int(np.argmax(uncovered))))
+            gains = _POPCOUNT8[cover[candidates] & np.packbits(uncovered)].sum(axis=1, dtype=np.int64)
+            i = int(candidates[np.argmax(gains)])
+            chosen.append(i)
+            uncovered &= ~np.unpackbits(cover[i])[:n].astype(bool)
+
+    def row(i):
+        return np.unpackbits(cover[i])[:n].astype(np.int32)
+
+    counts = np.zeros(n, dtype=np.int32)
+    for i in chosen:
+        counts += row(i)
+
+    def prune():
+        # 덮는 대상이 모두 다른 게임으로도 덮이는 게임은 뺌 (덮는 대상이 적은 게임부터)
+        for i in sorted(chosen, key=lambda i: int(_POPCOUNT8[cover[i]].sum())):
+            r = row(i).astype(bool)
+            if (counts[r] >= 2).all():
+                chosen.remove(i)
+                counts[r] -= 1
+
+    # 지역 탐색: 게임 2개를 빼고 생긴 빈 대상을 후보 1개로 모두 메울 수 있으면 한 게임 줄임.
+    # 안 되면 게임 1개를 같은 빈 대상을 덮는 다른 후보로 바꿔(게임 수 유지) 다음 시도의 출발점을 옮김
+    prune()
+    deadline = time.perf_counter() + seconds
+    best_size, stall = len(chosen), 0
+    for _ in range(iterations):
+        if len(chosen) < 2 or stall >= STALL_ITERATIONS or time.perf_counter() > deadline:
+            break
+        stall += 1
+        if len(chosen) < best_size:
+            best_size, stall = len(chosen), 0
+        a, b = (chosen[k] for k in rng.choice(len(chosen), size=2, replace=False))
+        counts -= row(a) + row(b)
+        holes = np.flatnonzero(counts == 0)
+        fill = _covering_all(cover, holes) if len(holes) else None
+        if fill is not None and not len(fill):
+            counts += row(b)
+            holes = np.flatnonzero(counts == 0)
+            chosen.remove(a)
+            if len(holes):
+                a_new = int(rng.choice(_covering_all(cover, holes)))
+                counts += row(a_new)
+                chosen.append(a_new)
+            continue
+        chosen = [i for i in chosen if i not in (a, b)]
+        if fill is not None:
+            i = int(rng.choice(fill))
+            chosen.append(i)
+            counts += row(i)
+        prune()
+    return sorted(int(pool[i]) for i in chosen)
+
+def design(v: int, drawn: int, match: int, seed: int = 0, improve: bool = False) -> list[int]:
+    """
+    (v, drawn, match) 설계를 반환합니다. 저장된 설계가 있으면 그대로 쓰고 (improve=True 면 그 설계에서 더 줄여 봄),
+    없으면 새로 찾아 저장합니다. 게임 비트마스크 목록 (기본 번호 0 ~ v-1 기준)
+    """
+    validate(v, drawn, match)
+    known = db.get_wheel_design(v, drawn, match)
+    if known and not improve:
+        return known
+    found = search(v, drawn, match, seed=seed, start=known)
+    if not known or len(found) < len(known):
+        db.save_wheel_design(v, drawn, match, found)
+        return found
+    return known
+
+def validate(v: int, drawn: int, match: int):
+    if not TICKET_SIZE <= v <= MAX_BASE:
+        raise ValueError(f"기본 번호는 {TICKET_SIZE}~{MAX_BASE}개여야 합니다. (입력: {v}개)")
+    if not 1 <= match <= drawn <= TICKET_SIZE:
+        raise ValueError(f"1 <= 일치 개수(match) <= 당첨 개수(drawn) <= {TICKET_SIZE} 이어야 합니다.")
+
+def to_numbers(tickets: list[int], base: list[int]) -> list[list[int]]:
+    """비트마스크 게임을 실제 번호로 바꿉니다. base 는 오름차순 기본 번호"""
+    return sorted([base[i] for i in range(len(base)) if t >> i & 1] for t in tickets)
+
+def verify(tickets: list[int], v: int) -> dict[int, dict]:
+    """
+    기본 번호 중 j 개(1~6)가 당첨 번호로 나오는 모든 경우를 전수 조사합니다.
+    반환: {j: {"cases": 경우의 수, "min_match": 최소 보장 일치 수, "distribution": {최대 일치 수: 경우의 수}}}
+    """
+    popcount = _popcount_table()
+    design = np.asarray(tickets, dtype=np.uint32)
+    report = {}
+    for j in range(1, min(TICKET_SIZE, v) + 1):
+        best = np.concatenate([
+            popcount[chunk[:, None] & design[None, :]].max(axis=1)
+            for chunk in np.array_split(subset_masks(v, j), max(1, len(subset_masks(v, j)) // 20000))
+        ])
+        values, counts = np.unique(best, return_counts=True)
+        report[j] = {
+            "cases": int(len(best)),
+            "min_match": int(best.min()),
+            "distribution": {int(m): int(c) for m, c in zip(values, counts)},
+        }
+    return report
@@ -0,0 +1,416 @@
+"""
+오프라인 테스트/벤치마크용 가짜 동행복권 서버.
+
+로그인, 마이페이지, 로또6/45 구매, 연금복권720+ 구매, 간편충전 키패드,
+구매/당첨 내역 API(회차별 구매 상세 포함), 회차별 당첨번호 API 를 실제 사이트와 같은 경로/셀렉터로 흉내냅니다.
+src.scraper.set_site_base_url(server.base_url) 로 스크래퍼를 이 서버로 돌려서 사용합니다.
+
+    python -m tests.fake_dhlottery --port 8765
+"""
+import os
+import json
+import time
+import uuid
+import base64
+import random
+import argparse
+import threading
+from collections import Counter
+from datetime import datetime
+from string import Template
+from http.cookies import SimpleCookie
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "dhlottery")
+
+LOTTO_PRIZES = {"1등": 2000000000, "2등": 50000000, "3등": 1500000, "4등": 50000, "5등": 5000}
+# 연금복권720+ 등수별 당첨금 총액 (끝에서부터 일치한 자리 수 6 ~ 1 -> 2등 ~ 7등)
+PENSION_PRIZES = {"1등": 1680000000, "2등": 120000000, "3등": 1000000, "4등": 100000, "5등": 50000, "6등": 5000, "7등": 1000}
+PENSION_BONUS_PRIZE = 120000000
+
+
+def _template(name: str) -> Template:
+    with open(os.path.join(FIXTURE_DIR, name), "r", encoding="utf-8") as f:
+        return Template(f.read())
+
+
+def _digit_image(digit: int) -> str:
+    svg = (
+        '<svg xmlns="http://www.w3.org/2000/svg" width="100" height="60">'
+        '<rect width="100" height="60" fill="white"/>'
+        f'<text x="50" y="46" font-size="44" font-family="Arial" text-anchor="middle" fill="black">{digit}</text>'
+        "</svg>"
+    )
+    return "data:image/svg+xml;base64," + base64.b64encode(svg.encode()).decode()
+
+
+class FakeDhlottery:
+    """가짜 서버의 상태 (계정, 예치금, 구매 내역, 추첨 결과)"""
+
+    def __init__(self, user_id="tester", user_pw="secret", charge_pin="123456",
+                 balance=50000, current_round=1100, latency=0.0, seed=0):
+        self.user_id = user_id
+        self.user_pw = user_pw
+        self.charge_pin = charge_pin
+        self.balance = balance
+        self.current_round = current_round
+        self.latency = latency
+        self.rng = random.Random(seed)
+        self.sessions = set()
+        self.orders = []
+        self.keypad_layout = list(range(10))
+        self.hits = Counter()
+        self.lock = threading.Lock()
+
+    # --- 추첨 ---------------------------------------------------------------
+    def draw(self, round_no: int) -> tuple[list[int], int]:
+        """회차별로 항상 같은 당첨 번호를 돌려줍니다."""
+        balls = random.Random(round_no).sample(range(1, 46), 7)
+        return sorted(balls[:6]), balls[6]
+
+    def pension_draw(self, round_no: int) -> tuple[int, str, str]:
+        """연금복권720+ 회차별 (1등 조, 1등 번호, 보너스 번호)"""
+        r = random.Random(f"720-{round_no}")
+        return r.randint(1, 5), "".join(str(r.randint(0, 9)) for _ in range(6)), "".join(str(r.randint(0, 9)) for _ in range(6))
+
+    def close_round(self):
+        """이번 회차 판매를 마감하고 추첨을 완료한 것으로 처리합니다."""
+        with self.lock:
+            self.current_round += 1
+
+    def prize_table(self, round_no: int) -> dict[str, tuple[int, int]]:
+        """회차별 등수 (1게임당 당첨금, 당첨 게임 수). 4/5등은 고정 금액"""
+        r = random.Random(f"prize-{round_no}")
+        return {
+            "1등": (r.randrange(1_000_000_000, 4_000_000_000, 1000), r.randint(3, 15)),
+            "2등": (r.randrange(40_000_000, 80_000_000, 10), r.randint(50, 100)),
+            "3등": (r.randrange(1_200_000, 1_800_000, 10), r.randint(2000, 4000)),
+            "4등": (50000, r.randint(100000, 200000)),
+            "5등": (5000, r.randint(1500000, 2500000)),
+        }
+
+    def is_drawn(self, round_no: int) -> bool:
+        return round_no < self.current_round
+
+    def grade(self, round_no: int, numbers: list[int]) -> str:
+        win, bonus = self.draw(round_no)
+        match = len(set(numbers) & set(win))
+        if match == 6:
+            return "1등"
+        if match == 5:
+            return "2등" if bonus in numbers else "3등"
+        if match == 4:
+            return "4등"
+        if match == 3:
+            return "5등"
+        return "낙첨"
+
+    def grade_pension(self, round_no: int, group: int, number: str) -> tuple[str, int]:
+        win_group, win_number, bonus_number = self.pension_draw(round_no)
+        suffix = 0
+        while suffix < 6 and number[5 - suffix] == win_number[5 - suffix]:
+            suffix += 1
+        rank = "낙첨" if suffix == 0 else f"{8 - suffix}등"
+        if suffix == 6 and group == win_group:
+            rank = "1등"
+        amount = PENSION_PRIZES.get(rank, 0)
+        if number == bonus_number:
+            rank = "보너스" if rank == "낙첨" else f"{rank}+보너스"
+            amount += PENSION_BONUS_PRIZE
+        return rank, amount
+
+    # --- 구매 ---------------------------------------------------------------
+    def buy_lotto(self, lines: list[dict]) -> dict:
+        with self.lock:
+            if not lines:
+                return {"ok": False, "message": "선택된 번호가 없습니다."}
+            cost = 1000 * len(lines)
+            if self.balance < cost:
+                return {"ok": False, "message": "예치금이 부족합니다. 충전 후 이용해 주세요."}
+            self.balance -= cost
+            games = []
+            for line in lines:
+                if line.get("mode") == "manual":
+                    games.append({"mode": "수동", "numbers": sorted(int(n) for n in line["numbers"])})
+                else:
+                    games.append({"mode": "자동", "numbers": sorted(self.rng.sample(range(1, 46), 6))})
+            self.orders.append({
+                "order_no": uuid.uuid4().hex[:12], "game": "로또6/45", "round": self.current_round,
+                "date": datetime.now(), "cost": cost, "games": games,
+            })
+            return {"ok": True, "round": self.current_round, "games": games}
+
+    def buy_pension(self, all_groups: bool, digits: str | None) -> dict:
+        with self.lock:
+            count = 5 if all_groups else 1
+            cost = 1000 * count
+            if self.balance < cost:
+                return {"ok": False, "message": "예치금이 부족합니다. 충전 후 이용해 주세요."}
+            self.balance -= cost
+            digits = digits or "".join(str(self.rng.randint(0, 9)) for _ in range(6))
+            tickets = [{"group": g, "number": digits} for g in range(1, count + 1)]
+            self.orders.append({
+                "order_no": uuid.uuid4().hex[:12], "game": "연금복권720+", "round": self.current_round,
+                "date": datetime.now(), "cost": cost, "tickets": tickets,
+            })
+            return {"ok": True, "round": self.current_round, "tickets": tickets}
+
+    def charge(self, amount: int, pin_indexes: list[int]) -> dict:
+        with self.lock:
+            pin = "".join(str(self.keypad_layout[i]) for i in pin_indexes)
+            if pin != self.charge_pin:
+                return {"ok": False, "message": "간편결제 비밀번호가 일치하지 않습니다."}
+            self.balance += amount
+            return {"ok": True, "message": f"{amount:,}원 충전이 완료되었습니다."}
+
+    def shuffle_keypad(self):
+        with self.lock:
+            self.rng.shuffle(self.keypad_layout)
+
+    # --- 내역 ---------------------------------------------------------------
+    def ledger(self) -> list[dict]:
+        items = []
+        for order in self.orders:
+            result, amount = "미추첨", 0
+            if order["game"] == "로또6/45" and self.is_drawn(order["round"]):
+                ranks = [self.grade(order["round"], g["numbers"]) for g in order["games"]]
+                amount = sum(LOTTO_PRIZES.get(r, 0) for r in ranks)
+                result = "당첨" if amount else "낙첨"
+            elif order["game"] != "로또6/45" and self.is_drawn(order["round"]):
+                amount = sum(self.grade_pension(order["round"], t["group"], t["number"])[1] for t in order["tickets"])
+                result = "당첨" if amount else "낙첨"
+            items.append({
+                "ltGdsNm": order["game"],
+                "ltEpsdView": str(order["round"]),
+                "ltWnResult": result,
+                "ltWnAmt": amount,
+                "eltOrdrDt": order["date"].strftime("%Y-%m-%d %H:%M:%S"),
+                "ntslOrdrNo": order["order_no"],
+                "prchsQty": len(order.get("games") or order.get("tickets")),
+            })
+        return items
+
+    def ledger_detail(self, round_no: int) -> list[dict]:
+        return [
+            {
+                "ntslOrdrNo": order["order_no"],
+                "gameList": [
+                    {"slot": chr(65 + i), "selType": g["mode"], "numbers": " ".join(f"{n:02d}" for n in g["numbers"])}
+                    for i, g in enumerate(order["games"])
+                ],
+            }
+            for order in self.orders
+            if order["game"] == "로또6/45" and order["round"] == round_no
+        ]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    state: FakeDhlottery = None  # 서버마다 서브클래스에서 지정
+
+    def log_message(self, format, *args):
+        pass
+
+    # --- 공통 ---------------------------------------------------------------
+    def _session(self) -> str | None:
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        token = cookie.get("JSESSIONID")
+        return token.value if token and token.value in self.state.sessions else None
+
+    def _send(self, status: int, body: str, content_type="text/html; charset=utf-8", headers=None):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _json(self, payload, status=200, headers=None):
+        self._send(status, json.dumps(payload, ensure_ascii=False), "application/json; charset=utf-8", headers)
+
+    def _redirect(self, location: str):
+        self.send_response(302)
+        self.send_header("Location", location)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _page(self, name: str, **values):
+        self._send(200, _template(name).safe_substitute(**values))
+
+    def _begin(self):
+        path = urlsplit(self.path).path
+        self.state.hits[path] += 1
+        if self.state.latency:
+            time.sleep(self.state.latency)
+        return path
+
+    # --- 라우팅 -------------------------------------------------------------
+    def do_GET(self):
+        path = self._begin()
+        query = parse_qs(urlsplit(self.path).query)
+
+        if path == "/login":
+            return self._page("login.html")
+        if path == "/common.do":
+            return self._lotto_number(query)
+        if path == "/gameResult.do":
+            return self._win_result(query)
+
+        if not self._session():
+            return self._redirect("/login")
+
+        if path == "/mypage/home":
+            return self._page("mypage_home.html", balance=f"{self.state.balance:,}", user_id=self.state.user_id)
+        if path == "/mypage/mylotteryledger":
+            return self._page("ledger.html")
+        if path == "/mypage/selectMyLotteryledger.do":
+            return self._json({"data": {"list": self.state.ledger()}})
+        if path == "/mypage/selectMyLotteryledgerDetail.do":
+            round_no = int(query.get("ltEpsd", ["0"])[0])
+            return self._json({"data": {"list": self.state.ledger_detail(round_no)}})
+        if path == "/olotto/game_mobile/game645.do":
+            return self._page("game645.html")
+        if path == "/game_mobile/pension720/game.jsp":
+            return self._page("pension720.html")
+        if path == "/mypage/mndpChrg":
+            self.state.shuffle_keypad()
+            keys = "".join(
+                f'<img class="kpd-data" src="{_digit_image(d)}" onclick="press({i})">'
+                for i, d in enumerate(self.state.keypad_layout)
+            )
+            return self._page("charge.html", keys=keys)
+        self._send(404, "not found")
+
+    def do_POST(self):
+        path = self._begin()
+        body = self._body()
+
+        if path == "/login":
+            form = {k: v[0] for k, v in parse_qs(body.decode("utf-8")).items()}
+            if form.get("userId") != self.state.user_id or form.get("userPswdEncn") != self.state.user_pw:
+                return self._json({"ok": False}, status=401)
+            token = uuid.uuid4().hex
+            self.state.sessions.add(token)
+            return self._json({"ok": True}, headers={"Set-Cookie": f"JSESSIONID={token}; Path=/"})
+
+        if not self._session():
+            return self._json({"ok": False, "message": "로그인이 필요합니다."}, status=401)
+
+        payload = json.loads(body or b"{}")
+        if path == "/olotto/game_mobile/execBuy.do":
+            return self._json(self.state.buy_lotto(payload.get("lines", [])))
+        if path == "/game_mobile/pension720/execBuy.jsp":
+            return self._json(self.state.buy_pension(bool(payload.get("allGroups")), payload.get("digits")))
+        if path == "/mypage/mndpChrg.do":
+            indexes = [int(i) for i in str(payload.get("pin", "")).split(",") if i != ""]
+            return self._json(self.state.charge(int(payload.get("amount", 0)), indexes))
+        self._send(404, "not found")
+
+    def _lotto_number(self, query):
+        try:
+            round_no = int(query.get("drwNo", ["0"])[0])
+        except ValueError:
+            round_no = 0
+        if query.get("method", [""])[0] != "getLottoNumber" or not (1 <= round_no and self.state.is_drawn(round_no)):
+            return self._json({"returnValue": "fail"})
+        win, bonus = self.state.draw(round_no)
+        first_amount, first_winners = self.state.prize_table(round_no)["1등"]
+        payload = {"returnValue": "success", "drwNo": round_no, "bnusNo": bonus,
+                   "drwNoDate": f"2024-01-{(round_no % 28) + 1:02d}",
+                   "firstWinamnt": first_amount, "firstPrzwnerCo": first_winners}
+        payload.update({f"drwtNo{i + 1}": n for i, n in enumerate(win)})
+        self._json(payload)
+
+
+    def _win_result(self, query):
+        if query.get("method", [""])[0] == "win720":
+            return self._pension_result(query)
+        try:
+            round_no = int(query.get("drwNo", ["0"])[0])
+        except ValueError:
+            round_no = 0
+        rows = ""
+        if self.state.is_drawn(round_no):
+            rows = "".join(
+                f'<tr><td>{rank}</td><td class="tar"><strong class="color_key1">{amount * winners:,}원</strong></td>'
+                f'<td class="tar">{winners:,}</td><td class="tar">{amount:,}원</td><td>-</td><td>-</td></tr>'
+                for rank, (amount, winners) in self.state.prize_table(round_no).items()
+            )
+        self._send(200, (
+            '<html><body><table class="tbl_data tbl_data_col"><thead><tr><th>순위</th><th>등위별 총 당첨금액</th>'
+            f'<th>당첨게임 수</th><th>1게임당 당첨금액</th><th>당첨기준</th><th>비고</th></tr></thead><tbody>{rows}</tbody></table></body></html>'
+        ))
+
+    def _pension_result(self, query):
+        try:
+            round_no = int(query.get("Round", ["0"])[0])
+        except ValueError:
+            round_no = 0
+        if not (1 <= round_no and self.state.is_drawn(round_no)):
+            return self._send(200, '<html><body><div class="win720_num"></div></body></html>')
+        group, number, bonus = self.state.pension_draw(round_no)
+        digits = lambda n: "".join(f'<span class="num al720_color{i + 1}"><span>{d}</span></span>' for i, d in enumerate(n))
+        self._send(200, (
+            '<html><body><div class="win720_num">'
+            f'<h4><strong>{round_no}회</strong> <span class="date">(2024-01-{(round_no % 28) + 1:02d} 추첨)</span></h4>'
+            f'<div class="win_num"><span class="group"><span>{group}</span>조</span>{digits(number)}</div>'
+            f'<div class="bonus_num"><span class="group">각조</span>{digits(bonus)}</div>'
+            '</div></body></html>'
+        ))
+
+
+class FakeDhlotteryServer:
+    """
+    별도 스레드에서 도는 가짜 동행복권 서버.
+
+        with FakeDhlotteryServer() as server:
+            set_site_base_url(server.base_url)
+            ...
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, **state_kwargs):
+        self.state = FakeDhlottery(**state_kwargs)
+        handler = type("FakeDhlotteryHandler", (_Handler,), {"state": self.state})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="가짜 동행복권 서버")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="요청마다 추가할 지연(초)")
+    args = parser.parse_args()
+
+    server = FakeDhlotteryServer(port=args.port, latency=args.latency)
+    print(f"가짜 동행복권 서버 실행 중: {server.base_url}  (DHLOTTERY_BASE_URL={server.base_url})")
+    print(f"계정: {server.state.user_id} / {server.state.user_pw}, 간편결제 PIN: {server.state.charge_pin}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+import src.accounts as accounts
+
+
+def test_registry_merges_env_and_file_accounts(tmp_path, monkeypatch):
+    monkeypatch.setattr(accounts, "DHLOTTERY_ID", "me")
+    monkeypatch.setattr(accounts, "DHLOTTERY_PW", "secret")
+    path = tmp_path / "accounts.json"
+    path.write_text(json.dumps([
+        {"name": "mom", "id": "mom_id", "pw": "pw1", "charge_pin": "111111"},
+        {"name": "dad", "id": "dad_id", "pw": "pw2"},
+    ]), encoding="utf-8")
+
+    registry = accounts.load_accounts(str(path))
+    assert [a["account_id"] for a in registry] == ["default", "mom", "dad"]
+    assert registry[1]["charge_pin"] == "111111"
+
+    assert [a["account_id"] for a in accounts.select_accounts(registry)] == ["default"]
+    assert [a["account_id"] for a in accounts.select_accounts(registry, ("dad", "mom"))] == ["dad", "mom"]
+    assert len(accounts.select_accounts(registry, all_accounts=True)) == 3
+    with pytest.raises(ValueError):
+        accounts.select_accounts(registry, ("nobody",))
+
+
+def test_registry_rejects_duplicate_names(tmp_path, monkeypatch):
+    monkeypatch.setattr(accounts, "DHLOTTERY_ID", None)
+    path = tmp_path / "accounts.json"
+    path.write_text(json.dumps([
+        {"name": "kid", "id": "a", "pw": "x"},
+        {"name": "kid", "id": "b", "pw": "y"},
+    ]), encoding="utf-8")
+    with pytest.raises(ValueError):
+        accounts.load_accounts(str(path))
+
+
+def test_unknown_account_is_reported_as_cli_error(monkeypatch):
+    import main
+    from click.testing import CliRunner
+
+    monkeypatch.setattr(accounts, "load_accounts", lambda: [{"account_id": "default", "user_id": "me", "user_pw": "secret"}])
+    result = CliRunner().invoke(main.cli, ["--account", "nobody", "balance"])
+    assert result.exit_code == 1
+    assert not isinstance(result.exception, ValueError)
+    assert "등록되지 않은 계정입니다: nobody" in result.output
@@ -0,0 +1,78 @@
+import itertools
+
+import numpy as np
+from click.testing import CliRunner
+
+from src import analytics, combo, db
+
+
+def _rounds(n, seed=0):
+    rng = np.random.default_rng(seed)
+    out = []
+    for r in range(1, n + 1):
+        picked = rng.choice(np.arange(1, 46), 7, replace=False)
+        out.append({"round_number": r, "draw_date": "2020-01-01",
+                    "winning_numbers": sorted(int(x) for x in picked[:6]), "bonus_number": int(picked[6])})
+    return out
+
+
+def test_incremental_fold_matches_brute_force():
+    rounds = _rounds(60)
+    db.add_or_update_rounds(rounds[:25])
+    assert analytics.refresh()[1] == 25
+    db.add_or_update_rounds(rounds[25:])
+    state, added = analytics.refresh()
+    assert added == 35
+
+    freq = np.zeros(45, dtype=int)
+    pairs = np.zeros((45, 45), dtype=int)
+    triples = np.zeros(combo.subset_count(3), dtype=int)
+    last = np.zeros(45, dtype=int)
+    for r in rounds:
+        for n in r["winning_numbers"]:
+            freq[n - 1] += 1
+            last[n - 1] = r["round_number"]
+        for a, b in itertools.combinations(r["winning_numbers"], 2):
+            pairs[a - 1, b - 1] += 1
+            pairs[b - 1, a - 1] += 1
+        for t in itertools.combinations(r["winning_numbers"], 3):
+            triples[combo.rank_subsets([t], 3)[0]] += 1
+    pairs[np.arange(45), np.arange(45)] = freq
+
+    assert (state["freq"] == freq).all()
+    assert (state["pairs"] == pairs).all()
+    assert (state["triples"] == triples).all()
+    assert (analytics.gaps(state) == np.where(last > 0, 60 - last, 60)).all()
+    assert state["meta"].tolist() == [60, 60]
+
+
+def test_refresh_does_not_double_count():
+    rounds = _rounds(10, seed=1)
+    db.add_or_update_rounds(rounds)
+    first, _ = analytics.refresh()
+    db.add_or_update_rounds(rounds[-3:])
+    again, added = analytics.refresh()
+    assert added == 0
+    for name in analytics.ARRAYS:
+        assert (first[name] == again[name]).all()
+        assert (analytics.load()[name] == first[name]).all()
+
+
+def test_unrank_subsets_round_trips_triples():
+    idx = np.arange(combo.subset_count(3))
+    triples = combo.unrank_subsets(idx, 3)
+    assert triples[0].tolist() == [1, 2, 3] and triples[-1].tolist() == [43, 44, 45]
+    assert (combo.rank_subsets(triples, 3) == idx).all()
+
+
+def test_analyze_command(tmp_path):
+    import json
+    import main
+
+    db.add_or_update_rounds(_rounds(5, seed=2))
+    out = tmp_path / "stats.json"
+    result = CliRunner().invoke(main.cli, ["analyze", "--top", "3", "--number", "7", "--json", str(out)])
+    assert result.exit_code == 0, result.output
+    assert "5회" in result.output
+    data = json.loads(out.read_text(encoding="utf-8"))
+    assert data["rounds"] == 5 and len(data["top_triples"]) == 3
@@ -0,0 +1,95 @@
+import email.parser
+import os
+import sys
+
+import pytest
+
+from src import attachments, notifier
+
+
+def _write(path, size, mtime):
+    with open(path, "wb") as f:
+        f.write(os.urandom(size))
+    os.utime(path, (mtime, mtime))
+    return str(path)
+
+
+def test_rotate_keeps_newest_within_caps(tmp_path):
+    paths = [_write(tmp_path / f"{i}.png", 100, 1_000_000 + i) for i in range(5)]
+    attachments.rotate(str(tmp_path), max_bytes=10_000, max_files=3)
+    assert sorted(os.listdir(tmp_path)) == ["2.png", "3.png", "4.png"]
+
+    attachments.rotate(str(tmp_path), max_bytes=150, max_files=10)
+    assert os.listdir(tmp_path) == ["4.png"]
+    assert not os.path.exists(paths[0])
+
+
+def test_screenshot_path_rotates_and_latest_finds_it(tmp_path, monkeypatch):
+    monkeypatch.setattr(attachments, "SCREENSHOT_MAX_FILES", 2)
+    directory = str(tmp_path / "shots")
+    os.makedirs(directory)
+    old = [_write(os.path.join(directory, f"2024010{i}-000000_charge_failed_verify.png"), 10, 1_000_000 + i) for i in range(2)]
+
+    path = attachments.screenshot_path("charge_failed_verify", directory)
+    assert os.path.dirname(path) == directory and path.endswith("_charge_failed_verify.png")
+    assert not os.path.exists(old[0]) and os.path.exists(old[1])
+
+    assert attachments.latest_screenshot("charge_failed_verify", directory=directory) == old[1]
+    assert attachments.latest_screenshot("charge_failed_verify", since=2_000_000, directory=directory) is None
+
+
+def test_multipart_stream_round_trips(tmp_path):
+    image = _write(tmp_path / "shot.jpg", 50_000, 1_000_000)
+    with attachments.MultipartFile({"chat_id": "42", "caption": "충전 실패"}, "photo", image) as body:
+        data = b"".join(iter(lambda: body.read(8192), b""))
+        assert len(data) == len(body) and body.tell() == len(body)
+        header = f"Content-Type: {body.content_type}\r\n\r\n".encode()
+    parts = email.parser.BytesParser().parsebytes(header + data).get_payload()
+    assert [p.get_param("name", header="content-disposition") for p in parts] == ["chat_id", "caption", "photo"]
+    assert parts[1].get_payload(decode=True).decode() == "충전 실패"
+    assert parts[2].get_content_type() == "image/jpeg"
+    assert parts[2].get_payload(decode=True) == open(image, "rb").read()
+
+
+def test_prepare_without_pillow_only_passes_small_originals(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "PIL", None)
+    image = _write(tmp_path / "shot.png", 1000, 1_000_000)
+    assert attachments.prepare(image, 2000) == image
+    assert attachments.prepare(image, 500) is None
+    assert attachments.prepare(str(tmp_path / "missing.png"), 2000) is None
+
+
+def test_prepare_downscales_and_converts(tmp_path, monkeypatch):
+    Image = pytest.importorskip("PIL.Image")
+    monkeypatch.setattr(attachments, "ATTACHMENT_MAX_WIDTH", 400)
+    source = str(tmp_path / "full_page.png")
+    Image.frombytes("RGB", (1600, 6000), os.urandom(1600 * 6000 * 3)).save(source)
+
+    prepared = attachments.prepare(source, 200_000, directory=str(tmp_path / "out"))
+    assert prepared.endswith(".jpg") and os.path.getsize(prepared) <= 200_000
+    with Image.open(prepared) as image:
+        assert image.format == "JPEG" and image.width <= 400
+    assert attachments.prepare(source, 200_000, directory=str(tmp_path / "out")) == prepared
+
+
+def test_image_messages_are_streamed(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "PIL", None)
+    image = _write(tmp_path / "shot.png", 5000, 1_000_000)
+    calls = []
+
+    class Session:
+        def post(self, url, **kwargs):
+            calls.append((url, kwargs, kwargs["data"].read() if "data" in kwargs else None))
+            return type("R", (), {"status_code": 200})()
+
+    monkeypatch.setattr(notifier, "get_session", lambda: Session())
+    assert notifier.send_telegram_message("token", "42", "x" * 2000, image)
+    url, kwargs, body = calls[0]
+    assert url.endswith("/sendPhoto") and kwargs["headers"]["Content-Type"].startswith("multipart/form-data; boundary=")
+    assert isinstance(kwargs["data"], attachments.MultipartFile) and len(body) == len(kwargs["data"])
+    assert ("x" * notifier.TELEGRAM_CAPTION_LIMIT).encode() in body and ("x" * (notifier.TELEGRAM_CAPTION_LIMIT + 1)).encode() not in body
+
+    # 상한을 넘는 이미지는 메시지만 보냄
+    monkeypatch.setitem(attachments.MAX_UPLOAD_BYTES, "discord", 100)
+    assert notifier.send_discord_message("https://discord.test/webhook", "hello", image)
+    assert calls[1][1]["json"] == {"content": "hello"}
@@ -0,0 +1,65 @@
+from datetime import datetime
+
+from click.testing import CliRunner
+
+from src import db
+from src.rounds import next_draw_round, sales_deadline
+
+
+def test_next_draw_round_follows_weekly_sales_deadline():
+    assert next_draw_round(datetime(2002, 12, 7, 19, 59)) == 1
+    assert next_draw_round(datetime(2002, 12, 7, 20, 0)) == 2
+    assert next_draw_round(datetime(2024, 8, 3, 12, 0)) == 1131
+    assert next_draw_round(datetime(2024, 8, 3, 20, 30)) == 1132
+    assert sales_deadline(1131) == datetime(2024, 8, 3, 20, 0)
+
+
+class _Scraper:
+    account_id = "default"
+
+    def __init__(self):
+        self.bought = []
+
+    def buy_manual(self, numbers, notify=None):
+        self.bought.append(numbers)
+        return True
+
+
+def _run(monkeypatch, *args):
+    import main
+
+    scraper = _Scraper()
+    calls = []
+
+    def run(job, *a, **k):
+        calls.append(job(scraper, {}))
+
+    monkeypatch.setattr(main, "_run_for_selected_accounts", run)
+    result = CliRunner().invoke(main.cli, ["buy", *args])
+    assert result.exit_code == 0, result.output
+    return result.output, scraper.bought, calls
+
+
+def test_buy_skips_lines_already_held_this_round(monkeypatch):
+    round_no = next_draw_round()
+    db.insert_purchase(round_no, datetime.now(), "수동", "1,2,3,4,5,6", account_id="wife")
+    # 회차가 아직 0 으로 남은 이번 주 구매분도 중복으로 봄
+    db.insert_purchase(0, datetime.now(), "수동", "7,8,9,10,11,12", account_id="me")
+    # 지난 회차에 산 번호는 상관없음
+    db.insert_purchase(round_no - 1, datetime.now(), "수동", "13,14,15,16,17,18", account_id="me")
+
+    output, bought, _ = _run(monkeypatch, "--manual", "6 5 4 3 2 1", "--manual", "7,8,9,10,11,12",
+                             "--manual", "13,14,15,16,17,18", "--manual", "18,17,16,15,14,13")
+    assert bought == [[13, 14, 15, 16, 17, 18]]
+    assert "wife" in output and "me" in output
+    assert "1게임을 제외" in output
+
+
+def test_buy_does_not_start_browser_when_everything_is_duplicate(monkeypatch):
+    db.insert_purchase(next_draw_round(), datetime.now(), "수동", "1,2,3,4,5,6")
+    output, bought, calls = _run(monkeypatch, "--manual", "1,2,3,4,5,6")
+    assert calls == [] and bought == []
+    assert "--allow-duplicates" in output
+
+    output, bought, _ = _run(monkeypatch, "--manual", "1,2,3,4,5,6", "--allow-duplicates")
+    assert bought == [[1, 2, 3, 4, 5, 6]]
@@ -0,0 +1,66 @@
+import io
+import itertools
+import sqlite3
+from datetime import datetime
+
+import numpy as np
+from click.testing import CliRunner
+
+from src import combo, db
+
+
+def test_encode_is_dense_and_round_trips():
+    # colex 순위이므로 1~n 으로만 만든 조합은 0 ~ C(n, 6)-1 을 빠짐없이 차지
+    small = [combo.encode(c) for c in itertools.combinations(range(1, 13), 6)]
+    assert sorted(small) == list(range(924))
+    assert combo.encode([1, 2, 3, 4, 5, 6]) == 0
+    assert combo.encode([45, 44, 43, 42, 41, 40]) == combo.TOTAL - 1
+
+    idx = np.random.default_rng(0).integers(0, combo.TOTAL, 10000)
+    assert (combo.encode_array(combo.decode_array(idx)) == idx).all()
+    assert combo.decode(combo.encode([3, 17, 22, 31, 40, 45])) == [3, 17, 22, 31, 40, 45]
+
+
+def test_export_is_four_bytes_per_line():
+    buf = io.BytesIO()
+    assert combo.write_export(buf, [0, 12345, combo.TOTAL - 1]) == 3
+    assert len(buf.getvalue()) == 12
+    buf.seek(0)
+    assert combo.read_export(buf).tolist() == [0, 12345, combo.TOTAL - 1]
+
+
+def test_init_db_backfills_combo_idx_on_legacy_rows(tmp_path):
+    path = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE purchases (id INTEGER PRIMARY KEY AUTOINCREMENT, round_number INTEGER, purchase_date DATETIME, "
+                 "mode TEXT, numbers TEXT, cost INTEGER, win_amount INTEGER DEFAULT 0, win_rank TEXT DEFAULT '추첨 전')")
+    conn.executemany("INSERT INTO purchases (round_number, mode, numbers, cost) VALUES (?, ?, ?, ?)", [
+        (1000, "수동", "5, 1, 9, 20, 33, 45", 1000),
+        (1000, "자동", "확인필요", 1000),
+        (1000, "연금자동", "3조 123456", 1000),
+    ])
+    conn.commit()
+    conn.close()
+
+    db.set_db_path(path)
+    db.init_db()
+    conn = db.connect()
+    rows = conn.execute("SELECT combo_idx FROM purchases ORDER BY id").fetchall()
+    conn.close()
+    assert [r[0] for r in rows] == [combo.encode([1, 5, 9, 20, 33, 45]), None, None]
+
+
+def test_duplicates_and_export_use_combo_index():
+    now = datetime.now()
+    db.insert_purchase(1000, now, "수동", "1,2,3,4,5,6", account_id="a")
+    db.insert_purchase(1000, now, "수동", "6,5,4,3,2,1", account_id="b")
+    db.insert_purchase(1001, now, "수동", "1,2,3,4,5,6", account_id="a")
+    db.add_or_update_rounds([{"round_number": 900, "draw_date": "2020-01-01", "winning_numbers": [1, 2, 3, 4, 5, 6], "bonus_number": 7}])
+
+    assert db.get_duplicate_tickets() == [{"round_number": 1000, "combo_idx": 0, "count": 2, "accounts": "a,b"}]
+    assert db.count_tickets_matching_drawn() == 3
+
+    import main
+    result = CliRunner().invoke(main.cli, ["export", "--output", "-", "--distinct"])
+    assert result.exit_code == 0, result.output
+    assert result.stdout_bytes == np.array([0], dtype="<i4").tobytes()
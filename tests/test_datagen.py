@@ -0,0 +1,31 @@
+from src import db
+from benchmarks.datagen import generate, draw_for_round, RANK_PRIZES
+
+
+def _grade(numbers, win, bonus):
+    nums = set(map(int, numbers.split(",")))
+    match = len(nums & set(win))
+    if match == 6:
+        return "1등"
+    if match == 5:
+        return "2등" if bonus in nums else "3등"
+    return {4: "4등", 3: "5등"}.get(match, "낙첨")
+
+
+def test_generate_ledger(tmp_path):
+    summary = generate(str(tmp_path / "ledger.db"), 3000, rounds=20, accounts=3, pending_ratio=0.1)
+
+    conn = db.connect()
+    rows = conn.execute("SELECT round_number, numbers, win_rank, win_amount, account_id FROM purchases").fetchall()
+    conn.close()
+
+    assert len(rows) == 3000
+    assert {r[4] for r in rows} == {"default", "acct1", "acct2"}
+    assert sum(1 for r in rows if r[2] == "추첨 전") == summary["pending"]
+    # 채점된 티켓은 실제 당첨 번호로 다시 채점해도 같은 등수/당첨금
+    for rnd, numbers, rank, amount, _ in rows:
+        if rank == "추첨 전" or numbers == "확인필요":
+            continue
+        win, bonus = draw_for_round(rnd)
+        assert _grade(numbers, win, bonus) == rank
+        assert RANK_PRIZES[rank] == amount
@@ -0,0 +1,31 @@
+import threading
+from datetime import datetime
+
+from click.testing import CliRunner
+
+from src import db
+
+
+def test_memory_db_shared_across_connections_and_threads():
+    db.insert_purchase(1000, datetime.now(), "수동", "1,2,3,4,5,6")
+    thread = threading.Thread(target=db.insert_purchase, args=(1000, datetime.now(), "수동", "7,8,9,10,11,12"))
+    thread.start()
+    thread.join()
+    assert len(db.get_pending_purchases(1000)) == 2
+
+
+def test_memory_db_is_fresh_per_switch():
+    db.insert_purchase(1000, datetime.now(), "수동", "1,2,3,4,5,6")
+    db.set_db_path(db.MEMORY_DB)
+    db.init_db()
+    assert db.get_pending_purchases(1000) == []
+
+
+def test_cli_db_option(tmp_path):
+    import main
+
+    path = tmp_path / "nested" / "custom.db"
+    result = CliRunner().invoke(main.cli, ["--db", str(path), "pending"])
+    assert result.exit_code == 0, result.output
+    assert "추첨 전(미확인) 티켓이 없습니다" in result.output
+    assert path.exists()
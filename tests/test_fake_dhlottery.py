@@ -0,0 +1,112 @@
+import json
+import urllib.error
+import urllib.request
+from http.cookiejar import CookieJar
+from urllib.parse import urlencode
+
+import pytest
+
+from tests.fake_dhlottery import FakeDhlotteryServer
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+@pytest.fixture
+def server():
+    with FakeDhlotteryServer(balance=3000, current_round=1100) as s:
+        yield s
+
+
+def _login(server):
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(CookieJar()))
+    body = urlencode({"userId": server.state.user_id, "userPswdEncn": server.state.user_pw}).encode()
+    opener.open(server.base_url + "/login", data=body).read()
+    return opener
+
+
+def test_requires_login(server):
+    opener = urllib.request.build_opener(_NoRedirect)
+    with pytest.raises(urllib.error.HTTPError) as e:
+        opener.open(server.base_url + "/mypage/home")
+    assert e.value.code == 302
+    assert e.value.headers["Location"] == "/login"
+
+
+def test_login_and_balance_page(server):
+    opener = _login(server)
+    html = opener.open(server.base_url + "/mypage/home").read().decode()
+    assert "3,000" in html
+
+
+def test_buy_and_ledger(server):
+    opener = _login(server)
+    req = urllib.request.Request(
+        server.base_url + "/olotto/game_mobile/execBuy.do",
+        data=json.dumps({"lines": [{"mode": "auto"}, {"mode": "manual", "numbers": [1, 2, 3, 4, 5, 6]}]}).encode(),
+        method="POST",
+    )
+    result = json.loads(opener.open(req).read())
+    assert result["ok"] and result["round"] == 1100
+    assert result["games"][1]["numbers"] == [1, 2, 3, 4, 5, 6]
+    assert server.state.balance == 1000
+
+    # 잔액 부족
+    result = json.loads(opener.open(req).read())
+    assert not result["ok"]
+
+    ledger = json.loads(opener.open(server.base_url + "/mypage/selectMyLotteryledger.do").read())
+    assert [i["ltWnResult"] for i in ledger["data"]["list"]] == ["미추첨"]
+
+    server.state.close_round()
+    ledger = json.loads(opener.open(server.base_url + "/mypage/selectMyLotteryledger.do").read())
+    assert ledger["data"]["list"][0]["ltWnResult"] in ("당첨", "낙첨")
+
+
+def test_lotto_number_api(server):
+    url = server.base_url + "/common.do?method=getLottoNumber&drwNo={}"
+    data = json.loads(urllib.request.urlopen(url.format(1000)).read())
+    assert data["returnValue"] == "success"
+    numbers = [data[f"drwtNo{i}"] for i in range(1, 7)]
+    assert numbers == sorted(numbers) and data["bnusNo"] not in numbers
+    assert json.loads(urllib.request.urlopen(url.format(1000)).read()) == data
+
+    # 아직 추첨 전인 회차
+    assert json.loads(urllib.request.urlopen(url.format(1100)).read())["returnValue"] == "fail"
+
+
+@pytest.fixture
+def browser_env(server, tmp_path, monkeypatch):
+    """스크래퍼를 가짜 서버와 임시 세션 디렉터리로 돌립니다. Chromium 이 없으면 건너뜁니다."""
+    from src import session, scraper
+
+    try:
+        playwright, browser = scraper.run_sync(scraper.launch_browser(True))
+    except Exception as e:
+        pytest.skip(f"Chromium 을 실행할 수 없습니다: {e}")
+    scraper.run_sync(scraper.close_browser(playwright, browser))
+
+    monkeypatch.setattr(session, "SESSION_DIR", str(tmp_path / "sessions"))
+    monkeypatch.setattr(session, "SESSION_PATH", str(tmp_path / "session.json"))
+    scraper.set_site_base_url(server.base_url)
+    yield server
+    scraper.set_site_base_url(None)
+
+
+def test_scraper_end_to_end(browser_env):
+    from src import db
+    from src.scraper import LottoScraper
+
+    server = browser_env
+    with LottoScraper(server.state.user_id, server.state.user_pw, account_id="e2e") as s:
+        assert s.login(lazy=False)
+        assert "3,000" in s.get_balance()
+        assert s.buy_auto(1)
+        assert s.buy_manual([3, 11, 19, 27, 35, 43])
+    assert server.state.balance == 1000
+    conn = db.connect()
+    count = conn.execute("SELECT COUNT(*) FROM purchases WHERE account_id = 'e2e'").fetchone()[0]
+    conn.close()
+    assert count == 2
@@ -0,0 +1,80 @@
+import itertools
+from datetime import datetime
+
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+from src import combo, db, generator
+from src.rounds import next_draw_round
+
+
+@pytest.fixture(scope="module")
+def features_dir(tmp_path_factory):
+    return generator.build_features(str(tmp_path_factory.mktemp("features") / "combo_features"))
+
+
+@pytest.fixture
+def features(features_dir, monkeypatch):
+    monkeypatch.setattr(generator, "FEATURES_DIR", features_dir)
+    return generator.load_features(build=False)
+
+
+def _brute(nums):
+    runs = max(len(list(g)) for _, g in itertools.groupby(enumerate(nums), lambda x: x[1] - x[0]))
+    return sum(nums), sum(n % 2 for n in nums), nums[-1] - nums[0], runs, [sum(n // 10 == d for n in nums) for d in range(5)]
+
+
+def test_features_match_brute_force(features):
+    for idx in np.random.default_rng(0).integers(0, combo.TOTAL, 500).tolist() + [0, combo.TOTAL - 1]:
+        nums = combo.decode(idx)
+        total, odd, span, run, decades = _brute(nums)
+        assert features["sum"][idx] == total and features["odd"][idx] == odd and features["span"][idx] == span
+        assert features["run"][idx] == run and features["decades"][idx].tolist() == decades
+        assert int(features["mask"][idx]) == sum(1 << (n - 1) for n in nums)
+
+
+def test_filter_is_exact_and_avoids_given_combos(features):
+    winner = combo.encode([7, 15, 22, 31, 38, 44])
+    found = generator.filter_combos(features, sum_range=(150, 160), odd=(3, 3), max_run=1, max_per_decade=2,
+                                    include=[7], exclude=[13, 14], avoid=[winner])
+    expected = []
+    for nums in itertools.combinations([n for n in range(1, 46) if n not in (7, 13, 14)], 5):
+        nums = sorted((7, *nums))
+        total, odd, _, run, decades = _brute(nums)
+        if 150 <= total <= 160 and odd == 3 and run == 1 and max(decades) <= 2:
+            expected.append(combo.encode(nums))
+    assert winner in expected
+    expected.remove(winner)
+    assert found.tolist() == sorted(expected)
+
+    picked = generator.pick(found, 5, seed=1)
+    assert len({combo.encode(n) for n in picked}) == 5
+    assert picked == generator.pick(found, 5, seed=1)
+
+
+def test_parse_range():
+    assert generator.parse_range("100-170", 21, 255) == (100, 170)
+    assert generator.parse_range("3", 0, 6) == (3, 3)
+    with pytest.raises(ValueError):
+        generator.parse_range("170-100", 21, 255)
+
+
+def test_generate_skips_past_winners_and_held_combos(features, monkeypatch):
+    import main
+
+    # 1~5 포함, 10 이상 제외 → 후보는 6~9 중 하나를 더한 4개. 6 은 역대 1등, 7 은 이번 회차 보유분이라 빠짐
+    base = [1, 2, 3, 4, 5]
+    db.add_or_update_rounds([{"round_number": 1, "draw_date": "2002-12-07", "winning_numbers": base + [6], "bonus_number": 45}])
+    db.insert_purchase(next_draw_round(), datetime.now(), "수동", "1,2,3,4,5,7")
+    result = CliRunner().invoke(main.cli, ["generate", "--count", "5", "--include", "1,2,3,4,5", "--exclude", ",".join(map(str, range(10, 46))), "--seed", "0"])
+    assert result.exit_code == 0, result.output
+    assert "조합 2개 중 2게임" in result.output
+    assert "01,02,03,04,05,08" in result.output and "01,02,03,04,05,09" in result.output
+    assert '--manual "1,2,3,4,5,8"' in result.output
+
+    bought = []
+    monkeypatch.setattr(main, "_run_for_selected_accounts", lambda job, *a, **k: bought.append(job(type("S", (), {"buy_manual": lambda self, n, notify=None: True})(), {})))
+    result = CliRunner().invoke(main.cli, ["generate", "--count", "1", "--include", "1,2,3,4,5", "--exclude", ",".join(map(str, range(9, 46))), "--buy"])
+    assert result.exit_code == 0, result.output
+    assert bought and "[[1, 2, 3, 4, 5, 8]]" in bought[0][1]
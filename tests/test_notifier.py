@@ -0,0 +1,191 @@
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from src import config, db, notifier
+
+
+@pytest.fixture(autouse=True)
+def channels(monkeypatch):
+    monkeypatch.setattr(config, "DISCORD_WEBHOOK_URL", "https://discord.test/webhook")
+    monkeypatch.setattr(config, "TELEGRAM_BOT_TOKEN", "token")
+    monkeypatch.setattr(config, "TELEGRAM_CHAT_ID", "42")
+    monkeypatch.setattr(notifier, "NOTIFY_MIN_INTERVAL", 0)
+    monkeypatch.setattr(notifier, "_last_sent", {})
+
+
+class _FakeSession:
+    def __init__(self, status=200, barrier=None, gate=None):
+        self.status, self.barrier, self.gate, self.calls = status, barrier, gate, []
+
+    def post(self, url, **kwargs):
+        self.calls.append((url, kwargs))
+        if self.barrier:
+            # 두 채널이 동시에 보내는 중이어야 통과 (직렬이면 Barrier 시간 초과)
+            self.barrier.wait()
+        if self.gate:
+            self.gate.wait(2)
+        return type("R", (), {"status_code": self.status})()
+
+    def texts(self):
+        return [kwargs["json"].get("content") or kwargs["json"].get("text") for _, kwargs in self.calls]
+
+
+# 알림을 넣고 flush 없이 끝나는 별도 프로세스 (전송은 느린 가짜 세션이 파일에 기록)
+_EXIT_SCRIPT = """
+import sys, time
+from src import config, db, notifier
+
+config.DISCORD_WEBHOOK_URL = "https://discord.test/webhook"
+notifier.NOTIFY_MIN_INTERVAL = 0
+db.set_db_path(sys.argv[1])
+db.init_db()
+
+class Session:
+    def post(self, url, **kwargs):
+        time.sleep(0.2)
+        with open(sys.argv[2], "a", encoding="utf-8") as f:
+            f.write(kwargs["json"]["content"].replace("\\n", " ") + "\\n")
+        return type("R", (), {"status_code": 204})()
+
+notifier.get_session = lambda: Session()
+for message in sys.argv[3:]:
+    notifier.notify_result(message)
+# 새 알림 없이 끝나는 짧은 명령: 이전 실행에서 남은 알림만 이어서 보냄
+notifier.resume()
+"""
+
+
+def _run_and_exit(tmp_path, *messages) -> list[str]:
+    sent = tmp_path / "sent.txt"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", _EXIT_SCRIPT, str(tmp_path / "lottery.db"), str(sent), *messages],
+                            cwd=root, capture_output=True, text=True, timeout=30)
+    assert result.returncode == 0, result.stderr
+    assert "오류" not in result.stdout, result.stdout
+    return sent.read_text(encoding="utf-8").splitlines() if sent.exists() else []
+
+
+def _unsent(tmp_path) -> int:
+    conn = sqlite3.connect(tmp_path / "lottery.db")
+    count = conn.execute("SELECT COUNT(*) FROM outbox WHERE sent_at IS NULL").fetchone()[0]
+    conn.close()
+    return count
+
+
+def test_queued_messages_are_delivered_at_process_exit(tmp_path):
+    # 첫 알림을 보내는 동안 나머지가 쌓이고, 프로세스 종료 직전(atexit)에 모두 전송
+    sent = " ".join(_run_and_exit(tmp_path, "알림 0", "알림 1", "알림 2"))
+    assert all(f"알림 {i}" in sent for i in range(3))
+    assert _unsent(tmp_path) == 0
+
+
+def test_leftover_messages_are_delivered_when_next_run_exits(tmp_path):
+    # 이전 실행에서 보내지 못하고 편지함에 남은 알림
+    db.set_db_path(str(tmp_path / "lottery.db"))
+    db.init_db()
+    for i in range(2):
+        db.enqueue_notification(f"남은 알림 {i}", channels=["discord"])
+    db.set_db_path(db.MEMORY_DB)
+
+    sent = " ".join(_run_and_exit(tmp_path))
+    assert "남은 알림 0" in sent and "남은 알림 1" in sent
+    assert _unsent(tmp_path) == 0
+
+
+def test_channels_are_sent_concurrently_with_timeouts(monkeypatch):
+    session = _FakeSession(barrier=threading.Barrier(2, timeout=2))
+    monkeypatch.setattr(notifier, "get_session", lambda: session)
+
+    notifier.notify_result("hello")
+    assert notifier.flush(timeout=3)
+    assert sorted(session.texts()) == ["hello", "hello"]
+    assert all(kwargs["timeout"] == (config.NOTIFY_CONNECT_TIMEOUT, config.NOTIFY_READ_TIMEOUT) for _, kwargs in session.calls)
+    assert db.get_pending_notifications() == []
+
+
+def test_notify_result_returns_immediately_and_flush_waits(monkeypatch):
+    gate = threading.Event()
+    session = _FakeSession(gate=gate)
+    monkeypatch.setattr(notifier, "get_session", lambda: session)
+
+    started = time.perf_counter()
+    notifier.notify_result("구매 완료")
+    assert time.perf_counter() - started < 0.5
+    assert len(db.get_pending_notifications()) == 2
+
+    assert not notifier.flush(timeout=0.1)
+    gate.set()
+    assert notifier.flush(timeout=3)
+    assert db.get_pending_notifications() == []
+
+
+def test_failed_messages_stay_queued_with_backoff(monkeypatch):
+    monkeypatch.setattr(notifier, "get_session", lambda: _FakeSession(status=500))
+
+    notifier.notify_result("🚨 구매 실패")
+    assert notifier.flush(timeout=3)
+    rows = db.get_pending_notifications()
+    assert [(r['channel'], r['attempts']) for r in sorted(rows, key=lambda r: r['channel'])] == [("discord", 1), ("telegram", 1)]
+    assert all(r['next_attempt_at'] >= time.time() + notifier.NOTIFY_RETRY_BASE - 1 for r in rows)
+    assert notifier.backoff(1) == notifier.NOTIFY_RETRY_BASE and notifier.backoff(100) == notifier.NOTIFY_RETRY_MAX
+
+    # 재시도 초기화 후 정상 전송되면 편지함에서 빠짐
+    session = _FakeSession()
+    monkeypatch.setattr(notifier, "get_session", lambda: session)
+    assert db.retry_notifications() == 2
+    assert notifier.flush(timeout=3)
+    assert session.texts() == ["🚨 구매 실패", "🚨 구매 실패"]
+    assert db.get_pending_notifications() == []
+
+
+def test_queued_messages_are_coalesced_into_one_digest(monkeypatch):
+    session = _FakeSession()
+    monkeypatch.setattr(notifier, "get_session", lambda: session)
+    conn = db.connect()
+    with conn:
+        for i in range(3):
+            db._enqueue_notification(conn, f"알림 {i}", channels=["discord"])
+    conn.close()
+
+    assert notifier.flush(timeout=3)
+    assert session.texts() == ["📬 알림 3건\n\n알림 0\n\n알림 1\n\n알림 2"]
+
+    rows = [{"id": i, "message": "x" * 900, "image_path": None, "attempts": 0} for i in range(3)]
+    batch, message, _ = notifier.coalesce(rows, 2000)
+    assert len(batch) == 2 and len(message) <= 2000
+    rows[0]["image_path"] = "shot.png"
+    assert notifier.coalesce(rows, 2000)[0] == rows[:1]
+
+
+def test_grading_write_enqueues_in_same_transaction():
+    from datetime import datetime
+
+    db.insert_purchase(1100, datetime(2024, 1, 3), "자동", "1,2,3,4,5,6")
+    db.update_ticket_results([(1, "5등", 5000)], notify="🎉 [default] 로또 당첨: 5등 1건 (총 5,000원)")
+    assert {r['channel'] for r in db.get_pending_notifications()} == {"discord", "telegram"}
+
+
+def test_purchase_write_enqueues_in_same_transaction(monkeypatch):
+    from datetime import datetime
+
+    now = datetime(2024, 1, 3)
+    db.insert_purchases([(1100, now, "자동", "1,2,3,4,5,6", 1000), (1100, now, "자동", "확인필요", 1000)],
+                        notify="✅ [default] 로또 6/45 자동 2게임 구매 완료")
+    assert [r['message'] for r in db.get_pending_notifications()] == ["✅ [default] 로또 6/45 자동 2게임 구매 완료"] * 2
+
+    # 알림을 편지함에 넣지 못하면 구매 내역도 함께 롤백
+    def broken(conn, message, *a, **k):
+        raise RuntimeError("outbox")
+
+    monkeypatch.setattr(db, "_enqueue_notification", broken)
+    with pytest.raises(RuntimeError):
+        db.insert_purchase(1100, now, "수동", "7,8,9,10,11,12", notify="✅ [default] 로또 6/45 수동 구매 완료")
+    conn = db.connect()
+    assert conn.execute("SELECT COUNT(*) FROM purchases").fetchone()[0] == 2
+    conn.close()
@@ -0,0 +1,94 @@
+from math import comb
+
+import numpy as np
+from click.testing import CliRunner
+
+from src import combo, odds, scoring
+
+LINES = [[1, 2, 3, 4, 5, 6], [1, 2, 3, 4, 5, 7], [4, 5, 6, 20, 30, 40]]
+
+
+def test_single_line_matches_known_counts():
+    r = odds.lotto_outcomes([LINES[0]])
+    counts = np.array(r["best_rank"]) * comb(45, 6)
+    assert np.allclose(counts, [comb(45, 6) - 194130, 1, 6, 228, 11115, 182780])
+    assert np.isclose(r["expected"], (np.array([0, 1, 6, 228, 11115, 182780]) @ scoring.DEFAULT_PRIZES) / comb(45, 6))
+
+
+def test_portfolio_probabilities_match_full_enumeration():
+    masks = scoring.to_masks(scoring.to_array(LINES))
+    prizes = scoring.DEFAULT_PRIZES.astype(np.float64)
+    total = first = second = 0.0
+    any3 = any4 = none = 0
+    for start in range(0, combo.TOTAL, 1 << 20):
+        draws = combo.decode_array(np.arange(start, min(start + (1 << 20), combo.TOTAL)))
+        drawn = scoring.to_masks(draws)
+        match = scoring.popcount(drawn[:, None] & masks[None, :]).astype(np.int64)
+        any3 += int((match == 3).any(axis=1).sum())
+        any4 += int((match == 4).any(axis=1).sum())
+        none += int((match < 3).all(axis=1).sum())
+        # 보너스는 5개 일치 게임이 있는 회차만 45가지를 모두 나열 (나머지는 보너스와 무관)
+        plain = ~(match == 5).any(axis=1)
+        payout = prizes[np.asarray(scoring._RANK_TABLE)[match[plain] * 2]].sum(axis=1)
+        first += 39 * payout.sum()
+        second += 39 * (payout ** 2).sum()
+        total += 39 * plain.sum()
+        for bonus in range(1, 46):
+            valid = ~plain & ((drawn >> np.uint64(bonus)) & np.uint64(1) == 0)
+            has_bonus = (masks[None, :] >> np.uint64(bonus)) & np.uint64(1) == 1
+            ranks = np.asarray(scoring._RANK_TABLE)[match[valid] * 2 + has_bonus]
+            payout = prizes[ranks].sum(axis=1)
+            first += payout.sum()
+            second += (payout ** 2).sum()
+            total += valid.sum()
+
+    r = odds.lotto_outcomes(LINES)
+    n = comb(45, 6)
+    assert total == odds.LOTTO_DRAWS
+    assert np.isclose(r["any_rank"][5] * n, any3) and np.isclose(r["any_rank"][4] * n, any4)
+    assert np.isclose(r["best_rank"][0] * n, none)
+    assert np.isclose(r["expected"], first / total)
+    assert np.isclose(r["variance"], second / total - (first / total) ** 2)
+    assert np.isclose(sum(r["best_rank"]), 1.0)
+
+
+def test_pension_matches_full_enumeration():
+    tickets = [(3, 123456), (4, 123456), (1, 923456), (2, 5)]
+    r = odds.pension_outcomes(tickets)
+
+    numbers = np.arange(odds.PENSION_NUMBERS)
+    groups = np.array([g for g, _ in tickets])[None, :]
+    nums = np.array([n for _, n in tickets])[None, :]
+    first = second = 0.0
+    any7 = 0
+    for win_group in range(1, 6):
+        ranks, _, amounts = scoring.grade_pension(groups, nums, win_group, numbers[:, None], -1)
+        payout = amounts.sum(axis=1).astype(np.float64)
+        first += payout.sum()
+        second += (payout ** 2).sum()
+        any7 += int((ranks == 7).any(axis=1).sum())
+    main_mean = first / odds.PENSION_DRAWS
+    bonus_mean = scoring.PENSION_BONUS_PRIZE * len(tickets) / odds.PENSION_NUMBERS
+    assert np.isclose(r["expected"], main_mean + bonus_mean)
+    assert np.isclose(r["any_rank"][7], any7 / odds.PENSION_DRAWS)
+    # 1등: 123456 이 3조/4조, 923456 이 1조, 000005 가 2조로 나오는 4가지
+    assert np.isclose(r["best_rank"][1], 4 / odds.PENSION_DRAWS)
+    # 보너스: 번호 123456 을 두 장 가졌으므로 분산에 (2^2 + 1 + 1) 배
+    bonus_var = scoring.PENSION_BONUS_PRIZE ** 2 * 6 / odds.PENSION_NUMBERS - bonus_mean ** 2
+    assert np.isclose(r["variance"], second / odds.PENSION_DRAWS - main_mean ** 2 + bonus_var)
+
+
+def test_odds_command_reads_pending_tickets():
+    from datetime import datetime
+    import main
+    from src import db
+    from src.rounds import next_draw_round
+
+    db.insert_purchase(next_draw_round(), datetime.now(), "수동", "1,2,3,4,5,6")
+    db.insert_purchase(0, datetime.now(), "자동", "확인필요")
+    db.insert_purchase(0, datetime.now(), "연금자동", "3조 123456")
+    db.insert_purchase(next_draw_round() - 3, datetime.now(), "수동", "7,8,9,10,11,12")
+    result = CliRunner().invoke(main.cli, ["odds"])
+    assert result.exit_code == 0, result.output
+    assert "로또 2게임, 연금복권 1매" in result.output
+    assert "3,000 원" in result.output
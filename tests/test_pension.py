@@ -0,0 +1,110 @@
+import urllib.request
+from datetime import datetime
+
+from click.testing import CliRunner
+
+from src import db, scoring
+from src.scraper import parse_pension_result
+from tests.fake_dhlottery import FakeDhlotteryServer
+
+
+def test_parse_pension_result_page():
+    with FakeDhlotteryServer(current_round=1100) as server:
+        html = urllib.request.urlopen(server.base_url + "/gameResult.do?method=win720&Round=1000").read().decode()
+        pending = urllib.request.urlopen(server.base_url + "/gameResult.do?method=win720&Round=1100").read().decode()
+        group, number, bonus = server.state.pension_draw(1000)
+    result = parse_pension_result(html)
+    assert (result["round_number"], result["win_group"], result["win_number"], result["bonus_number"]) == (1000, group, number, bonus)
+    assert parse_pension_result(pending) is None
+
+
+def test_pension_ticket_format_round_trip():
+    assert scoring.parse_pension_ticket(scoring.format_pension_ticket(3, 1234)) == (3, 1234)
+    assert scoring.parse_pension_ticket("확인필요") is None
+    assert scoring.pension_rank_name(0, True) == "보너스"
+    assert scoring.pension_rank_name(7, True) == "7등+보너스"
+
+
+class _Scraper:
+    account_id = "default"
+
+    def __init__(self, server):
+        self.server = server
+
+    def update_buy_list(self, game="로또6/45"):
+        return [{"round": item["ltEpsdView"], "result": item["ltWnResult"], "win_amount": item["ltWnAmt"]}
+                for item in self.server.state.ledger() if item["ltGdsNm"] == game]
+
+    def get_pension_results_bulk(self, round_numbers, **kwargs):
+        url = self.server.base_url + "/gameResult.do?method=win720&Round={}"
+        return {rnd: parse_pension_result(urllib.request.urlopen(url.format(rnd)).read().decode()) for rnd in round_numbers}
+
+
+def _tickets():
+    conn = db.connect()
+    rows = conn.execute("SELECT numbers, win_rank, win_amount FROM purchases ORDER BY id").fetchall()
+    conn.close()
+    return rows
+
+
+def test_update_grades_pension_tickets(monkeypatch):
+    import main
+
+    with FakeDhlotteryServer(current_round=1000) as server:
+        state = server.state
+        win_group, win_number, bonus = state.pension_draw(1000)
+        bought = [state.buy_pension(True, win_number), state.buy_pension(False, bonus), state.buy_pension(True, None)]
+        state.close_round()
+        for order in bought[:2]:
+            for t in order["tickets"]:
+                db.insert_purchase(0, datetime.now(), "연금자동", scoring.format_pension_ticket(t["group"], t["number"]))
+        # 번호를 읽지 못한 세트는 임의로 채점하지 않고 다음 갱신 때 다시 시도
+        db.insert_purchase(0, datetime.now(), "연금자동", "확인필요", cost=5000)
+
+        reports = []
+        monkeypatch.setattr(main, "_run_for_selected_accounts", lambda job, *a, **k: reports.append(job(_Scraper(server), {})))
+        result = CliRunner().invoke(main.cli, ["update"])
+        assert result.exit_code == 0, result.output
+
+        # 연금복권만 산 계정: 로또 내역이 비어 있는 것은 실패가 아님
+        ok, msg = reports[0]
+        assert ok
+        assert msg.startswith("연금복권 채점 완료")
+        assert "연금복권 티켓 1건은 다음 갱신 때 다시 채점" in msg
+
+        expected = [state.grade_pension(1000, t["group"], t["number"]) for order in bought[:2] for t in order["tickets"]]
+        expected.append(("추첨 전", 0))
+        assert [(rank, amount) for _, rank, amount in _tickets()] == expected
+        assert expected[win_group - 1][0] == "1등"
+        assert expected[5][0].endswith("보너스")
+
+    res = db.get_all_checked_results()
+    assert res["total_games"] == 0
+    unchecked = db.get_unchecked_results()
+    assert sum(unchecked["pension_rank_counts"].values()) == 6
+    assert unchecked["rank_counts"] == {}
+
+
+class _LottoFailingScraper(_Scraper):
+    def update_buy_list(self, game="로또6/45"):
+        return None if game == "로또6/45" else super().update_buy_list(game)
+
+
+def test_update_fails_when_lotto_ledger_cannot_be_read(monkeypatch):
+    import main
+
+    with FakeDhlotteryServer(current_round=1000) as server:
+        for t in server.state.buy_pension(True, None)["tickets"]:
+            db.insert_purchase(0, datetime.now(), "연금자동", scoring.format_pension_ticket(t["group"], t["number"]))
+        server.state.close_round()
+
+        reports = []
+        monkeypatch.setattr(main, "_run_for_selected_accounts",
+                            lambda job, *a, **k: reports.append(job(_LottoFailingScraper(server), {})))
+        result = CliRunner().invoke(main.cli, ["update"])
+        assert result.exit_code == 0, result.output
+
+    # 로또 내역 조회가 실패하면 연금복권이 채점되어도 실패로 보고하고 두 메시지를 모두 남김
+    ok, msg = reports[0]
+    assert not ok
+    assert "로또6/45" in msg and "연금복권 채점 완료" in msg
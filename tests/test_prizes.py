@@ -0,0 +1,94 @@
+import urllib.request
+from datetime import datetime
+
+from click.testing import CliRunner
+
+from src import db
+from src.scraper import parse_prize_table
+from tests.fake_dhlottery import FakeDhlotteryServer
+
+
+def test_parse_prize_table_from_result_page():
+    with FakeDhlotteryServer(current_round=1100) as server:
+        html = urllib.request.urlopen(server.base_url + "/gameResult.do?method=byWin&drwNo=1000").read().decode()
+        expected = server.state.prize_table(1000)
+    prizes = parse_prize_table(html)
+    assert {rank: (p["amount"], p["winners"]) for rank, p in prizes.items()} == expected
+
+
+def _graded(round_number, numbers, rank, amount, mode="수동"):
+    db.insert_purchase(round_number, datetime.now(), mode, numbers)
+    conn = db.connect()
+    purchase_id = conn.execute("SELECT MAX(id) FROM purchases").fetchone()[0]
+    conn.close()
+    db.update_ticket_result(purchase_id, rank, amount)
+    return purchase_id
+
+
+def _amounts():
+    conn = db.connect()
+    rows = dict(conn.execute("SELECT id, win_amount FROM purchases").fetchall())
+    conn.close()
+    return rows
+
+
+def test_regrade_prizes_is_set_based_and_skips_pension():
+    first = _graded(1000, "1,2,3,4,5,6", "1등", 2000000000)
+    third = _graded(1000, "1,2,3,4,5,7", "3등", 1500000)
+    lost = _graded(1000, "1,2,3,8,9,10", "낙첨", 0)
+    pension = _graded(1000, "확인필요", "3등", 1000000, mode="연금자동")
+    other = _graded(1001, "1,2,3,4,5,6", "5등", 5000)
+
+    assert db.get_graded_rounds_without_prizes() == [1000, 1001]
+    db.add_or_update_prizes([{"round_number": 1000, "prizes": {
+        "1등": {"amount": 2512345678, "winners": 11}, "2등": {"amount": 61234567, "winners": 70},
+        "3등": {"amount": 1456789, "winners": 3000}, "4등": {"amount": 50000}, "5등": {"amount": 5000},
+    }}])
+
+    assert db.regrade_prizes() == 2
+    amounts = _amounts()
+    assert amounts[first] == 2512345678
+    assert amounts[third] == 1456789
+    assert amounts[lost] == 0
+    assert amounts[pension] == 1000000
+    assert amounts[other] == 5000
+    assert db.get_graded_rounds_without_prizes() == [1001]
+    # 이미 맞춰진 금액은 다시 바꾸지 않음
+    assert db.regrade_prizes([1000]) == 0
+
+
+class _Scraper:
+    account_id = "default"
+
+    def __init__(self, server):
+        self.server = server
+        self.fetched = []
+
+    def update_buy_list(self):
+        return [{"round": "1000", "result": "당첨", "win_amount": 0}]
+
+    def get_official_winning_numbers_bulk(self, round_numbers, **kwargs):
+        self.fetched.extend(round_numbers)
+        result = {}
+        for rnd in round_numbers:
+            win, bonus = self.server.state.draw(rnd)
+            result[rnd] = {
+                "round_number": rnd, "draw_date": "2024-01-01", "winning_numbers": win, "bonus_number": bonus,
+                "prizes": {rank: {"amount": a, "winners": w} for rank, (a, w) in self.server.state.prize_table(rnd).items()},
+            }
+        return result
+
+
+def test_update_grades_with_actual_prizes(monkeypatch):
+    import main
+
+    with FakeDhlotteryServer(current_round=1100) as server:
+        win, bonus = server.state.draw(1000)
+        db.insert_purchase(1000, datetime.now(), "수동", ",".join(map(str, win)))
+        scraper = _Scraper(server)
+        monkeypatch.setattr(main, "_run_for_selected_accounts", lambda job, *a, **k: job(scraper, {}))
+        result = CliRunner().invoke(main.cli, ["update"])
+        assert result.exit_code == 0, result.output
+
+        assert scraper.fetched == [1000]
+        assert list(_amounts().values()) == [server.state.prize_table(1000)["1등"][0]]
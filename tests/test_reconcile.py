@@ -0,0 +1,100 @@
+from datetime import datetime
+
+from click.testing import CliRunner
+
+from src import db
+from src.reconcile import match_unconfirmed_tickets
+from src.scraper import parse_ticket_details
+from tests.fake_dhlottery import FakeDhlottery
+
+
+def test_match_skips_games_already_recorded():
+    details = {1000: [
+        {"mode": "자동", "numbers": [1, 2, 3, 4, 5, 6]},
+        {"mode": "수동", "numbers": [7, 8, 9, 10, 11, 12]},
+        {"mode": "자동", "numbers": [13, 14, 15, 16, 17, 18]},
+        {"mode": "자동", "numbers": [19, 20, 21, 22, 23, 24]},
+    ]}
+    unconfirmed = [{"id": 5, "round_number": 1000}, {"id": 9, "round_number": 1000}, {"id": 11, "round_number": 1001}]
+    matched = match_unconfirmed_tickets(unconfirmed, {1000: ["1,2,3,4,5,6"]}, details)
+    assert matched == {5: [13, 14, 15, 16, 17, 18], 9: [19, 20, 21, 22, 23, 24]}
+
+
+class _Scraper:
+    account_id = "default"
+
+    def __init__(self, state):
+        self.state = state
+        self.detail_requests = []
+
+    def update_buy_list(self):
+        return [{"round": item["ltEpsdView"], "result": item["ltWnResult"], "win_amount": item["ltWnAmt"]}
+                for item in self.state.ledger()]
+
+    def get_ticket_details_bulk(self, round_numbers, **kwargs):
+        self.detail_requests.extend(round_numbers)
+        return {rnd: parse_ticket_details({"data": {"list": self.state.ledger_detail(rnd)}}) for rnd in round_numbers}
+
+    def get_official_winning_numbers_bulk(self, round_numbers, **kwargs):
+        result = {}
+        for rnd in round_numbers:
+            win, bonus = self.state.draw(rnd)
+            result[rnd] = {
+                "round_number": rnd, "draw_date": "2024-01-01", "winning_numbers": win, "bonus_number": bonus,
+                "prizes": {rank: {"amount": a, "winners": w} for rank, (a, w) in self.state.prize_table(rnd).items()},
+            }
+        return result
+
+
+def _tickets():
+    conn = db.connect()
+    rows = conn.execute("SELECT id, numbers, win_rank, win_amount FROM purchases ORDER BY id").fetchall()
+    conn.close()
+    return rows
+
+
+def test_update_reconciles_unconfirmed_auto_tickets(monkeypatch):
+    import main
+
+    state = FakeDhlottery(current_round=1000, seed=3)
+    games = state.buy_lotto([{"mode": "auto"}] * 3)["games"]
+    state.close_round()
+    # 영수증에서 첫 게임만 읽히고 나머지는 "확인필요" 로 저장된 상황 (하나는 예전 방식으로 이미 임시 채점됨)
+    first = ",".join(map(str, games[0]["numbers"]))
+    db.insert_purchase(1000, datetime.now(), "자동", first)
+    db.insert_purchase(1000, datetime.now(), "자동", "확인필요")
+    db.insert_purchase(1000, datetime.now(), "자동", "확인필요")
+    db.update_ticket_result(3, "당첨", 0)
+
+    scraper = _Scraper(state)
+    monkeypatch.setattr(main, "_run_for_selected_accounts", lambda job, *a, **k: job(scraper, {}))
+    result = CliRunner().invoke(main.cli, ["update"])
+    assert result.exit_code == 0, result.output
+
+    assert scraper.detail_requests == [1000]
+    prizes = {rank: amount for rank, (amount, _) in state.prize_table(1000).items()}
+    for (purchase_id, numbers, rank, amount), game in zip(_tickets(), games):
+        assert numbers == ",".join(map(str, game["numbers"]))
+        assert rank == state.grade(1000, game["numbers"])
+        assert amount == prizes.get(rank, 0)
+
+
+def test_update_leaves_unresolved_tickets_for_next_run(monkeypatch):
+    import main
+
+    state = FakeDhlottery(current_round=1000, seed=3)
+    games = state.buy_lotto([{"mode": "auto"}] * 2)["games"]
+    state.close_round()
+    db.insert_purchase(1000, datetime.now(), "자동", ",".join(map(str, games[0]["numbers"])))
+    db.insert_purchase(1000, datetime.now(), "자동", "확인필요")
+
+    # 구매 상세 내역을 가져오지 못하면 "확인필요" 티켓은 임의 등수 없이 '추첨 전'으로 남음
+    scraper = _Scraper(state)
+    monkeypatch.setattr(scraper, "get_ticket_details_bulk", lambda round_numbers, **kwargs: {})
+    monkeypatch.setattr(main, "_run_for_selected_accounts", lambda job, *a, **k: job(scraper, {}))
+    result = CliRunner().invoke(main.cli, ["update"])
+    assert result.exit_code == 0, result.output
+
+    graded, unresolved = _tickets()
+    assert graded[2] == state.grade(1000, games[0]["numbers"])
+    assert tuple(unresolved[1:]) == ("확인필요", "추첨 전", 0)
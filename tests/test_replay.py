@@ -0,0 +1,70 @@
+import numpy as np
+from click.testing import CliRunner
+
+from src import db, scoring
+from src import replay
+
+
+def _rounds(rng, m):
+    rounds = []
+    for i in range(m):
+        balls = rng.choice(np.arange(1, 46), 7, replace=False)
+        rounds.append({"round_number": 1000 + i, "draw_date": None,
+                       "winning_numbers": sorted(balls[:6].tolist()), "bonus_number": int(balls[6])})
+    return rounds
+
+
+def test_replay_matches_per_round_grading():
+    rng = np.random.default_rng(0)
+    tickets = np.sort(np.argsort(rng.random((300, 45)), axis=1)[:, :6] + 1, axis=1).astype(np.uint8)
+    rounds = _rounds(rng, 40)
+    rounds[7]["winning_numbers"] = tickets[5].tolist()  # 1등이 한 번은 나오도록
+
+    streamed = []
+    # 칸 수를 작게 줘서 여러 구간으로 나눠 계산되도록 함
+    res = replay.replay(tickets, rounds, chunk_cells=1000, on_chunk=lambda s, c, w: streamed.append((s, c, w)))
+
+    expected_win = np.zeros(len(rounds), dtype=np.int64)
+    expected_counts = np.zeros(6, dtype=np.int64)
+    for j, r in enumerate(rounds):
+        ranks, amounts = scoring.grade(tickets, r["winning_numbers"], r["bonus_number"])
+        expected_win[j] = amounts.sum()
+        expected_counts += np.bincount(ranks, minlength=6)
+
+    assert len(streamed) > 1
+    assert sum(len(w) for _, _, w in streamed) == len(tickets)
+    assert res["per_round_win"].tolist() == expected_win.tolist()
+    assert list(res["rank_counts"].values()) == expected_counts.tolist()
+    assert res["total_cost"] == 1000 * 300 * 40
+    assert res["ticket_best_rank"][5] == 1
+
+    best, worst = replay.best_and_worst_rounds(res, rounds, top=1)
+    assert best[0]["round_number"] == 1007
+
+
+def test_parse_ticket_lines():
+    assert replay.parse_ticket_lines(["6 5 4 3 2 1", "", "# 주석", "7,8,9,10,11,12"]) == [[1, 2, 3, 4, 5, 6], [7, 8, 9, 10, 11, 12]]
+
+
+def test_replay_command():
+    import main
+
+    db.add_or_update_round(1000, "2024-01-01", "1,2,3,4,5,6", 7)
+    db.add_or_update_round(1001, "2024-01-08", "1,2,3,10,11,12", 13)
+    result = CliRunner().invoke(main.cli, ["replay", "--numbers", "1,2,3,4,5,7"])
+    assert result.exit_code == 0, result.output
+    assert "2등" in result.output
+    assert "50,005,000 원" in result.output  # 2등 + 5등
+
+
+def test_replay_command_uses_stored_prizes():
+    import main
+
+    db.add_or_update_round(1000, "2024-01-01", "1,2,3,4,5,6", 7)
+    db.add_or_update_round(1001, "2024-01-08", "1,2,3,10,11,12", 13)
+    amounts = {"1등": 2_000_000_000, "2등": 60_000_000, "3등": 1_500_000, "4등": 50_000, "5등": 5000}
+    db.add_or_update_prizes([{"round_number": 1000, "prizes": {rank: {"amount": a} for rank, a in amounts.items()}}])
+    result = CliRunner().invoke(main.cli, ["replay", "--numbers", "1,2,3,4,5,7"])
+    assert result.exit_code == 0, result.output
+    assert "60,005,000 원" in result.output  # 1000회 실제 2등 + 1001회 기본 5등
+    assert "실제 당첨금 1개 회차" in result.output
@@ -0,0 +1,62 @@
+from datetime import datetime
+
+from click.testing import CliRunner
+
+from src import db
+
+
+def _snapshot():
+    conn = db.connect()
+    rollups = sorted(conn.execute("SELECT * FROM rollups WHERE games != 0").fetchall())
+    ranks = sorted(conn.execute("SELECT * FROM rollup_ranks WHERE count != 0").fetchall())
+    conn.close()
+    return rollups, ranks
+
+
+def _seed():
+    db.insert_purchase(1100, datetime(2024, 1, 3, 10), "자동", "1,2,3,4,5,6")
+    db.insert_purchase(1100, datetime(2024, 1, 7, 10), "수동", "1,2,3,4,5,7", account_id="b")
+    db.insert_purchase(1105, datetime(2024, 2, 5, 10), "자동", "7,8,9,10,11,12")
+    db.insert_purchase(1105, datetime(2024, 2, 5, 10), "연금자동", "3조 012345")
+    db.update_winning_result(1100, "1,2,3,4,5,6", 5000, "5등")
+
+
+def test_triggers_match_full_rebuild():
+    _seed()
+    conn = db.connect()
+    with conn:
+        conn.execute("UPDATE purchases SET win_rank = '낙첨' WHERE round_number = 1105")
+        conn.execute("UPDATE purchases SET purchase_date = '2023-12-30 09:00:00', account_id = 'c' WHERE mode = '수동'")
+        conn.execute("DELETE FROM purchases WHERE mode = '연금자동'")
+    conn.close()
+    incremental = _snapshot()
+    db.rebuild_rollups()
+    assert _snapshot() == incremental
+
+
+def test_report_windows_over_rollups():
+    _seed()
+    rows = db.get_rollup_report("month", "none", game="lotto")
+    assert [(r['period'], r['games'], r['cost'], r['win_amount']) for r in rows] == [("2024-01", 2, 2000, 5000), ("2024-02", 1, 1000, 0)]
+    assert rows[1]['cumulative_roi'] == 5000 / 3000 - 1
+    assert rows[1]['moving_roi'] == rows[1]['cumulative_roi']
+    assert rows[0]['hit_rate'] == 1.0  # 채점된 1게임 중 1게임 당첨 (추첨 전 게임은 제외)
+
+    # 주 단위는 월요일 날짜, last 는 최근 기간만 남기되 누적은 전체 기준
+    rows = db.get_rollup_report("week", "account", last=1)
+    assert {(r['period'], r['group']) for r in rows} == {("2024-02-05", "default")}
+    assert rows[0]['total_games'] == 3
+    assert db.get_rollup_rank_counts("year", "mode")[("2024", "자동")] == {"5등": 1, "추첨 전": 1}
+
+
+def test_report_command():
+    import main
+
+    _seed()
+    result = CliRunner().invoke(main.cli, ["report", "--by", "month", "--group", "mode"])
+    assert result.exit_code == 0, result.output
+    assert "2024-01" in result.output and "연금자동" in result.output and "5등 1" in result.output
+
+    result = CliRunner().invoke(main.cli, ["--account", "b", "report", "--rebuild"])
+    assert result.exit_code == 0, result.output
+    assert "수동" in result.output and "연금자동" not in result.output
@@ -0,0 +1,66 @@
+import numpy as np
+
+from src import scoring
+
+
+def _reference_rank(ticket, win, bonus):
+    match = len(set(ticket) & set(win))
+    if match == 6:
+        return 1
+    if match == 5:
+        return 2 if bonus in ticket else 3
+    return {4: 4, 3: 5}.get(match, 0)
+
+
+def _random_tickets(rng, n):
+    return np.sort(np.argsort(rng.random((n, 45)), axis=1)[:, :6] + 1, axis=1).astype(np.uint8)
+
+
+def test_grade_matches_reference():
+    rng = np.random.default_rng(0)
+    win, bonus = [3, 11, 19, 27, 35, 43], 44
+    tickets = _random_tickets(rng, 5000)
+    # 모든 등수가 최소 한 번씩 나오도록 추가
+    tickets = np.vstack([tickets, scoring.to_array([
+        win, [3, 11, 19, 27, 35, 44], [3, 11, 19, 27, 35, 1], [3, 11, 19, 27, 1, 2], [3, 11, 19, 1, 2, 44],
+    ])])
+
+    ranks, amounts = scoring.grade(tickets, win, bonus)
+    expected = [_reference_rank(t.tolist(), win, bonus) for t in tickets]
+    assert ranks.tolist() == expected
+    assert amounts.tolist() == [int(scoring.DEFAULT_PRIZES[r]) for r in expected]
+    assert set(ranks[-5:].tolist()) == {1, 2, 3, 4, 5}
+
+
+def test_grade_masks_broadcasts_over_draws():
+    rng = np.random.default_rng(1)
+    tickets = _random_tickets(rng, 50)
+    draws = _random_tickets(rng, 7)
+    bonuses = [next(n for n in range(1, 46) if n not in d) for d in draws.tolist()]
+
+    matrix = scoring.grade_masks(
+        scoring.to_masks(tickets)[:, None],
+        scoring.to_masks(draws)[None, :],
+        np.array([scoring.number_mask([b]) for b in bonuses])[None, :],
+    )
+    assert matrix.shape == (50, 7)
+    for j, (d, b) in enumerate(zip(draws.tolist(), bonuses)):
+        assert matrix[:, j].tolist() == scoring.grade(tickets, d, b)[0].tolist()
+
+
+def test_parse_numbers():
+    assert scoring.parse_numbers("2, 8, 19, 22, 32, 42") == [2, 8, 19, 22, 32, 42]
+    assert scoring.parse_numbers("확인필요") is None
+    assert scoring.parse_numbers("1,2,3,4,5") is None
+    assert scoring.parse_numbers("1,2,3,4,5,46") is None
+
+
+def test_grade_pension_suffix_ranks():
+    win_group, win_number, bonus_number = 3, 123456, 654321
+    groups = [3, 1, 2, 2, 2, 2, 2, 2, 4]
+    numbers = [123456, 123456, 23456, 903456, 990456, 999956, 999996, 999999, 654321]
+    ranks, bonus, amounts = scoring.grade_pension(groups, numbers, win_group, win_number, bonus_number)
+    assert ranks.tolist() == [1, 2, 3, 4, 5, 6, 7, 0, 0]
+    assert bonus.tolist() == [False] * 8 + [True]
+    assert amounts[-1] == scoring.PENSION_BONUS_PRIZE
+    assert amounts[0] == scoring.PENSION_PRIZES[1]
@@ -1,24 +1,8 @@
 import os
 from unittest.mock import patch, MagicMock
 from src.scraper import LottoScraper
-from src.db import insert_purchase, DB_FILE, get_pending_purchases, get_unchecked_results, init_db, add_or_update_round
-import sqlite3
+from src.db import insert_purchase, get_pending_purchases, get_unchecked_results, init_db, add_or_update_round, set_db_path, MEMORY_DB
 from datetime import datetime
-import subprocess
-
-# Temporary test setup
-DB_BACKUP = DB_FILE + ".test_backup.db"
-
-def setup():
-    if os.path.exists(DB_FILE):
-        os.rename(DB_FILE, DB_BACKUP)
-    init_db()
-
-def teardown():
-    if os.path.exists(DB_FILE):
-        os.remove(DB_FILE)
-    if os.path.exists(DB_BACKUP):
-        os.rename(DB_BACKUP, DB_FILE)
 
 @patch("src.scraper.LottoScraper.get_official_winning_numbers")
 def test_scoring_logic(mock_get_official):
@@ -56,33 +40,17 @@ def test_scoring_logic(mock_get_official):
 
     pending_tickets = get_pending_purchases(1000)
     
-    win_nums = set(official_data['winning_numbers'])
-    bonus_num = official_data['bonus_number']
+    from src.db import update_ticket_results
+    from src import scoring
 
-    from src.db import update_ticket_result
-    
-    for t in pending_tickets:
-        my_nums = set(map(int, t['numbers'].replace(" ", "").split(',')))
-        match_count = len(my_nums & win_nums)
-        bonus_match = bonus_num in my_nums
-        
-        rank = "낙첨"
-        amt = 0
-        if match_count == 6:
-            rank, amt = "1등", 2000000000
-        elif match_count == 5 and bonus_match:
-            rank, amt = "2등", 50000000
-        elif match_count == 5:
-            rank, amt = "3등", 1500000
-        elif match_count == 4:
-            rank, amt = "4등", 50000
-        elif match_count == 3:
-            rank, amt = "5등", 5000
-        else:
-            rank, amt = "낙첨", 0
-            
-        update_ticket_result(t['id'], rank, amt)
-        print(f"Ticket {t['numbers']} -> {rank} ({amt}원)")
+    tickets = scoring.to_array([scoring.parse_numbers(t['numbers']) for t in pending_tickets])
+    ranks, amounts = scoring.grade(tickets, official_data['winning_numbers'], official_data['bonus_number'])
+
+    results = []
+    for t, rank, amt in zip(pending_tickets, ranks.tolist(), amounts.tolist()):
+        results.append((t['id'], scoring.RANK_NAMES[rank], amt))
+        print(f"Ticket {t['numbers']} -> {scoring.RANK_NAMES[rank]} ({amt}원)")
+    update_ticket_results(results)
         
     res = get_unchecked_results()
     print("\nResult Ranks Output:")
@@ -100,8 +68,6 @@ def test_scoring_logic(mock_get_official):
     print("All tests passed! Scoring engine works flawlessly.")
 
 if __name__ == "__main__":
-    setup()
-    try:
-        test_scoring_logic()
-    finally:
-        teardown()
+    set_db_path(MEMORY_DB)
+    init_db()
+    test_scoring_logic()
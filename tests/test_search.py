@@ -0,0 +1,54 @@
+from datetime import datetime
+
+from click.testing import CliRunner
+
+from src import db
+
+
+def _seed():
+    db.insert_purchase(1100, datetime(2024, 1, 3), "자동", "1,2,3,4,5,6")
+    db.insert_purchase(1101, datetime(2024, 1, 10), "수동", "01, 11, 21, 31, 41, 45", account_id="b")
+    db.insert_purchase(1102, datetime(2024, 1, 17), "자동", "확인필요")
+    db.insert_purchase(1102, datetime(2024, 1, 17), "연금자동", "1조 111111")
+
+
+def test_index_follows_purchases_without_substring_false_positives():
+    _seed()
+    assert [r['id'] for r in db.search_tickets([1])] == [2, 1]
+    assert db.search_tickets([11])[0]['numbers'].startswith("01, 11")
+    assert db.search_tickets([7]) == []
+
+    # "확인필요" 티켓의 번호가 채워지면 색인도 함께 갱신, 삭제되면 빠짐
+    db.update_ticket_results([], {3: "7,8,9,10,11,12"})
+    assert [r['id'] for r in db.search_tickets([11])] == [3, 2]
+    conn = db.connect()
+    with conn:
+        conn.execute("DELETE FROM purchases WHERE id = 2")
+    conn.close()
+    assert [r['id'] for r in db.search_tickets([11])] == [3]
+
+
+def test_all_any_and_round_range():
+    _seed()
+    assert [r['id'] for r in db.search_tickets([1, 2])] == [1]
+    assert [(r['id'], r['matched']) for r in db.search_tickets([1, 2, 45], min_match=1)] == [(2, 2), (1, 2)]
+    assert [r['id'] for r in db.search_tickets([1], from_round=1101, to_round=1101)] == [2]
+    assert [r['id'] for r in db.search_tickets([1], account_ids=["default"])] == [1]
+
+    conn = db.connect()
+    plan = " ".join(r[3] for r in conn.execute(
+        "EXPLAIN QUERY PLAN SELECT purchase_id FROM ticket_numbers WHERE number IN (1, 2) AND round_number >= 1100 GROUP BY purchase_id"))
+    conn.close()
+    assert "SEARCH ticket_numbers USING PRIMARY KEY" in plan
+
+
+def test_search_command():
+    import main
+
+    _seed()
+    result = CliRunner().invoke(main.cli, ["search", "--numbers", "1 45", "--any"])
+    assert result.exit_code == 0, result.output
+    assert "2게임" in result.output and "[45]" in result.output
+
+    result = CliRunner().invoke(main.cli, ["search", "--numbers", "1,2", "--min-match", "3"])
+    assert result.exit_code != 0
@@ -0,0 +1,141 @@
+from src.session import build_session_meta, cookie_expiry, is_session_fresh
+
+
+def test_cookie_expiry_ignores_browser_session_cookies():
+    cookies = [
+        {"name": "JSESSIONID", "domain": ".dhlottery.co.kr", "expires": -1},
+        {"name": "WMONID", "domain": "www.dhlottery.co.kr", "expires": 2000.0},
+        {"name": "wcCookie", "domain": ".dhlottery.co.kr", "expires": 1500.0},
+        {"name": "other", "domain": "example.com", "expires": 100.0},
+    ]
+    assert cookie_expiry(cookies) == 1500.0
+    assert cookie_expiry([{"domain": ".dhlottery.co.kr", "expires": -1}]) is None
+
+
+def test_session_freshness_window():
+    meta = build_session_meta([{"domain": ".dhlottery.co.kr", "expires": 5000.0}], now=1000.0)
+
+    assert is_session_fresh(meta, ttl=600, now=1500.0)
+    assert not is_session_fresh(meta, ttl=600, now=1700.0)  # TTL 경과
+    assert not is_session_fresh(meta, ttl=0, now=1000.0)    # 캐시 비활성화
+    assert not is_session_fresh({}, ttl=600, now=1000.0)
+
+    meta["cookie_expiry"] = 1200.0
+    assert not is_session_fresh(meta, ttl=600, now=1300.0)  # 쿠키 만료
+
+
+def test_persist_storage_state_writes_only_on_change(tmp_path, monkeypatch):
+    import src.session as session
+
+    monkeypatch.setattr(session, "SESSION_DIR", str(tmp_path / "sessions"))
+    monkeypatch.setattr(session, "SESSION_PATH", str(tmp_path / "session.json"))
+    path_a, meta_a = session.session_paths("user@a")
+    path_b, _ = session.session_paths("user-b")
+    assert path_a != path_b
+    assert path_a.endswith("user_a.json") and meta_a.endswith("user_a.meta.json")
+
+    state = {"cookies": [{"name": "JSESSIONID", "value": "x"}], "origins": []}
+    assert session.persist_storage_state(path_a, state, None)
+    loaded = session.load_storage_state(path_a)
+    assert loaded == state
+
+    # 내용이 같으면 다시 쓰지 않음
+    fp = session.state_fingerprint(loaded)
+    assert not session.persist_storage_state(path_a, state, fp)
+
+    state["cookies"][0]["value"] = "y"
+    assert session.persist_storage_state(path_a, state, fp)
+    assert session.load_storage_state(path_a)["cookies"][0]["value"] == "y"
+    assert not any(p.name.startswith(".tmp-") for p in (tmp_path / "sessions").iterdir())
+
+
+def test_scraper_exit_closes_browser_when_session_save_fails(tmp_path, monkeypatch):
+    import asyncio
+
+    import pytest
+
+    from src import scraper as scraper_module
+
+    closed = []
+
+    class _Closable:
+        def __init__(self, name):
+            self.name = name
+
+        async def close(self):
+            closed.append(self.name)
+
+        async def stop(self):
+            closed.append(self.name)
+
+    class _Context(_Closable):
+        async def storage_state(self):
+            return {"cookies": []}
+
+    def broken(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(scraper_module, "persist_storage_state", broken)
+    engine = scraper_module.AsyncLottoScraper("user", "pw")
+    engine.context, engine.browser, engine.playwright = _Context("context"), _Closable("browser"), _Closable("playwright")
+    with pytest.raises(OSError):
+        asyncio.run(engine.__aexit__(None, None, None))
+    assert closed == ["context", "browser", "playwright"]
+
+
+def test_goto_raises_when_relogin_fails(monkeypatch):
+    import asyncio
+
+    import pytest
+
+    from src import scraper as scraper_module
+
+    class _Page:
+        url = "https://dhlottery.test/login"
+
+        def __init__(self):
+            self.visited = []
+
+        async def goto(self, url, **kwargs):
+            self.visited.append(url)
+
+    async def relogin():
+        return False
+
+    monkeypatch.setattr(scraper_module, "clear_session_meta", lambda path: None)
+    engine = scraper_module.AsyncLottoScraper("user", "pw")
+    engine.page, engine._session_unverified = _Page(), True
+    monkeypatch.setattr(engine, "_login_with_credentials", relogin)
+    with pytest.raises(RuntimeError):
+        asyncio.run(engine._goto("https://dhlottery.test/buy"))
+    # 로그인 페이지에 머문 채 작업을 이어가지 않음
+    assert engine.page.visited == ["https://dhlottery.test/buy"]
+
+
+def test_session_meta_save_does_not_block_event_loop(monkeypatch):
+    import asyncio
+    import threading
+    import time
+
+    from src import scraper as scraper_module
+
+    released = threading.Event()
+
+    class _Context:
+        async def cookies(self):
+            return []
+
+    # 다른 프로세스가 잠금을 잡고 있는 상황: 이벤트 루프가 멈추면 released 가 제때 설정되지 않음
+    monkeypatch.setattr(scraper_module, "save_session_meta", lambda meta, path: released.wait(2))
+    engine = scraper_module.AsyncLottoScraper("user", "pw")
+    engine.context = _Context()
+
+    async def scenario():
+        started = time.perf_counter()
+        saving = asyncio.create_task(engine._mark_session_verified())
+        await asyncio.sleep(0.05)
+        released.set()
+        await saving
+        return time.perf_counter() - started
+
+    assert asyncio.run(scenario()) < 1
@@ -0,0 +1,40 @@
+import pytest
+
+from src import simulate
+
+
+def test_parse_strategy():
+    s = simulate.parse_strategy("혼합:auto=3,manual=1-2-3-4-5-6/7-8-9-10-11-12,pension=1")
+    assert s["name"] == "혼합"
+    assert s["auto"] == 3 and s["pension"] == 1
+    assert s["manual"] == [[1, 2, 3, 4, 5, 6], [7, 8, 9, 10, 11, 12]]
+    assert simulate.weekly_cost(s) == 10000
+
+    with pytest.raises(ValueError):
+        simulate.parse_strategy("auto=0")
+    with pytest.raises(ValueError):
+        simulate.parse_strategy("manual=1-2-3")
+
+
+def test_simulate_is_reproducible_and_sharded():
+    strategy = simulate.parse_strategy("auto=2,manual=1,pension=1")
+    a = simulate.simulate(strategy, trials=300, weeks=30, seed=7, workers=1, shard_trials=100)
+    b = simulate.simulate(strategy, trials=300, weeks=30, seed=7, workers=2, shard_trials=100)
+    for key in ("mean_win", "roi_std", "max_drawdown_mean", "never_won_ratio"):
+        assert a[key] == b[key]
+
+    assert a["total_cost"] == 30 * 8000
+    assert a["simulated_tickets"] == 300 * 30 * 8
+    assert -1 <= a["roi_percentiles"]["p5"] <= a["roi_percentiles"]["p95"]
+    assert a["max_drawdown_mean"] > 0
+
+
+@pytest.mark.parametrize("option", ["--trials", "--weeks", "--workers"])
+@pytest.mark.parametrize("value", ["0", "-5"])
+def test_simulate_command_rejects_non_positive_counts(option, value):
+    import main
+    from click.testing import CliRunner
+
+    result = CliRunner().invoke(main.cli, ["simulate", option, value])
+    assert result.exit_code == 2
+    assert option in result.output
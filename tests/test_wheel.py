@@ -0,0 +1,56 @@
+import itertools
+
+import pytest
+from click.testing import CliRunner
+
+from src import db, wheel
+
+
+def _guaranteed(tickets, v, drawn):
+    """모든 drawn 개 묶음에 대해 가장 많이 맞힌 게임의 일치 수 중 최솟값 (직접 계산)"""
+    sets = [{i for i in range(v) if t >> i & 1} for t in tickets]
+    return min(max(len(set(c) & s) for s in sets) for c in itertools.combinations(range(v), drawn))
+
+
+@pytest.mark.parametrize("v,drawn,match", [(9, 3, 3), (12, 4, 3), (14, 5, 4), (16, 6, 3)])
+def test_search_meets_guarantee(v, drawn, match):
+    tickets = wheel.search(v, drawn, match, seconds=0.3)
+    assert all(bin(t).count("1") == 6 and t < (1 << v) for t in tickets)
+    assert _guaranteed(tickets, v, drawn) >= match
+    assert wheel.verify(tickets, v)[drawn]["min_match"] >= match
+
+
+def test_local_search_does_not_grow_greedy_design():
+    greedy = wheel.search(12, 4, 3, iterations=0)
+    assert len(wheel.search(12, 4, 3, seconds=0.5)) <= len(greedy)
+
+
+def test_design_is_cached_and_only_replaced_when_smaller(monkeypatch):
+    first = wheel.design(10, 4, 3)
+    assert db.get_wheel_design(10, 4, 3) == first
+
+    monkeypatch.setattr(wheel, "search", lambda *a, **k: pytest.fail("저장된 설계를 다시 탐색함"))
+    assert wheel.design(10, 4, 3) == first
+
+    monkeypatch.setattr(wheel, "search", lambda *a, **k: first + first[:1])
+    assert wheel.design(10, 4, 3, improve=True) == first
+
+
+def test_verify_reports_distribution():
+    report = wheel.verify([0b111111], 6)
+    assert report[6] == {"cases": 1, "min_match": 6, "distribution": {6: 1}}
+    assert report[3]["cases"] == 20
+
+
+def test_wheel_command_buys_through_manual_path(monkeypatch):
+    import main
+
+    bought = []
+    monkeypatch.setattr(main, "_run_for_selected_accounts", lambda job, *a, **k: bought.append(job(type("S", (), {"buy_manual": lambda self, n, notify=None: True})(), {})))
+    result = CliRunner().invoke(main.cli, ["wheel", "--numbers", "3 8 13 18 23 28 33 38 43", "--drawn", "3", "--match", "3", "--buy"])
+    assert result.exit_code == 0, result.output
+    assert "최소 일치 보장" in result.output
+    assert bought and bought[0][0]
+
+    result = CliRunner().invoke(main.cli, ["wheel", "--numbers", "1,2,3,4,5", "--drawn", "3", "--match", "3"])
+    assert result.exit_code != 0 and "6~20" in result.output